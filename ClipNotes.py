@@ -0,0 +1,349 @@
+import Live
+from .NoteIndex import NoteIndex
+
+# Live note tuples : (pitch, time, duration, velocity, mute)
+# margin (in beats) around the edited area so float rounding does not leave a note out
+TIME_EPSILON = 0.0001
+# after a notes change in Live the mirror is read again by windows of this many beats (see ClipNotes.refresh)
+NOTES_WINDOW = 16.0
+
+
+def _note_key(note):
+	return (note[0], note[1], note[2], note[3], bool(note[4]))
+
+
+def _pop_note(notes, note):
+	# removes the first note of notes equal to note, None if there is none
+	for i, other in enumerate(notes):
+		if _note_key(other) == _note_key(note):
+			return notes.pop(i)
+	return None
+
+
+def notes_fingerprint(notes):
+	""" (count, hash) of notes as Live gives them, cheaper to keep and compare than the notes """
+	return (len(notes), hash(tuple(notes)))
+
+
+def note_diff(old, new):
+	""" (removed, added) turning the notes old into new, notes found in both are left alone """
+	pending = {}
+	for note in old:
+		pending[_note_key(note)] = pending.get(_note_key(note), 0) + 1
+	added = []
+	for note in new:
+		if pending.get(_note_key(note), 0) > 0:
+			pending[_note_key(note)] -= 1
+		else:
+			added.append(note)
+	removed = []
+	for note in old:
+		if pending.get(_note_key(note), 0) > 0:
+			pending[_note_key(note)] -= 1
+			removed.append(note)
+	return removed, added
+
+
+class ClipNotes(object):
+	""" Local mirror of the notes of a clip, kept in a NoteIndex.
+	Edits are described as notes removed / added / modified, and only those
+	notes are sent to Live :
+	 - Live 11 : get_notes_extended on the edited area, apply_note_modifications, remove_notes_by_id, add_new_notes
+	 - Live 9/10 : remove_notes on the edited area, set_notes
+	 - anything older : replace_selected_notes with the whole mirror
+	Edits can also be staged : the mirror shows them at once, and the journal
+	of what Live does not have yet is sent by the next flush, as one write.
+	When Live changes the notes the mirror is only marked stale : refresh()
+	reads the windows of the clip that are needed, with the ranged note query
+	(get_notes_extended / get_notes) when Live has one.
+	"""
+
+	def __init__(self, clip=None):
+		self._clip = None
+		self._index = NoteIndex()
+		self._is_editing = False
+		# journal of the staged edits, against the notes Live has
+		self._pending_removed = [] # notes of the clip to remove
+		self._pending_added = [] # notes to add to the clip
+		self._pending_modified = [] # (note of the clip, what it becomes)
+		self._pending_edits = 0
+		self._stale = None # windows (time // NOTES_WINDOW) not read since Live changed the notes
+		self.windows_read = 0
+		self.last_moved = 0 # notes read + written by the last write
+		self.notes_moved = 0
+		self.edits = 0 # edits asked for
+		self.writes = 0 # writes to the clip, several staged edits make one write
+		self.last_batch = 0 # edits sent by the last write
+		self.batch_sizes = {} # edits per write -> number of writes
+		self.set_clip(clip)
+
+	def set_clip(self, clip):
+		if clip != self._clip:
+			self.flush()
+		self._clip = clip
+		self._index = NoteIndex()
+		self._stale = None
+		self._extended_api = clip != None and hasattr(clip, "add_new_notes") and hasattr(clip, "apply_note_modifications")
+		self._ranged_api = clip != None and hasattr(clip, "remove_notes") and hasattr(clip, "set_notes")
+		self._windowed_api = clip != None and (hasattr(clip, "get_notes_extended") or hasattr(clip, "get_notes"))
+
+	@property
+	def clip(self):
+		return self._clip
+
+	@property
+	def index(self):
+		return self._index
+
+	@property
+	def notes(self):
+		return self._index.notes
+
+	def set_notes(self, notes):
+		""" Resync the mirror with notes just read from the clip """
+		self._index = NoteIndex(notes)
+		self._stale = None
+
+	def set_index(self, index):
+		""" Takes back the index of the clip, kept while another clip was shown """
+		self._index = index
+		self._stale = None
+
+	@property
+	def is_stale(self):
+		# Live changed the notes and some windows were not read since
+		return self._stale != None
+
+	@property
+	def can_refresh(self):
+		# False : the clip has no ranged note query, only a full read brings the mirror back
+		return self._windowed_api
+
+	def set_current(self):
+		""" A full read found the notes the mirror has, nothing is stale """
+		self._stale = None
+
+	def invalidate(self):
+		""" Live changed the notes, all the windows have to be read again """
+		self._stale = True
+
+	def _stale_windows(self):
+		if self._stale == True:
+			# the windows of the clip, and of the notes we have past its end
+			first = min(0.0, self._index.notes[0][1]) if len(self._index) else 0.0
+			last = max(self._clip.loop_end, self._clip.end_marker)
+			if len(self._index):
+				last = max(last, self._index.notes[-1][1])
+			self._stale = set(range(int(first // NOTES_WINDOW), int(last // NOTES_WINDOW) + 1))
+		return self._stale
+
+	def refresh(self, start, end):
+		""" Reads the stale windows of [start, end[ from Live and patches the mirror
+		with what changed there. Returns True when the mirror changed """
+		if self._stale == None or self._clip == None:
+			return False
+		stale = self._stale_windows()
+		windows = [window for window in range(int(start // NOTES_WINDOW), int(-(-end // NOTES_WINDOW))) if window in stale]
+		changed = False
+		while windows:
+			# consecutive windows are read at once
+			first = last = windows.pop(0)
+			while windows and windows[0] == last + 1:
+				last = windows.pop(0)
+			changed = self._read_windows(first, last + 1) or changed
+			for window in range(first, last + 1):
+				stale.discard(window)
+		if not stale:
+			self._stale = None
+		return changed
+
+	def refresh_next(self):
+		""" Reads the first stale window, to catch up with Live a bit at a time """
+		if self._stale == None or self._clip == None:
+			return False
+		window = min(self._stale_windows())
+		return self.refresh(window * NOTES_WINDOW, (window + 1) * NOTES_WINDOW)
+
+	def _read_windows(self, first, end):
+		from_time = first * NOTES_WINDOW
+		time_span = (end - first) * NOTES_WINDOW
+		if hasattr(self._clip, "get_notes_extended"):
+			notes = [(note.pitch, note.start_time, note.duration, note.velocity, note.mute) for note in self._clip.get_notes_extended(0, 128, from_time, time_span)]
+		else:
+			notes = self._clip.get_notes(from_time, 0, time_span, 128)
+		self.windows_read += end - first
+		removed, added = note_diff(self._index.notes_in_range(from_time, from_time + time_span), notes)
+		for note in removed:
+			self._index.remove(note)
+		for note in added:
+			self._index.add(note)
+		return bool(removed or added)
+
+	@property
+	def is_editing(self):
+		# True while the edit is being sent, notes listeners can ignore the intermediate states
+		return self._is_editing
+
+	@property
+	def has_pending(self):
+		return self._pending_edits > 0
+
+	def edit(self, removed=(), added=(), modified=()):
+		""" modified is a list of (old note, new note). Sends the edit (and the staged ones) now.
+		Returns the number of notes moved """
+		self.stage(removed, added, modified)
+		return self.flush()
+
+	def stage(self, removed=(), added=(), modified=()):
+		""" Applies the edit to the mirror only, the next flush() sends it """
+		removed = [tuple(note) for note in removed]
+		added = [tuple(note) for note in added]
+		modified = [(tuple(old), tuple(new)) for old, new in modified]
+		if self._clip == None or not (removed or added or modified):
+			return
+		self._update_mirror(removed, added, modified)
+		for note in removed:
+			self._journal_remove(note)
+		for old, new in modified:
+			self._journal_modify(old, new)
+		for note in added:
+			self._journal_add(note)
+		self._pending_edits += 1
+		self.edits += 1
+
+	def _journal_remove(self, note):
+		if _pop_note(self._pending_added, note) == None:
+			# a note we modified goes : it is its original Live has to remove
+			for i, (old, new) in enumerate(self._pending_modified):
+				if _note_key(new) == _note_key(note):
+					del self._pending_modified[i]
+					note = old
+					break
+			self._pending_removed.append(note)
+
+	def _journal_add(self, note):
+		# adding back a note removed by a staged edit : Live still has it
+		if _pop_note(self._pending_removed, note) == None:
+			self._pending_added.append(note)
+
+	def _journal_modify(self, old, new):
+		if _pop_note(self._pending_added, old) != None:
+			self._pending_added.append(new)
+			return
+		for i, (original, modified) in enumerate(self._pending_modified):
+			if _note_key(modified) == _note_key(old):
+				if _note_key(original) == _note_key(new):
+					del self._pending_modified[i]
+				else:
+					self._pending_modified[i] = (original, new)
+				return
+		self._pending_modified.append((old, new))
+
+	def flush(self):
+		""" Sends the staged edits to the clip, in one write. Returns the number of notes moved """
+		if self._pending_edits == 0:
+			return 0
+		removed, added, modified = self._pending_removed, self._pending_added, self._pending_modified
+		batch = self._pending_edits
+		self._pending_removed, self._pending_added, self._pending_modified = [], [], []
+		self._pending_edits = 0
+		if not (removed or added or modified):
+			return 0 # the staged edits undid each other
+		self._is_editing = True
+		try:
+			if self._extended_api:
+				moved = self._edit_extended(removed, added, modified)
+			elif self._ranged_api:
+				moved = self._edit_ranged(removed, added, modified)
+			else:
+				moved = self._edit_replace()
+		except RuntimeError:
+			return 0 # the clip was deleted
+		finally:
+			self._is_editing = False
+		self.last_moved = moved
+		self.notes_moved += moved
+		self.writes += 1
+		self.last_batch = batch
+		self.batch_sizes[batch] = self.batch_sizes.get(batch, 0) + 1
+		return moved
+
+	def _update_mirror(self, removed, added, modified):
+		for note in removed:
+			self._index.remove(note)
+		for old, new in modified:
+			if self._index.remove(old):
+				self._index.add(new)
+		for note in added:
+			self._index.add(note)
+
+	def _area(self, notes):
+		# smallest (from_time, from_pitch, time_span, pitch_span) holding all the notes
+		min_pitch = min([note[0] for note in notes])
+		max_pitch = max([note[0] for note in notes])
+		min_time = min([note[1] for note in notes]) - TIME_EPSILON
+		max_time = max([note[1] for note in notes]) + TIME_EPSILON
+		return min_time, min_pitch, max_time - min_time, max_pitch - min_pitch + 1
+
+	def _edit_ranged(self, removed, added, modified):
+		moved = 0
+		to_add = list(added) + [new for old, new in modified]
+		to_remove = list(removed) + [old for old, new in modified]
+		if to_remove:
+			from_time, from_pitch, time_span, pitch_span = self._area(to_remove)
+			# remove_notes clears the whole area : put back the notes that were not meant to go.
+			# The mirror already holds the edit, the notes being added are sent anyway
+			pending = {}
+			for note in to_add:
+				pending[_note_key(note)] = pending.get(_note_key(note), 0) + 1
+			for note in self._index.notes_in_range(from_time, from_time + time_span):
+				if from_pitch <= note[0] < from_pitch + pitch_span:
+					if pending.get(_note_key(note), 0) > 0:
+						pending[_note_key(note)] -= 1
+					else:
+						to_add.append(note)
+			self._clip.remove_notes(from_time, from_pitch, time_span, pitch_span)
+		if to_add:
+			self._clip.set_notes(tuple(to_add))
+			moved += len(to_add)
+		return moved
+
+	def _edit_extended(self, removed, added, modified):
+		moved = 0
+		to_remove = list(removed) + [old for old, new in modified]
+		if to_remove:
+			from_time, from_pitch, time_span, pitch_span = self._area(to_remove)
+			live_notes = self._clip.get_notes_extended(from_pitch, pitch_span, from_time, time_span)
+			moved += len(live_notes)
+			by_key = {}
+			for live_note in live_notes:
+				by_key.setdefault(_note_key((live_note.pitch, live_note.start_time, live_note.duration, live_note.velocity, live_note.mute)), []).append(live_note)
+			remove_ids = []
+			for note in removed:
+				if by_key.get(_note_key(note)):
+					remove_ids.append(by_key[_note_key(note)].pop().note_id)
+			modifications = False
+			for old, new in modified:
+				if by_key.get(_note_key(old)):
+					live_note = by_key[_note_key(old)].pop()
+					live_note.pitch = new[0]
+					live_note.start_time = new[1]
+					live_note.duration = new[2]
+					live_note.velocity = new[3]
+					live_note.mute = new[4]
+					modifications = True
+			if modifications:
+				self._clip.apply_note_modifications(live_notes)
+				moved += len(live_notes)
+			if remove_ids:
+				self._clip.remove_notes_by_id(tuple(remove_ids))
+		if added:
+			self._clip.add_new_notes(tuple([Live.Clip.MidiNoteSpecification(pitch=note[0], start_time=note[1], duration=note[2], velocity=note[3], mute=note[4]) for note in added]))
+			moved += len(added)
+		return moved
+
+	def _edit_replace(self):
+		self._clip.select_all_notes()
+		self._clip.replace_selected_notes(self._index.notes)
+		self._clip.deselect_all_notes()
+		return len(self._index)
@@ -0,0 +1,49 @@
+from collections import OrderedDict
+
+
+class ClipStateCache(object):
+	""" Parsed states of the clips the step sequencer left, most recently used
+	last, at most size of them. Each parked clip keeps a notes listener : when
+	its notes change the state is dropped, so a state found here still matches
+	the clip and can be used without reading its notes again. """
+
+	def __init__(self, size):
+		self._size = size
+		self._states = OrderedDict() # clip -> state
+		self._listeners = {} # clip -> notes listener dropping its state
+
+	def __len__(self):
+		return len(self._states)
+
+	def put(self, clip, state):
+		self.drop(clip)
+		self._states[clip] = state
+		self._listeners[clip] = self._dropper(clip)
+		clip.add_notes_listener(self._listeners[clip])
+		while len(self._states) > self._size:
+			self.drop(next(iter(self._states)))
+
+	def pop(self, clip):
+		""" state parked for clip, None if there is none. The clip is current again : it leaves the cache """
+		state = self._states.get(clip)
+		self.drop(clip)
+		return state
+
+	def drop(self, clip):
+		if clip in self._states:
+			del self._states[clip]
+			listener = self._listeners.pop(clip)
+			try:
+				if clip.notes_has_listener(listener):
+					clip.remove_notes_listener(listener)
+			except RuntimeError:
+				pass # the clip was deleted
+
+	def clear(self):
+		for clip in list(self._states):
+			self.drop(clip)
+
+	def _dropper(self, clip):
+		def on_notes_changed():
+			self.drop(clip)
+		return on_notes_changed
@@ -1,5 +1,6 @@
 from _Framework.Skin import SkinColorMissingError
 from _Framework.ButtonElement import ButtonElement, ON_VALUE, OFF_VALUE
+from .SkinPalette import SkinPalette
 
 class ConfigurableButtonElement(ButtonElement):
 	"""
@@ -15,6 +16,8 @@ class ConfigurableButtonElement(ButtonElement):
 
 	def __init__(self, is_momentary, msg_type, channel, identifier, skin = None, default_states = None, control_surface = None, *a, **k):
 		self._control_surface = control_surface
+		if skin is None:
+			skin = SkinPalette()
 		super(ConfigurableButtonElement, self).__init__(is_momentary, msg_type, channel, identifier, skin = skin, **k)
 		if default_states is not None:
 			self.default_states = default_states
@@ -54,8 +57,7 @@ class ConfigurableButtonElement(ButtonElement):
 	def set_on_off_values(self, on_value, off_value = None):
 		self.clear_send_cache()
 		if off_value == None:
-			self.states[True] = str(on_value)+".On"
-			self.states[False] = str(on_value)+".Off"
+			self.states[True], self.states[False] = self._skin.on_off(on_value)
 		else:
 			self.states[True] = on_value
 			self.states[False] = off_value
@@ -67,9 +69,10 @@ class ConfigurableButtonElement(ButtonElement):
 		return not self.suppress_script_forwarding
 
 	def set_light(self, value):
-		try:
-			self._draw_skin(value)
-		except SkinColorMissingError:
+		color = self._skin.get(value)
+		if color != None:
+			self._draw(color)
+		else:
 			super(ButtonElement, self).set_light(value)
 
 	def send_value(self, value, **k):
@@ -89,6 +92,9 @@ class ConfigurableButtonElement(ButtonElement):
 		"""
 		self._force_next_send = True
 		self.clear_send_cache()
+		if self._control_surface != None and not self.is_enabled():
+			# forwarded to Live, its feedback may have changed the LED
+			self._control_surface.forget_led(self)
 		
 		
 	def _do_send_on_value(self, **k):
@@ -104,7 +110,19 @@ class ConfigurableButtonElement(ButtonElement):
 			self._draw_skin(self._off_value)
 
 	def _draw_skin(self, value):
-		self._skin[value].draw(self)
+		color = self._skin.get(value)
+		if color != None:
+			self._draw(color)
+		else:
+			self._skin[value].draw(self)
+
+	def _draw(self, color):
+		# PaletteColor, what Color.draw would send
+		for value, channel in color.sends:
+			if channel == None:
+				super(ConfigurableButtonElement, self).send_value(value)
+			else:
+				super(ConfigurableButtonElement, self).send_value(value, channel=channel)
 		
 	def script_wants_forwarding(self):
 		return not self.suppress_script_forwarding
\ No newline at end of file
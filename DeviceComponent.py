@@ -109,7 +109,7 @@ class DeviceComponent(LiveDeviceComponent):
 		if self._matrix:
 			self._sliders = []
 			for column in range(self._matrix.width()):
-				slider = DeviceControllerStrip(tuple([self._matrix.get_button(column, (self._matrix.height() - 1 - row)) for row in range(self._matrix.height())]), self)
+				slider = DeviceControllerStrip(tuple([self._matrix.get_button(column, (self._matrix.height() - 1 - row)) for row in range(self._matrix.height())]), self, skin = self._control_surface._skin)
 				slider._parent = self
 				self._sliders.append(slider)
 			self._sliders = tuple(self._sliders)
@@ -190,7 +190,7 @@ class DeviceComponent(LiveDeviceComponent):
 
 	def on_selected_track_changed(self):
 		if not self._is_locked_to_device:
-			self._selected_track = self.song().view.selected_track
+			self._selected_track = self._control_surface.live_state().selected_track
 			if(self._selected_track.view.selected_device):
 				self.set_device(self._selected_track.view.selected_device)
 			else:
@@ -440,7 +440,8 @@ class DeviceComponent(LiveDeviceComponent):
 			if(self._prev_track_button != None):
 				self._prev_track_button.set_on_off_values("Mode.Track.On", "Mode.Track.Off")
 				
-				if(self.selected_track_idx > 0 and not self._is_locked_to_device):
+				idx = self.selected_track_idx
+				if(idx != None and idx > 0 and not self._is_locked_to_device):
 					self._prev_track_button.turn_on()
 				else:
 					self._prev_track_button.turn_off()
@@ -448,7 +449,8 @@ class DeviceComponent(LiveDeviceComponent):
 			if(self._next_track_button != None):
 				self._next_track_button.set_on_off_values("Mode.Track.On", "Mode.Track.Off")
 				
-				if(self.selected_track_idx < len(self.song().tracks) - 1 and not self._is_locked_to_device):
+				idx = self.selected_track_idx
+				if(idx != None and idx < len(self._control_surface.live_index().tracks()) - 1 and not self._is_locked_to_device):
 					self._next_track_button.turn_on()
 				else:
 					self._next_track_button.turn_off()
@@ -468,8 +470,10 @@ class DeviceComponent(LiveDeviceComponent):
 		assert (value in range(128))
 		if self.is_enabled():
 			if ((not sender.is_momentary()) or (value is not 0)):
-				if(self.selected_track_idx < len(self.song().tracks) - 1 and not self._is_locked_to_device):
-					self.song().view.selected_track = self.song().tracks[self.selected_track_idx + 1]
+				tracks = self._control_surface.live_index().tracks()
+				idx = self.selected_track_idx
+				if(idx != None and idx < len(tracks) - 1 and not self._is_locked_to_device):
+					self.song().view.selected_track = tracks[idx + 1]
 					self.update()
 
 	def set_prev_track_button(self, button):
@@ -488,19 +492,20 @@ class DeviceComponent(LiveDeviceComponent):
 		assert (value in range(128))
 		if ((not sender.is_momentary()) or (value is not 0)):
 			if self.is_enabled():
-				if(self.selected_track_idx > 0 and not self._is_locked_to_device):
-					self.song().view.selected_track = self.song().tracks[self.selected_track_idx - 1]
+				idx = self.selected_track_idx
+				if(idx != None and idx > 0 and not self._is_locked_to_device):
+					self.song().view.selected_track = self._control_surface.live_index().tracks()[idx - 1]
 					self.update()
 
 	@property
 	def selected_track_idx(self):
-		tracks = list(self.song().tracks)
-		result =  tracks.index(self.song().view.selected_track) if self.song().view.selected_track in tracks else None
+		# None when the selected track is a return or the master track
+		result = self._control_surface.live_index().track_index(self._control_surface.live_state().selected_track)
 		return result
 		#return self.tuple_idx(self.song().tracks, self.song().view.selected_track)
 
 	def selected_track(self):
-		return self.song().view.selected_track
+		return self._control_surface.live_state().selected_track
 
 	
 
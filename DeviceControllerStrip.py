@@ -15,10 +15,17 @@ SLIDER_MODE_BIG_ENUM = 5
 class DeviceControllerStrip(ButtonSliderElement):
 
 
-	def __init__(self, buttons, control_surface, parent = None):
+	def __init__(self, buttons, control_surface, skin, parent = None):
 		ButtonSliderElement.__init__(self, buttons)
 		self._control_surface = control_surface
 		self._parent = parent
+		# colours resolved once, (on, off) for each slider mode
+		self._disabled = skin.color("DefaultButton.Disabled")
+		self._toggle_colors = (skin.color("Device.Toggle.On"), skin.color("Device.Toggle.Off"))
+		self._enum_colors = (skin.color("Device.Enum.On"), skin.color("Device.Enum.Off"))
+		self._big_enum_colors = (skin.color("Device.BigEnum.On"), skin.color("Device.BigEnum.Off"))
+		self._slider_colors = (skin.color("Device.Slider.On"), skin.color("Device.Slider.Off"))
+		self._precision_slider_colors = (skin.color("Device.PrecisionSlider.On"), skin.color("Device.PrecisionSlider.Off"))
 		self._num_buttons = len(buttons)
 		self._value_map = tuple([float(index) / (self._num_buttons-1) for index in range(self._num_buttons)])
 		self._precision_mode = False
@@ -116,69 +123,67 @@ class DeviceControllerStrip(ButtonSliderElement):
 			self.reset()
 			
 	def _update_off(self):
-		v =  ["DefaultButton.Disabled" for index in range(len(self._buttons))]
+		v =  [self._disabled for index in range(len(self._buttons))]
 		self._update_buttons(tuple(v))
 	
 	def _update_toggle(self):
-		v =  ["DefaultButton.Disabled" for index in range(len(self._buttons))]
+		v =  [self._disabled for index in range(len(self._buttons))]
 		if self._value==self._max:
-			v[0]="Device.Toggle.On"
+			v[0]=self._toggle_colors[0]
 		else:
-			v[0]="Device.Toggle.Off"
+			v[0]=self._toggle_colors[1]
 		self._update_buttons(tuple(v))
 
 	def _update_small_enum(self):
-		v =  ["DefaultButton.Disabled" for index in range(len(self._buttons))]
+		v =  [self._disabled for index in range(len(self._buttons))]
 		for index in range(int(self._range+1)):
 			if self._value==index+self._min:
-				v[index]="Device.Enum.On"
+				v[index]=self._enum_colors[0]
 			else:
-				v[index]="Device.Enum.Off"
+				v[index]=self._enum_colors[1]
 		self._update_buttons(tuple(v))
 
 	def _update_big_enum(self):
-		v =  ["DefaultButton.Disabled" for index in range(len(self._buttons))]
+		v =  [self._disabled for index in range(len(self._buttons))]
 		if self._value>self._min:
-			v[3]="Device.BigEnum.On"
+			v[3]=self._big_enum_colors[0]
 		else:
-			v[3]="Device.BigEnum.Off"
+			v[3]=self._big_enum_colors[1]
 		if self._value<self._max:
-			v[4]="Device.BigEnum.On"
+			v[4]=self._big_enum_colors[0]
 		else:
-			v[4]="Device.BigEnum.Off"
+			v[4]=self._big_enum_colors[1]
 		self._update_buttons(tuple(v))
 	
 	def _update_slider(self):
-		v =  ["DefaultButton.Disabled" for index in range(len(self._buttons))]
+		v =  [self._disabled for index in range(len(self._buttons))]
 		for index in range(len(self._buttons)):
 			if self._value >=self._value_map[index]*self._range+self._min:
-				v[index]="Device.Slider.On"
+				v[index]=self._slider_colors[0]
 			else:
-				v[index]="Device.Slider.Off"
+				v[index]=self._slider_colors[1]
 		self._update_buttons(tuple(v))
 		
 	def _update_precision_slider(self):
-		v =  ["DefaultButton.Disabled" for index in range(len(self._buttons))]
+		v =  [self._disabled for index in range(len(self._buttons))]
 		if self._value>self._min:
-			v[3]="Device.PrecisionSlider.On"
+			v[3]=self._precision_slider_colors[0]
 		else:
-			v[3]="Device.PrecisionSlider.Off"
+			v[3]=self._precision_slider_colors[1]
 			
 		if self._value<self._max:
-			v[4]="Device.PrecisionSlider.On"
+			v[4]=self._precision_slider_colors[0]
 		else:
-			v[4]="Device.PrecisionSlider.Off"
+			v[4]=self._precision_slider_colors[1]
 		self._update_buttons(tuple(v))
 			
 	def _update_buttons(self, buttons):
 		assert isinstance(buttons, tuple)
 		assert (len(buttons) == len(self._buttons))
 		for index in range(len(self._buttons)):
+			# same colour for both states, so it stays if something turns the button on/off
 			self._buttons[index].set_on_off_values(buttons[index], buttons[index])
-			if buttons[index].endswith("On"):#buttons[index]>0:
-				self._buttons[index].turn_on()
-			else:
-				self._buttons[index].turn_off()
+			self._buttons[index].set_light(buttons[index])
 
 	def _button_value(self, value, sender):
 		assert isinstance(value, int)
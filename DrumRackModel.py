@@ -0,0 +1,149 @@
+import Live
+from _Framework.Util import find_if
+from collections import OrderedDict
+
+
+class DrumRackModel(object):
+	""" The pads of a drum rack as the script draws them : which note each pad
+	plays (its position in drum_pads) and which pads hold a chain, a 128 entry
+	bitmap. Read once, then kept up to date by the rack's drum_pads listener and
+	a chains listener per pad, so drawing the pads asks nothing to Live. """
+
+	def __init__(self, device):
+		self._device = device
+		self._pads = ()
+		self._pad_index = {} # pad -> note
+		self._filled = bytearray(128) # note -> 1 when its pad holds a chain
+		self._chains_listeners = {} # pad -> chains listener
+		device.add_drum_pads_listener(self._on_drum_pads_changed)
+		self._on_drum_pads_changed()
+
+	@property
+	def device(self):
+		return self._device
+
+	def disconnect(self):
+		try:
+			if self._device.drum_pads_has_listener(self._on_drum_pads_changed):
+				self._device.remove_drum_pads_listener(self._on_drum_pads_changed)
+		except RuntimeError:
+			pass # the device was deleted
+		self._observe_pads(())
+
+	def pad(self, note):
+		""" the drum pad playing note """
+		return self._pads[note]
+
+	def index_of(self, pad):
+		""" note of pad, -1 if it is not a pad of this rack """
+		return self._pad_index.get(pad, -1)
+
+	def is_filled(self, note):
+		return 0 <= note < len(self._filled) and self._filled[note] == 1
+
+	def _on_drum_pads_changed(self):
+		self._observe_pads(tuple(self._device.drum_pads))
+
+	def _observe_pads(self, pads):
+		for pad, listener in self._chains_listeners.items():
+			try:
+				if pad.chains_has_listener(listener):
+					pad.remove_chains_listener(listener)
+			except RuntimeError:
+				pass
+		self._chains_listeners = {}
+		self._pads = pads
+		self._pad_index = dict((pad, note) for note, pad in enumerate(pads))
+		self._filled = bytearray(max(128, len(pads)))
+		for note, pad in enumerate(pads):
+			listener = self._chains_listeners[pad] = self._chains_updater(note)
+			pad.add_chains_listener(listener)
+			listener()
+
+	def _chains_updater(self, note):
+		def on_chains_changed():
+			self._filled[note] = 1 if len(self._pads[note].chains) > 0 else 0
+		return on_chains_changed
+
+
+class DrumRackModels(object):
+	""" The DrumRackModels of the racks looked at lately, shared by the
+	components : at most size of them keep their listeners """
+
+	def __init__(self, size):
+		self._size = size
+		self._models = OrderedDict() # device -> DrumRackModel, most recently used last
+
+	def get(self, device):
+		""" DrumRackModel of device, None for None """
+		if device == None:
+			return None
+		model = self._models.pop(device, None)
+		if model == None:
+			model = DrumRackModel(device)
+		self._models[device] = model
+		while len(self._models) > self._size:
+			self._models.popitem(last=False)[1].disconnect()
+		return model
+
+	def clear(self):
+		for model in self._models.values():
+			model.disconnect()
+		self._models = OrderedDict()
+
+
+class DrumGroupDevices(object):
+	""" The drum rack each track plays, found once per track. The walk down the
+	track's instrument racks is done again only after the devices of the track,
+	or the chains of a rack on the way, changed. """
+
+	def __init__(self):
+		self._devices = {} # track -> drum rack found, None when there is none
+		self._listeners = {} # track -> (listener dropping the entry, [(Live object, listened property)])
+
+	def get(self, track):
+		""" the first drum rack of track, looking inside its instrument racks. None if there is none """
+		if track == None:
+			return None
+		if track not in self._devices:
+			observed = []
+			self._devices[track] = self._find(track, observed)
+			listener = self._dropper(track)
+			for subject, name in observed:
+				getattr(subject, "add_" + name + "_listener")(listener)
+			self._listeners[track] = (listener, observed)
+		return self._devices[track]
+
+	def _find(self, track_or_chain, observed):
+		observed.append((track_or_chain, "devices"))
+		device = find_if(lambda d: d.type == Live.Device.DeviceType.instrument, track_or_chain.devices)
+		if device:
+			if device.can_have_drum_pads:
+				return device
+			elif device.can_have_chains:
+				observed.append((device, "chains"))
+				for chain in device.chains:
+					found = self._find(chain, observed)
+					if found:
+						return found
+		return None
+
+	def drop(self, track):
+		if track in self._devices:
+			del self._devices[track]
+			listener, observed = self._listeners.pop(track)
+			for subject, name in observed:
+				try:
+					if getattr(subject, name + "_has_listener")(listener):
+						getattr(subject, "remove_" + name + "_listener")(listener)
+				except RuntimeError:
+					pass # deleted with the track
+
+	def clear(self):
+		for track in list(self._devices):
+			self.drop(track)
+
+	def _dropper(self, track):
+		def on_devices_changed():
+			self.drop(track)
+		return on_devices_changed
@@ -0,0 +1,48 @@
+class ImplicitArm(object):
+	""" The track the script keeps implicitly armed, at most one. Moving the
+	arm to another track writes to the track left and to the new one only :
+	every track of the song is written again the first time, and after Live
+	reported a change of the track list. """
+
+	def __init__(self, song, live_index):
+		self._song = song
+		self._index = live_index
+		self._track = None # the implicitly armed track, None when there is none
+		self._synced = False # False until all the tracks were written
+		song.add_tracks_listener(self._on_tracks_changed)
+
+	def disconnect(self):
+		if self._song.tracks_has_listener(self._on_tracks_changed):
+			self._song.remove_tracks_listener(self._on_tracks_changed)
+		self._on_tracks_changed()
+
+	def _on_tracks_changed(self):
+		self._track = None
+		self._synced = False
+
+	@property
+	def track(self):
+		return self._track
+
+	def can_arm(self, track):
+		return track.can_be_armed and track.has_midi_input
+
+	def set_track(self, track):
+		""" implicitly arm track and no other one. None (or a track that can't be armed) disarms them all """
+		if track != None and not self.can_arm(track):
+			track = None
+		if not self._synced:
+			for each in self._index.tracks():
+				if self.can_arm(each):
+					each.implicit_arm = each == track
+			self._synced = True
+		elif track != self._track:
+			if self._track != None:
+				try:
+					if self._track.can_be_armed:
+						self._track.implicit_arm = False
+				except RuntimeError:
+					pass # the track was deleted
+			if track != None:
+				track.implicit_arm = True
+		self._track = track
@@ -93,7 +93,7 @@ class InstrumentControllerComponent(CompoundComponent):
 			self._update_OSD()
 					
 	def _set_feedback_velocity(self):
-		if self.song().session_record:
+		if self._control_surface.live_state().session_record:
 			self._control_surface._c_instance.set_feedback_velocity(self._recordind_feedback_velocity)
 		else:
 			self._control_surface._c_instance.set_feedback_velocity(self._normal_feedback_velocity)
@@ -430,30 +430,11 @@ class InstrumentControllerComponent(CompoundComponent):
 
 	#Set the drum rack instrument to _drum_group_device variable, if it exists
 	def _get_drumrack_device(self):
-		if self._track_controller.selected_track != None:
-			track = self._track_controller.selected_track
-			if(track.devices != None and len(track.devices) > 0):
-				#device = track.devices[0]
-				device = self.find_drum_group_device(track)
-				if(device != None and device.can_have_drum_pads and device.has_drum_pads):
-					self._drum_group_device = device
-				else:
-					self._drum_group_device = None
-			else:
-				self._drum_group_device = None
+		device = self._control_surface.drum_group_device(self._track_controller.selected_track)
+		if(device != None and device.can_have_drum_pads and device.has_drum_pads):
+			self._drum_group_device = device
 		else:
 			self._drum_group_device = None
-	
-	#Return the drum device inside the track devices or inside the track chain or None if device is not a Drum
-	def find_drum_group_device(self, track):
-		device = find_if(lambda d: d.type == Live.Device.DeviceType.instrument, track.devices)
-		if device:
-			if device.can_have_drum_pads:
-				return device
-			elif device.can_have_chains:
-				return find_if(bool, imap(self.find_drum_group_device, device.chains))
-		else:
-			return None
 			
 	def _update_matrix(self):
 		if not self.is_enabled() or not self._matrix or self._scales.is_enabled():
@@ -621,6 +602,7 @@ class InstrumentControllerComponent(CompoundComponent):
 							button.turn_off()
 
 			if self._scales.is_drumrack:
+				drum_rack = self._control_surface.drum_rack(self._drum_group_device)
 
 				for button, (x, y) in self._matrix.iterbuttons():
 					if button and (not self._scales.is_quick_scale or y > 1):
@@ -631,7 +613,7 @@ class InstrumentControllerComponent(CompoundComponent):
 							note = 12 * self._scales._octave + 32 + x - 4 + 4 * (7 - y)
 
 						if note < 128 and note >= 0:
-							if self._drum_group_device != None and self._drum_group_device.can_have_drum_pads and self._drum_group_device.has_drum_pads and self._drum_group_device.drum_pads[note].chains:
+							if drum_rack != None and drum_rack.is_filled(note):
 								button.set_light("DrumGroup.PadFilled")
 								button.set_enabled(False)
 								button.set_channel(self.base_channel)
@@ -649,7 +631,7 @@ class InstrumentControllerComponent(CompoundComponent):
 						#button.turn_off()
 
 			else:	
-				pattern = self._scales.get_pattern()
+				layout = self._scales.get_layout(self._matrix.width(), self._matrix.height())
 				max_j = self._matrix.width() - 1
 				a = 0
 				if self._scales.is_chromatic:
@@ -657,7 +639,7 @@ class InstrumentControllerComponent(CompoundComponent):
 				for button, (i, j) in self._matrix.iterbuttons():
 					if button and (not self._scales.is_quick_scale or j > 1):
 						a = a +1
-						note_info = pattern.note(i, max_j - j)
+						note_info = layout[i][max_j - j]
 						if note_info.index != None:
 							if note_info.root:
 								button.set_light("Note.Pads.Root")
@@ -1,4 +1,5 @@
 from __future__ import with_statement
+from contextlib import contextmanager
 import Live
 from _Framework.ControlSurface import ControlSurface
 from _Framework.InputControlElement import MIDI_CC_TYPE, MIDI_NOTE_TYPE
@@ -8,6 +9,12 @@ from .ConfigurableButtonElement import ConfigurableButtonElement
 from .MainSelectorComponent import MainSelectorComponent
 from .NoteRepeatComponent import NoteRepeatComponent
 from .M4LInterface import M4LInterface
+from .LedFrame import LedFrame, SysexLedFrame, DoubleBufferedLedFrame
+from .LiveState import LiveState
+from .LiveIndex import LiveIndex
+from .ImplicitArm import ImplicitArm
+from .DrumRackModel import DrumRackModels, DrumGroupDevices
+from .LiveProfiler import LiveProfile, unwrap
 try:
     exec("from .Settings import Settings")
 except ImportError:
@@ -50,6 +57,13 @@ STANDALONE_MODE = 0
 #DRUM_LAYOUT = 1
 
 STD_MSG_HEADER = (SYSEX_START,) + NOVATION_MANUFACTURER_ID + (2, )
+LED_SYSEX_COMMAND = 3
+MK2_LED_SYSEX_HEADER = (240, 0, 32, 41, 2, 24, 10)
+# Live values held by LiveState, the snapshot is dropped when one of them changes
+LIVE_STATE_SONG_PROPERTIES = ("is_playing", "session_record", "tracks", "return_tracks", "scenes")
+LIVE_STATE_VIEW_PROPERTIES = ("selected_track", "selected_scene", "detail_clip")
+# drum racks whose pads are followed at once (instrument mode and a step sequencer locked elsewhere)
+DRUM_RACK_MODELS = 4
 
 
 class Launchpad(ControlSurface):
@@ -57,6 +71,15 @@ class Launchpad(ControlSurface):
 	_active_instances = []
 	
 	def __init__(self, c_instance):
+		self._live_state = None
+		self._update_passes = 0
+		self._live_profile = None
+		# before ControlSurface adds its own listeners : the components it notifies must not see the old snapshot
+		self._add_live_state_listeners(Live.Application.get_application().get_document())
+		self._live_index = LiveIndex(Live.Application.get_application().get_document())
+		self._implicit_arm = ImplicitArm(Live.Application.get_application().get_document(), self._live_index)
+		self._drum_racks = DrumRackModels(DRUM_RACK_MODELS)
+		self._drum_group_devices = DrumGroupDevices()
 		ControlSurface.__init__(self, c_instance)
 		live = Live.Application.get_application()
 		self._live_major_version = live.get_major_version()
@@ -66,6 +89,8 @@ class Launchpad(ControlSurface):
 		self._lpx = False
 		self._mk2_rgb = False
 		self._mk3_rgb = False
+		self._led_frame = LedFrame(self._send_led_frame_midi)
+		self._led_drain_scheduled = False
 		with self.component_guard():
 			self._suppress_send_midi = True
 			self._suppress_session_highlight = True
@@ -103,6 +128,8 @@ class Launchpad(ControlSurface):
 			self._skin = make_skin()
 			self._side_notes = (8, 24, 40, 56, 72, 88, 104, 120)
 			self._drum_notes = (41, 42, 43, 44, 45, 46, 47, 57, 58, 59, 60, 61, 62, 63, 73, 74, 75, 76, 77, 78, 79, 89, 90, 91, 92, 93, 94, 95, 105, 106, 107)
+
+		self._led_frame = self._make_led_frame()
 		
 		with self.component_guard():
 			is_momentary = True
@@ -128,11 +155,11 @@ class Launchpad(ControlSurface):
 				matrix.add_row(tuple(button_row))
 
 			if self._mk3_rgb or self._lpx :
-				top_buttons = [ConfigurableButtonElement(is_momentary, MIDI_CC_TYPE, 0, 91 + index, skin = self._skin) for index in range(8)]
-				side_buttons = [ConfigurableButtonElement(is_momentary, MIDI_CC_TYPE, 0, self._side_notes[index], skin = self._skin) for index in range(8)]
+				top_buttons = [ConfigurableButtonElement(is_momentary, MIDI_CC_TYPE, 0, 91 + index, skin = self._skin, control_surface = self) for index in range(8)]
+				side_buttons = [ConfigurableButtonElement(is_momentary, MIDI_CC_TYPE, 0, self._side_notes[index], skin = self._skin, control_surface = self) for index in range(8)]
 			else:
-				top_buttons = [ConfigurableButtonElement(is_momentary, MIDI_CC_TYPE, 0, 104 + index, skin = self._skin) for index in range(8)]
-				side_buttons = [ConfigurableButtonElement(is_momentary, MIDI_NOTE_TYPE, 0, self._side_notes[index], skin = self._skin) for index in range(8)]
+				top_buttons = [ConfigurableButtonElement(is_momentary, MIDI_CC_TYPE, 0, 104 + index, skin = self._skin, control_surface = self) for index in range(8)]
+				side_buttons = [ConfigurableButtonElement(is_momentary, MIDI_NOTE_TYPE, 0, self._side_notes[index], skin = self._skin, control_surface = self) for index in range(8)]
 				
 			top_buttons[0].name = 'Bank_Select_Up_Button'
 			top_buttons[1].name = 'Bank_Select_Down_Button'
@@ -150,8 +177,12 @@ class Launchpad(ControlSurface):
 			side_buttons[5].name = 'Trk_On_Button'
 			side_buttons[6].name = 'Solo_Button'
 			side_buttons[7].name = 'Arm_Button'
+			for button in [matrix.get_button(column, row) for row in range(8) for column in range(8)] + top_buttons + side_buttons:
+				self._led_frame.add_led(button.message_type() == MIDI_CC_TYPE, button.original_identifier())
 			self._osd = M4LInterface()
 			self._osd.name = "OSD"
+			if Settings.DEBUG__LIVE_PROFILE:
+				self._start_live_profile()
 			self._init_note_repeat()
 			self._selector = MainSelectorComponent(matrix, tuple(top_buttons), tuple(side_buttons), self._config_button, self._osd, self, self._note_repeat)
 			self._selector.name = 'Main_Modes'
@@ -176,6 +207,9 @@ class Launchpad(ControlSurface):
 				self.log_message("LaunchPad95 (classic) Loaded !")
 				
 	def disconnect(self):
+		self._led_frame.set_budget(None)
+		self._led_frame.flush()
+		self._led_frame = LedFrame(self._send_led_frame_midi)
 		self._suppress_send_midi = True
 		for control in self.controls:
 			if isinstance(control, ConfigurableButtonElement):
@@ -184,7 +218,17 @@ class Launchpad(ControlSurface):
 		if self._selector != None:
 			self._user_byte_write_button.remove_value_listener(self._user_byte_value)
 			self._config_button.remove_value_listener(self._config_value)
+		if self._live_profile != None:
+			self.dump_live_profile(Settings.DEBUG__LIVE_PROFILE_FILE)
+		if self._selector != None and Settings.DEBUG__MODE_TRANSITIONS:
+			for line in self._selector.transition_report():
+				self.log_message(line)
 		ControlSurface.disconnect(self)
+		self._remove_live_state_listeners(unwrap(self.song()))
+		self._live_index.disconnect()
+		self._implicit_arm.disconnect()
+		self._drum_racks.clear()
+		self._drum_group_devices.clear()
 		self._suppress_send_midi = False
 		if self._lpx:
 			# lpx needs disconnect string sent
@@ -237,6 +281,7 @@ class Launchpad(ControlSurface):
 			Launchpad._combine_active_instances()
 
 	def refresh_state(self):
+		self._led_frame.reset()
 		ControlSurface.refresh_state(self)
 		self.schedule_message(5, self._update_hardware)
 
@@ -310,10 +355,160 @@ class Launchpad(ControlSurface):
 	def _send_midi(self, midi_bytes, optimized=None):
 		sent_successfully = False
 		if not self._suppress_send_midi:
+			if self._led_frame.collect(midi_bytes):
+				self._drain_held_leds_later()
+				return True
 			sent_successfully = ControlSurface._send_midi(self, midi_bytes, optimized=optimized)
 		return sent_successfully
 
+	def _send_led_frame_midi(self, midi_bytes):
+		# sent as is, the frame is already the optimized form
+		if not self._suppress_send_midi:
+			ControlSurface._send_midi(self, midi_bytes, optimized=False)
+
+	def _make_led_frame(self):
+		# LED output strategy, once the model is known
+		if self._lpx:
+			led_frame = SysexLedFrame(self._send_led_frame_midi, STD_MSG_HEADER + (LP_X_ID, LED_SYSEX_COMMAND))
+		elif self._mk3_rgb:
+			led_frame = SysexLedFrame(self._send_led_frame_midi, STD_MSG_HEADER + (LP_MINI_MK3_ID, LED_SYSEX_COMMAND))
+		elif self._mk2_rgb:
+			led_frame = SysexLedFrame(self._send_led_frame_midi, MK2_LED_SYSEX_HEADER, mk2=True)
+		elif Settings.LED_OUTPUT__MK1 == "double buffer":
+			led_frame = DoubleBufferedLedFrame(self._send_led_frame_midi)
+		else:
+			led_frame = LedFrame(self._send_led_frame_midi)
+		led_frame.set_budget(Settings.LED_OUTPUT__BYTES_PER_TICK)
+		return led_frame
+
+	@contextmanager
+	def led_frame(self, urgent=False):
+		""" LED messages sent inside go out together when the pass ends.
+		urgent : the pass answers the user, its LEDs go out first and are never held """
+		led_frame = self._led_frame # the strategy can change inside (model identified)
+		led_frame.begin(urgent)
+		self._update_passes += 1
+		try:
+			yield
+		finally:
+			self._update_passes -= 1
+			if self._update_passes == 0:
+				self._end_live_state()
+			led_frame.end(urgent)
+			self._drain_held_leds_later()
+
+	def live_state(self):
+		""" Snapshot of the song state for the current update pass (LiveState) """
+		if self._live_state == None:
+			live_state = LiveState(self.song(), self._live_index)
+			if self._update_passes == 0:
+				# no pass to scope it, only good for the caller
+				return live_state
+			self._live_state = live_state
+		return self._live_state
+
+	def live_index(self):
+		""" Positions of the tracks, scenes and clip slots (LiveIndex) """
+		return self._live_index
+
+	def set_implicit_arm_track(self, track):
+		""" Implicitly arm track, and only it (ImplicitArm). None disarms the track armed so far """
+		self._implicit_arm.set_track(track)
+
+	def drum_group_device(self, track):
+		""" The drum rack track plays (DrumGroupDevices), None if there is none """
+		return self._drum_group_devices.get(track)
+
+	def drum_rack(self, device):
+		""" DrumRackModel of a drum rack device, shared by the components. None for None """
+		return self._drum_racks.get(device)
+
+	def _end_live_state(self):
+		live_state = self._live_state
+		self._live_state = None
+		if live_state != None and Settings.DEBUG__LIVE_READS:
+			self.log_message("update pass : " + str(live_state.reads) + " Live reads, " + str(live_state.hits) + " from the snapshot")
+
+	def _on_live_state_changed(self):
+		# a later read in the pass gets the new value
+		self._end_live_state()
+
+	def _add_live_state_listeners(self, song):
+		for name in LIVE_STATE_SONG_PROPERTIES:
+			getattr(song, "add_" + name + "_listener")(self._on_live_state_changed)
+		for name in LIVE_STATE_VIEW_PROPERTIES:
+			getattr(song.view, "add_" + name + "_listener")(self._on_live_state_changed)
+
+	def _remove_live_state_listeners(self, song):
+		for name in LIVE_STATE_SONG_PROPERTIES:
+			if getattr(song, name + "_has_listener")(self._on_live_state_changed):
+				getattr(song, "remove_" + name + "_listener")(self._on_live_state_changed)
+		for name in LIVE_STATE_VIEW_PROPERTIES:
+			if getattr(song.view, name + "_has_listener")(self._on_live_state_changed):
+				getattr(song.view, "remove_" + name + "_listener")(self._on_live_state_changed)
+
+	def _start_live_profile(self):
+		# components built from now on, the surface and LiveState get the song through a LiveProxy
+		profile = self._live_profile = LiveProfile()
+		song = profile.wrap(self.song())
+		def profiled_song():
+			return song
+		register_component = self._register_component
+		def register_profiled_component(component):
+			component.song = profiled_song
+			register_component(component)
+		set_controlled_track = self.set_controlled_track
+		def set_profiled_controlled_track(track):
+			set_controlled_track(unwrap(track))
+		self.song = profiled_song
+		self._register_component = register_profiled_component
+		self.set_controlled_track = set_profiled_controlled_track
+		for component in self.components:
+			component.song = profiled_song
+
+	def dump_live_profile(self, path=None):
+		""" Writes the report of Settings.DEBUG__LIVE_PROFILE to path, or to the Live log when None """
+		if self._live_profile == None:
+			return
+		lines = self._live_profile.report()
+		if path == None:
+			for line in lines:
+				self.log_message(line)
+		else:
+			with open(path, "w") as report:
+				report.write("\n".join(lines) + "\n")
+
+	def _drain_held_leds_later(self):
+		# LED updates over the budget of this tick go out in the next ones
+		if not self._led_drain_scheduled and self._led_frame.holds():
+			self._led_drain_scheduled = True
+			self.schedule_message(1, self._drain_held_leds)
+
+	def _drain_held_leds(self):
+		self._led_drain_scheduled = False
+		self._led_frame.flush()
+
+	def set_led_mode(self, mode):
+		self._led_frame.set_mode(mode)
+
+	def led_stats(self):
+		""" mode -> (LED updates sent, LED messages suppressed as they would not change anything) """
+		return self._led_frame.stats()
+
+	def forget_led(self, control):
+		self._led_frame.forget(control.message_type() == MIDI_CC_TYPE, control.original_identifier())
+
+	def update_display(self):
+		self._led_frame.next_tick()
+		with self.led_frame():
+			ControlSurface.update_display(self)
+
+	def receive_midi(self, midi_bytes):
+		with self.led_frame(urgent=True):
+			ControlSurface.receive_midi(self, midi_bytes)
+
 	def _update_hardware(self):
+		self._led_frame.reset()
 		self._suppress_send_midi = False
 		if self._user_byte_write_button != None:
 			self._user_byte_write_button.send_value(1)
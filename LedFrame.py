@@ -0,0 +1,394 @@
+# lighting types, same values as the midi channel used for them and as the LPX/mini mk3 sysex lighting types
+LED_STATIC = 0
+LED_FLASH = 1
+LED_PULSE = 2
+
+MIDI_NOTE_ON_STATUS = 144
+MIDI_CC_STATUS = 176
+
+SYSEX_END = 247
+MAX_LED_SPECS = 81 # per LPX/mini mk3 LED sysex
+LED_MESSAGE_BYTES = 3 # what one LED update costs, near enough for the sysex and rapid update forms too
+
+# mk1 (classic, S, mini) : config is CC 0, LED velocity is green * 16 + red + flags
+MK1_CONFIG = (MIDI_CC_STATUS, 0)
+MK1_RAPID_UPDATE_STATUS = MIDI_NOTE_ON_STATUS + 2
+MK1_BUFFER_CONTROL = 32 # + copy * 16 + flash * 8 + updating buffer * 4 + displayed buffer
+MK1_COPY = 16
+MK1_FLASH = 8
+MK1_LED_COLOUR = 51 # red and green bits of the velocity
+MK1_LED_FLAGS = 12 # copy (write both buffers) + clear (clear the other buffer)
+MK1_LED_FLASHING = 8 # clear only : LED is set in one buffer and off in the other
+MK1_SMALL_FRAME = 4 # LEDs, up to that they are drawn straight : the flip would cost more than it hides
+# rapid update fills the LEDs in this order : grid left to right, top to bottom, then side buttons, then top buttons
+MK1_RAPID_UPDATE_ORDER = tuple([(MIDI_NOTE_ON_STATUS, row * 16 + column) for row in range(8) for column in range(8)]
+	+ [(MIDI_NOTE_ON_STATUS, row * 16 + 8) for row in range(8)]
+	+ [(MIDI_CC_STATUS, 104 + column) for column in range(8)])
+
+
+class LedFrame(object):
+	""" LED output strategy : sends every LED message as it comes.
+	Subclasses collect the LED messages sent during one update pass (a mode
+	switch, a button press, a display tick) between begin() and end() and send
+	them when the pass ends, only the last value sent to a LED going out.
+
+	All of them keep what each LED of the surface shows, as
+	(lighting type, colour, static colour under a flash/pulse or None), and
+	drop what would not change it. It is only forgotten when the hardware is
+	reset (reset()) or when Live may have written the LED itself (forget()).
+
+	With a byte budget (set_budget()), LED updates beyond it in one tick are
+	held, still merged per LED, and go out in the next ticks. LEDs written while
+	handling the user input (begin(urgent=True)) are never held. """
+
+	def __init__(self, send_midi):
+		self._output = send_midi
+		self._led_ids = set() # (status, identifier) of the LEDs
+		self._depth = 0
+		self._urgent_depth = 0
+		self._pending = {}
+		self._shown = {} # (status, identifier) -> LED state sent to the hardware
+		self._urgent = set() # LEDs written in reply to the user input, sent first
+		self._budget = None # bytes per tick, None : no limit
+		self._spent = 0
+		self._mode = None
+		self.counters = {} # mode -> [LED messages from the script, LED updates sent]
+		self.deferred = 0 # LED updates held for a later tick, once per tick they wait
+
+	def add_led(self, is_cc, identifier):
+		self._led_ids.add(((MIDI_CC_STATUS if is_cc else MIDI_NOTE_ON_STATUS), identifier))
+
+	def reset(self):
+		""" Forget what the hardware shows, e.g. after it has been re-initialized """
+		self._pending = {}
+		self._shown = {}
+		self._urgent = set()
+
+	def forget(self, is_cc, identifier):
+		""" The LED may have been changed behind our back, send the next value whatever it is """
+		self._shown.pop(((MIDI_CC_STATUS if is_cc else MIDI_NOTE_ON_STATUS), identifier), None)
+
+	def set_budget(self, budget):
+		self._budget = budget if budget == None else max(int(budget), LED_MESSAGE_BYTES)
+
+	def next_tick(self):
+		self._spent = 0
+
+	def holds(self):
+		""" True if LED updates are waiting for the next tick """
+		return self._depth == 0 and bool(self._pending)
+
+	def set_mode(self, mode):
+		""" Mode the next LED messages are counted for """
+		self._mode = mode
+
+	def stats(self):
+		""" mode -> (LED updates sent, LED messages suppressed) """
+		return dict([(mode, (sent, received - sent)) for mode, (received, sent) in self.counters.items()])
+
+	def _count(self, received, sent):
+		counter = self.counters.get(self._mode)
+		if counter == None:
+			counter = self.counters[self._mode] = [0, 0]
+		counter[0] += received
+		counter[1] += sent
+
+	def begin(self, urgent=False):
+		self._depth += 1
+		if urgent:
+			self._urgent_depth += 1
+
+	def end(self, urgent=False):
+		self._depth -= 1
+		if urgent:
+			self._urgent_depth -= 1
+		if self._depth == 0:
+			self.flush()
+
+	def collect(self, midi_bytes):
+		""" Returns True if the message has been taken care of """
+		led = self._led_of(midi_bytes)
+		if led == None:
+			return False
+		if self._urgent_depth > 0:
+			self._urgent.add(led)
+		previous = self._pending.get(led, self._shown.get(led))
+		state = self._state_after(midi_bytes, previous)
+		if not self._room_for(1) or (led in self._pending and state[0] != LED_STATIC and self._static_changed(led, state[2])):
+			# held, the last value wins
+			self._pending[led] = state
+			self._count(1, 0)
+			return True
+		self._pending.pop(led, None)
+		if self._shown.get(led) == state:
+			self._count(1, 0)
+			return True
+		self._shown[led] = state
+		self._count(1, 1)
+		self._spent += len(midi_bytes)
+		return False
+
+	def flush(self):
+		if not self._pending:
+			return
+		pending = self._pending
+		self._pending = {}
+		changed = self._within_budget(sorted([led for led in pending if self._shown.get(led) != pending[led]]), pending)
+		self._count(0, len(changed))
+		for led in changed:
+			kind, colour, static = pending[led]
+			if kind != LED_STATIC and self._static_changed(led, static):
+				self._send_midi((led[0], led[1], static))
+			self._send_midi((led[0] + kind, led[1], colour))
+			self._shown[led] = pending[led]
+
+	def _send_midi(self, midi_bytes):
+		self._spent += len(midi_bytes)
+		self._output(midi_bytes)
+
+	def _room_for(self, leds):
+		return self._budget == None or self._urgent_depth > 0 or self._spent + leds * LED_MESSAGE_BYTES <= self._budget
+
+	def _within_budget(self, leds, pending):
+		""" The changed LEDs sent now, user feedback first. The others are put back in pending for the next ticks """
+		if self._budget == None:
+			self._urgent = set()
+			return leds
+		urgent = [led for led in leds if led in self._urgent]
+		background = [led for led in leds if led not in self._urgent]
+		self._urgent = set()
+		room = max(0, self._budget - self._spent) // LED_MESSAGE_BYTES
+		for led in background[room:]:
+			self._pending[led] = pending[led]
+		self.deferred += len(background[room:])
+		return urgent + background[:room]
+
+	def _static_changed(self, led, static):
+		shown = self._shown.get(led)
+		return static != None and (shown == None or shown[2] != static)
+
+	def _led_of(self, midi_bytes):
+		if len(midi_bytes) != 3 or midi_bytes[0] & 15 > LED_PULSE:
+			return None
+		led = (midi_bytes[0] & 240, midi_bytes[1])
+		if led in self._led_ids:
+			return led
+		return None
+
+	def _state_after(self, midi_bytes, previous):
+		kind = midi_bytes[0] & 15
+		colour = midi_bytes[2]
+		if kind == LED_STATIC:
+			return (LED_STATIC, colour, colour)
+		return (kind, colour, previous[2] if previous != None else None)
+
+
+class SysexLedFrame(LedFrame):
+	""" RGB models, the frame goes out as bulk LED sysex.
+	 - LPX / mini mk3 : one sysex (static, flashing and pulsing colours)
+	 - MK2 : one sysex for the static colours, flashing/pulsing LEDs follow as notes/CCs on channel 2/3
+	"""
+
+	def __init__(self, send_midi, header, mk2=False):
+		super(SysexLedFrame, self).__init__(send_midi)
+		self._header = header
+		self._mk2 = mk2
+		self.sysex_sent = 0
+
+	def collect(self, midi_bytes):
+		if self._depth == 0:
+			return super(SysexLedFrame, self).collect(midi_bytes)
+		led = self._led_of(midi_bytes)
+		if led == None:
+			# keep the order with the other messages
+			self.flush()
+			return False
+		if self._urgent_depth > 0:
+			self._urgent.add(led)
+		previous = self._pending.get(led, self._shown.get(led))
+		self._pending[led] = self._state_after(midi_bytes, previous)
+		self._count(1, 0)
+		return True
+
+	def flush(self):
+		if not self._pending:
+			return
+		pending = self._pending
+		self._pending = {}
+		changed = self._within_budget(sorted([led for led in pending if self._shown.get(led) != pending[led]]), pending)
+		if not changed:
+			return
+		self._count(0, len(changed))
+		if self._mk2:
+			self._flush_mk2(changed, pending)
+		else:
+			self._flush_rgb(changed, pending)
+		for led in changed:
+			self._shown[led] = pending[led]
+
+	def _flush_mk2(self, leds, pending):
+		colours = []
+		animated = []
+		for led in leds:
+			kind, colour, static = pending[led]
+			if kind == LED_STATIC or self._static_changed(led, static):
+				colours.extend((led[1], static))
+			if kind != LED_STATIC:
+				animated.append((led, kind, colour))
+		if colours:
+			self._send_sysex(self._header + tuple(colours) + (SYSEX_END,))
+		# mk2 flashes/pulses from the static colour already shown, no need for it here
+		for led, kind, colour in animated:
+			self._send_midi((led[0] + kind, led[1], colour))
+
+	def _flush_rgb(self, leds, pending):
+		specs = []
+		late = []
+		for led in leds:
+			kind, colour, static = pending[led]
+			if kind == LED_STATIC:
+				specs.append((LED_STATIC, led[1], colour))
+			elif kind == LED_PULSE:
+				if self._static_changed(led, static):
+					# keep the static colour under the pulse, like the note messages would
+					specs.append((LED_STATIC, led[1], static))
+				specs.append((LED_PULSE, led[1], colour))
+			elif static != None:
+				# flashes between colour B (the static one) and colour A
+				specs.append((LED_FLASH, led[1], static, colour))
+			else:
+				# static colour unknown, let the hardware flash from what it shows
+				late.append((led, kind, colour))
+		for start in range(0, len(specs), MAX_LED_SPECS):
+			midi_bytes = self._header
+			for spec in specs[start:start + MAX_LED_SPECS]:
+				midi_bytes = midi_bytes + spec
+			self._send_sysex(midi_bytes + (SYSEX_END,))
+		for led, kind, colour in late:
+			self._send_midi((led[0] + kind, led[1], colour))
+
+	def _send_sysex(self, midi_bytes):
+		self.sysex_sent += 1
+		self._send_midi(midi_bytes)
+
+
+class DoubleBufferedLedFrame(LedFrame):
+	""" Classic models (mk1, S, mini). The frame is drawn in the hidden buffer
+	and shown with one buffer flip, which also copies it to the other buffer
+	so both are the same between frames. A frame changing more than half of
+	the LEDs is sent with rapid update (2 LEDs per message).
+	Small frames, and any frame while flashing LEDs are lit (the hardware flash
+	mode flips the buffers on its own), are drawn straight on the hardware. """
+
+	def __init__(self, send_midi):
+		super(DoubleBufferedLedFrame, self).__init__(send_midi)
+		# self._pending : (status, identifier) -> velocity
+		self._flashing = set()
+		self._displayed = 0
+		self._updating = 0
+		self._flash_mode = False
+		self.flips = 0
+
+	def reset(self):
+		super(DoubleBufferedLedFrame, self).reset()
+		self._flashing = set()
+		self._displayed = 0
+		self._updating = 0
+		self._flash_mode = False
+
+	def forget(self, is_cc, identifier):
+		super(DoubleBufferedLedFrame, self).forget(is_cc, identifier)
+		self._flashing.discard(((MIDI_CC_STATUS if is_cc else MIDI_NOTE_ON_STATUS), identifier))
+
+	def collect(self, midi_bytes):
+		led = self._led_of(midi_bytes)
+		if led == None:
+			# keep the order with the other messages
+			self.flush()
+			if len(midi_bytes) == 3 and tuple(midi_bytes[:2]) == MK1_CONFIG:
+				self._config_sent(midi_bytes[2])
+			return False
+		if self._urgent_depth > 0:
+			self._urgent.add(led)
+		velocity = midi_bytes[2]
+		if velocity & MK1_LED_FLAGS == 0:
+			# no flags (e.g. plain 0 for off) would only reach the updating buffer
+			velocity += MK1_LED_FLAGS
+		if self._depth == 0 and self._room_for(1):
+			self._pending.pop(led, None)
+			if self._velocity(led) == velocity:
+				self._count(1, 0)
+			else:
+				self._count(1, 1)
+				self._set_led(led, velocity)
+				self._draw_straight([led])
+			return True
+		self._pending[led] = velocity
+		self._count(1, 0)
+		return True
+
+	def _config_sent(self, value):
+		if value == 0:
+			# reset : all LEDs off, default buffers
+			self.reset()
+		elif value & MK1_BUFFER_CONTROL and value < 64:
+			self._displayed = value & 1
+			self._updating = (value >> 2) & 1
+			self._flash_mode = bool(value & MK1_FLASH)
+
+	def _velocity(self, led):
+		shown = self._shown.get(led)
+		return shown[1] if shown != None else None
+
+	def _set_led(self, led, velocity):
+		self._shown[led] = (LED_STATIC, velocity, velocity)
+		if velocity & MK1_LED_FLAGS == MK1_LED_FLASHING:
+			self._flashing.add(led)
+		else:
+			self._flashing.discard(led)
+
+	def flush(self):
+		if not self._pending:
+			return
+		pending = self._pending
+		self._pending = {}
+		changed = self._within_budget(sorted([led for led in pending if self._velocity(led) != pending[led]]), pending)
+		if not changed:
+			return
+		self._count(0, len(changed))
+		for led in changed:
+			self._set_led(led, pending[led])
+		if self._flashing or len(changed) <= MK1_SMALL_FRAME:
+			self._draw_straight(changed)
+			return
+		hidden = 1 - self._displayed
+		# draw in the hidden buffer, flash mode off so it stays hidden
+		self._send_midi(MK1_CONFIG + (MK1_BUFFER_CONTROL + hidden * 4 + self._displayed,))
+		if len(changed) * 2 > len(MK1_RAPID_UPDATE_ORDER) and len(self._shown) == len(MK1_RAPID_UPDATE_ORDER):
+			velocities = [self._velocity(led) & MK1_LED_COLOUR for led in MK1_RAPID_UPDATE_ORDER]
+			for i in range(0, len(velocities), 2):
+				self._send_midi((MK1_RAPID_UPDATE_STATUS, velocities[i], velocities[i + 1]))
+		else:
+			for led in changed:
+				# no flags : only the updating buffer is written
+				self._send_midi(led + (self._velocity(led) & MK1_LED_COLOUR,))
+		# show it and copy it to the other buffer, the next frame is drawn there
+		flash = MK1_FLASH if self._flash_mode else 0
+		self._send_midi(MK1_CONFIG + (MK1_BUFFER_CONTROL + MK1_COPY + flash + self._displayed * 4 + hidden,))
+		self._updating = self._displayed
+		self._displayed = hidden
+		self.flips += 1
+
+	def _draw_straight(self, leds):
+		if self._displayed or self._updating:
+			for led in leds:
+				if self._velocity(led) & MK1_LED_FLAGS == MK1_LED_FLASHING:
+					# flashing LEDs are set in the updating buffer only, back to the
+					# buffers the rest of the script expects (both are the same here)
+					flash = MK1_FLASH if self._flash_mode else 0
+					self._send_midi(MK1_CONFIG + (MK1_BUFFER_CONTROL + flash,))
+					self._displayed = 0
+					self._updating = 0
+					break
+		for led in leds:
+			self._send_midi(led + (self._velocity(led),))
@@ -0,0 +1,66 @@
+class LiveIndex(object):
+	""" Positions of the song's tracks, scenes and clip slots. Unlike LiveState
+	it is kept across update passes : the lists are read again only after Live
+	reported a change of the track or scene list. """
+
+	def __init__(self, song):
+		self._song = song
+		self._tracks = None
+		self._track_index = None # track -> position in song.tracks
+		self._scenes = None
+		self._scene_index = None # scene -> position in song.scenes
+		self._slot_index = {} # track -> {clip slot -> position in track.clip_slots}
+		song.add_tracks_listener(self._on_tracks_changed)
+		song.add_scenes_listener(self._on_scenes_changed)
+
+	def disconnect(self):
+		if self._song.tracks_has_listener(self._on_tracks_changed):
+			self._song.remove_tracks_listener(self._on_tracks_changed)
+		if self._song.scenes_has_listener(self._on_scenes_changed):
+			self._song.remove_scenes_listener(self._on_scenes_changed)
+		self._on_tracks_changed()
+		self._on_scenes_changed()
+
+	def _on_tracks_changed(self):
+		self._tracks = None
+		self._track_index = None
+		self._slot_index = {}
+
+	def _on_scenes_changed(self):
+		self._scenes = None
+		self._scene_index = None
+		self._slot_index = {}
+
+	def tracks(self):
+		""" song.tracks, as a tuple """
+		if self._tracks == None:
+			self._tracks = tuple(self._song.tracks)
+			self._track_index = dict((track, index) for index, track in enumerate(self._tracks))
+		return self._tracks
+
+	def scenes(self):
+		""" song.scenes, as a tuple """
+		if self._scenes == None:
+			self._scenes = tuple(self._song.scenes)
+			self._scene_index = dict((scene, index) for index, scene in enumerate(self._scenes))
+		return self._scenes
+
+	def track_index(self, track):
+		""" position of track in song.tracks, None if it is not there (return or master track) """
+		self.tracks()
+		return self._track_index.get(track)
+
+	def scene_index(self, scene):
+		""" position of scene in song.scenes, None if it is not there """
+		self.scenes()
+		return self._scene_index.get(scene)
+
+	def slot_index(self, clip_slot):
+		""" position of clip_slot in the clip_slots of its track (its scene), None if it is not there """
+		if clip_slot == None:
+			return None
+		track = clip_slot.canonical_parent
+		slots = self._slot_index.get(track)
+		if slots == None:
+			slots = self._slot_index[track] = dict((slot, index) for index, slot in enumerate(track.clip_slots))
+		return slots.get(clip_slot)
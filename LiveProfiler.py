@@ -0,0 +1,120 @@
+import sys
+from _Framework.ControlSurface import ControlSurface
+from _Framework.ControlSurfaceComponent import ControlSurfaceComponent
+
+# modules of the Live classes whose accesses are counted (Song.View and Track.View come along)
+PROFILED_MODULES = frozenset(("Live.Song", "Live.Track", "Live.ClipSlot", "Live.Clip", "Live.Device", "Live.RackDevice",
+	"Live.PluginDevice", "Live.SimplerDevice", "Live.MixerDevice", "Live.DeviceParameter", "Live.DrumPad", "Live.Chain"))
+# frames walked up from a call site to find the component it belongs to
+OWNER_SEARCH_DEPTH = 8
+
+
+def unwrap(value):
+	""" the Live object behind a LiveProxy, for the calls that go back to Live """
+	if type(value) is LiveProxy:
+		return object.__getattribute__(value, "_live_object")
+	if type(value) in (list, tuple):
+		return type(value)(unwrap(item) for item in value)
+	return value
+
+
+class LiveProxy(object):
+	""" Stands in for a Live object and counts what the script does with it.
+	isinstance() still sees the Live class, == and hash the Live object. """
+	__slots__ = ("_live_object", "_profile")
+
+	def __init__(self, live_object, profile):
+		object.__setattr__(self, "_live_object", live_object)
+		object.__setattr__(self, "_profile", profile)
+
+	@property
+	def __class__(self):
+		return self._live_object.__class__
+
+	def __getattr__(self, name):
+		live_object = self._live_object
+		value = getattr(live_object, name)
+		if callable(value) and type(value).__module__ not in PROFILED_MODULES:
+			if name.startswith("add_") and name.endswith("_listener"):
+				return self._profile.method(live_object, name, value, "listen")
+			return self._profile.method(live_object, name, value, "call")
+		self._profile.count("read", live_object, name)
+		return self._profile.wrap(value)
+
+	def __setattr__(self, name, value):
+		self._profile.count("write", self._live_object, name)
+		setattr(self._live_object, name, unwrap(value))
+
+	def __eq__(self, other):
+		return self._live_object == unwrap(other)
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+
+	def __hash__(self):
+		return hash(self._live_object)
+
+	def __repr__(self):
+		return "LiveProxy(" + repr(self._live_object) + ")"
+
+
+class LiveProfile(object):
+	""" Counts the reads, writes, calls and listener registrations the script
+	makes on Live objects, per call site and per component (see LiveProxy).
+	Only built when Settings.DEBUG__LIVE_PROFILE is on : the script then hands
+	proxies to its components instead of the Live objects. """
+
+	def __init__(self):
+		self.counts = {} # (component, site, kind, Live class.attribute) -> count
+
+	def wrap(self, value):
+		if type(value).__module__ in PROFILED_MODULES:
+			return LiveProxy(value, self)
+		# vectors of Live objects (song.tracks, track.clip_slots, device.parameters...)
+		if not isinstance(value, (tuple, list)) and type(value).__name__ != "Vector":
+			return value
+		if len(value) > 0 and type(value[0]).__module__ in PROFILED_MODULES:
+			return tuple(LiveProxy(item, self) for item in value)
+		return value
+
+	def method(self, live_object, name, function, kind):
+		def profiled(*a, **k):
+			self.count(kind, live_object, name)
+			return self.wrap(function(*[unwrap(arg) for arg in a], **dict((key, unwrap(arg)) for key, arg in k.items())))
+		return profiled
+
+	def count(self, kind, live_object, name):
+		# the frame of the call site is 2 up : count <- LiveProxy / profiled method <- site
+		frame = sys._getframe(2)
+		code = frame.f_code
+		site = code.co_filename.replace("\\", "/").rpartition("/")[2] + ":" + str(frame.f_lineno) + " " + code.co_name
+		key = (self._owner(frame), site, kind, type(live_object).__name__ + "." + name)
+		self.counts[key] = self.counts.get(key, 0) + 1
+
+	def _owner(self, frame):
+		for _ in range(OWNER_SEARCH_DEPTH):
+			if frame == None:
+				break
+			owner = frame.f_locals.get("self")
+			if isinstance(owner, (ControlSurfaceComponent, ControlSurface)):
+				return type(owner).__name__
+			frame = frame.f_back
+		return "?"
+
+	def reset(self):
+		self.counts = {}
+
+	def report(self, limit=40):
+		""" lines of the report : totals per component, then the busiest call sites """
+		per_component = {}
+		for (component, site, kind, attribute), count in self.counts.items():
+			totals = per_component.setdefault(component, {"read": 0, "write": 0, "call": 0, "listen": 0})
+			totals[kind] += count
+		lines = ["Live accesses per component : reads writes calls listeners"]
+		for component, totals in sorted(per_component.items(), key=lambda item: -sum(item[1].values())):
+			lines.append("  " + component + " : " + " ".join(str(totals[kind]) for kind in ("read", "write", "call", "listen")))
+		lines.append("Busiest call sites :")
+		ranked = sorted(self.counts.items(), key=lambda item: -item[1])
+		for (component, site, kind, attribute), count in ranked[:limit]:
+			lines.append("  " + str(count) + " " + kind + " " + attribute + " at " + site + " (" + component + ")")
+		return lines
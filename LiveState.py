@@ -0,0 +1,91 @@
+class LiveState(object):
+	""" Read-through snapshot of the song state the components draw from.
+	Each value is read from Live the first time it is asked for, then kept for
+	the rest of the update pass (see Launchpad.live_state). Launchpad drops the
+	snapshot when the pass ends, and as soon as Live notifies a change of one of
+	these values, e.g. after the script itself selected another track. """
+
+	def __init__(self, song, live_index):
+		self._song = song
+		self._index = live_index
+		self._values = {}
+		self.reads = 0 # values read from Live
+		self.hits = 0 # values served by the snapshot
+
+	def _get(self, name):
+		try:
+			value = self._values[name]
+		except KeyError:
+			value = self._values[name] = getattr(self, '_read_' + name)()
+			self.reads += 1
+			return value
+		self.hits += 1
+		return value
+
+	@property
+	def song(self):
+		return self._song
+
+	@property
+	def view(self):
+		return self._get('view')
+
+	@property
+	def is_playing(self):
+		return self._get('is_playing')
+
+	@property
+	def session_record(self):
+		return self._get('session_record')
+
+	@property
+	def tracks(self):
+		""" song.tracks, as a tuple """
+		return self._get('tracks')
+
+	@property
+	def return_tracks(self):
+		return self._get('return_tracks')
+
+	@property
+	def scenes(self):
+		return self._get('scenes')
+
+	@property
+	def selected_track(self):
+		return self._get('selected_track')
+
+	@property
+	def selected_scene(self):
+		return self._get('selected_scene')
+
+	@property
+	def detail_clip(self):
+		return self._get('detail_clip')
+
+	def _read_view(self):
+		return self._song.view
+
+	def _read_is_playing(self):
+		return self._song.is_playing
+
+	def _read_session_record(self):
+		return self._song.session_record
+
+	def _read_tracks(self):
+		return self._index.tracks()
+
+	def _read_return_tracks(self):
+		return tuple(self._song.return_tracks)
+
+	def _read_scenes(self):
+		return self._index.scenes()
+
+	def _read_selected_track(self):
+		return self.view.selected_track
+
+	def _read_selected_scene(self):
+		return self.view.selected_scene
+
+	def _read_detail_clip(self):
+		return self.view.detail_clip
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import time
 from _Framework.ModeSelectorComponent import ModeSelectorComponent
 from _Framework.ButtonElement import ButtonElement
 from _Framework.ButtonMatrixElement import ButtonMatrixElement
@@ -16,6 +17,10 @@ try:
 except ImportError:
     exec("from .Settings import *")
 
+# parts of the surface the modes set up : the user modes, the session (clip launch or navigation only),
+# the mixer, the device controller, both step sequencers and the instrument controller
+MODE_PARTS = ("user", "session", "mixer", "device", "stepseq", "stepseq2", "instrument")
+
 class MainSelectorComponent(ModeSelectorComponent):
 
 	""" Class that reassigns the button on the launchpad to different functions """
@@ -52,6 +57,18 @@ class MainSelectorComponent(ModeSelectorComponent):
 		for index in range(4):
 			self._sub_mode_list[index] = 0
 		self.set_mode_buttons(self._mode_buttons)
+
+		#mode switches : a mode tears down the parts the outgoing mode set up, the other ones are down already
+		self._set_up_parts = set(MODE_PARTS) # all of them until the first mode is set up
+		self._teardowns = {
+			"user": self._release_user_mode,
+			"mixer": lambda: self._setup_mixer(False),
+			"device": lambda: self._setup_device_controller(False),
+			"stepseq": lambda: self._setup_step_sequencer(False),
+			"stepseq2": lambda: self._setup_step_sequencer2(False),
+			"instrument": lambda: self._setup_instrument_controller(False)}
+		self._active_mode = None
+		self._transition_times = {} # (mode left, mode entered) -> [switches, total seconds, worst seconds]
 			
 		###SESSION COMPONENT			
 		if Settings.SESSION__STOP_BUTTONS:#session with bottom stop buttons
@@ -219,8 +236,24 @@ class MainSelectorComponent(ModeSelectorComponent):
 		return new_channel
 	
 	def update(self):
+		# a mode switch repaints the whole surface, send it as one LED frame
+		with self._control_surface.led_frame():
+			self._control_surface.set_led_mode(self.mode_name())
+			self._update()
+
+	def mode_name(self):
+		if self._main_mode_index == 0:
+			return "session"
+		elif self._main_mode_index == 1:
+			return Settings.USER_MODES_1[self._sub_mode_list[self._main_mode_index]]
+		elif self._main_mode_index == 2:
+			return Settings.USER_MODES_2[self._sub_mode_list[self._main_mode_index]]
+		return "mixer"
+
+	def _update(self):
 		assert (self._modes_buttons != None)
 		if self.is_enabled():
+			started = time.time()
 
 			self._update_mode_buttons()
 
@@ -234,11 +267,7 @@ class MainSelectorComponent(ModeSelectorComponent):
 			if self._main_mode_index == 0:
 				# session
 				self._control_surface.show_message("SESSION MODE" )
-				self._setup_mixer(not as_active)
-				self._setup_device_controller(not as_active)
-				self._setup_step_sequencer(not as_active)
-				self._setup_step_sequencer2(not as_active)
-				self._setup_instrument_controller(not as_active)
+				self._tear_down("user", "mixer", "device", "stepseq", "stepseq2", "instrument")
 				self._setup_session(as_active, as_enabled)
 				self._update_control_channels()
 				self._mode_index = 0
@@ -251,10 +280,7 @@ class MainSelectorComponent(ModeSelectorComponent):
 			elif self._main_mode_index == 3:
 				# mixer
 				self._control_surface.show_message("MIXER MODE")
-				self._setup_device_controller(not as_active)
-				self._setup_step_sequencer(not as_active)
-				self._setup_step_sequencer2(not as_active)
-				self._setup_instrument_controller(not as_active)
+				self._tear_down("user", "device", "stepseq", "stepseq2", "instrument")
 				self._setup_session(not as_active, as_enabled)
 				self._setup_mixer(as_active)
 				self._update_control_channels()
@@ -264,38 +290,51 @@ class MainSelectorComponent(ModeSelectorComponent):
 
 			self._session.set_allow_update(True)
 			self._zooming.set_allow_update(True)
-		
+			self._transition_done(self.mode_name(), time.time() - started)
+
+	def _tear_down(self, *parts):
+		for part in parts:
+			if part in self._set_up_parts:
+				self._teardowns[part]()
+
+	def _transition_done(self, mode, seconds):
+		pair = (self._active_mode, mode)
+		times = self._transition_times.setdefault(pair, [0, 0.0, 0.0])
+		times[0] += 1
+		times[1] += seconds
+		times[2] = max(times[2], seconds)
+		self._active_mode = mode
+		if Settings.DEBUG__MODE_TRANSITIONS:
+			self._control_surface.log_message("mode switch " + str(pair[0]) + " -> " + mode + " : %.2f ms" % (seconds * 1000.0))
+
+	def transition_report(self):
+		""" lines of the report : mode switches per mode left and mode entered, slowest first """
+		lines = ["Mode switches : count, mean ms, worst ms"]
+		for (left, entered), (count, total, worst) in sorted(self._transition_times.items(), key=lambda item: -item[1][2]):
+			lines.append("  %s -> %s : %d, %.2f, %.2f" % (left, entered, count, total / count * 1000.0, worst * 1000.0))
+		return lines
+
 	def _setup_sub_mode(self, mode):
 		as_active = True
 		as_enabled = True
 		if mode == "instrument":
 			self._control_surface.show_message("INSTRUMENT MODE")
 			self._setup_session(not as_active, not as_enabled)
-			self._setup_step_sequencer(not as_active)
-			self._setup_step_sequencer2(not as_active)
-			self._setup_mixer(not as_active)
-			self._setup_device_controller(not as_active)
+			self._tear_down("user", "stepseq", "stepseq2", "mixer", "device")
 			self._update_control_channels()
 			self._setup_instrument_controller(as_active)
 			self._mode_index = 4
 		elif mode == "melodic stepseq":
 			self._control_surface.show_message("MELODIC SEQUENCER MODE")
 			self._setup_session(not as_active, not as_enabled)
-			self._setup_instrument_controller(not as_active)
-			self._setup_device_controller(not as_active)
-			self._setup_mixer(not as_active)
-			self._setup_step_sequencer(not as_active)
+			self._tear_down("user", "instrument", "device", "mixer", "stepseq")
 			self._setup_step_sequencer2(as_active)
 			self._update_control_channels()
 			self._mode_index = 7
 		elif mode == "user 1":
 			self._control_surface.show_message("USER 1 MODE" )
 			self._setup_session(not as_active, not as_enabled)
-			self._setup_step_sequencer(not as_active)
-			self._setup_step_sequencer2(not as_active)
-			self._setup_mixer(not as_active)
-			self._setup_device_controller(not as_active)
-			self._setup_instrument_controller(not as_active)
+			self._tear_down("user", "stepseq", "stepseq2", "mixer", "device", "instrument")
 			self._setup_user_mode(True, True, False, True)
 			self._update_control_channels()
 			self._mode_index = 1
@@ -305,31 +344,21 @@ class MainSelectorComponent(ModeSelectorComponent):
 		elif mode == "drum stepseq":
 			self._control_surface.show_message("DRUM STEP SEQUENCER MODE")
 			self._setup_session(not as_active, not as_enabled)
-			self._setup_instrument_controller(not as_active)
-			self._setup_device_controller(not as_active)
-			self._setup_mixer(not as_active)
-			self._setup_step_sequencer2(not as_active)
+			self._tear_down("user", "instrument", "device", "mixer", "stepseq2")
 			self._setup_step_sequencer(as_active)
 			self._update_control_channels()
 			self._mode_index = 6
 		elif mode == "device":
 			self._control_surface.show_message("DEVICE CONTROLLER MODE")
 			self._setup_session(not as_active, not as_enabled)
-			self._setup_step_sequencer(not as_active)
-			self._setup_step_sequencer2(not as_active)
-			self._setup_mixer(not as_active)
-			self._setup_instrument_controller(not as_active)
+			self._tear_down("user", "stepseq", "stepseq2", "mixer", "instrument")
 			self._setup_device_controller(as_active)
 			self._update_control_channels()
 			self._mode_index = 5
 		elif mode == "user 2":
 			self._control_surface.show_message("USER 2 MODE" )
 			self._setup_session(not as_active, not as_enabled)
-			self._setup_instrument_controller(not as_active)
-			self._setup_device_controller(not as_active)
-			self._setup_mixer(not as_active)
-			self._setup_step_sequencer(not as_active)
-			self._setup_step_sequencer2(not as_active)
+			self._tear_down("user", "instrument", "device", "mixer", "stepseq", "stepseq2")
 			self._setup_user_mode(False, False, False, False)
 			self._update_control_channels()
 			self._mode_index = 2
@@ -347,6 +376,8 @@ class MainSelectorComponent(ModeSelectorComponent):
 
 		# matrix
 		self._activate_matrix(True)
+		if not (as_active or as_navigation_enabled or "session" in self._set_up_parts):
+			return # torn down already, only the buttons other modes used needed a reset
 		for scene_index in range(self._session._num_scenes):#iterate over scenes
 			scene = self._session.scene(scene_index)
 			if as_active:#set scene launch buttons
@@ -401,6 +432,7 @@ class MainSelectorComponent(ModeSelectorComponent):
 		else:
 			self._session.set_track_bank_buttons(None, None)
 			self._session.set_scene_bank_buttons(None, None)
+		self._set_up("session", as_active or as_navigation_enabled)
 
 	def _setup_instrument_controller(self, as_active):
 		if self._instrument_controller != None:
@@ -418,6 +450,7 @@ class MainSelectorComponent(ModeSelectorComponent):
 						button.use_default_message()# Reset to original channel
 						button.force_next_send()#Flush
 			self._instrument_controller.set_enabled(as_active)#Enable/disable instrument controller
+		self._set_up("instrument", as_active)
 
 	def _setup_device_controller(self, as_active):
 		if self._device_controller != None:
@@ -432,6 +465,7 @@ class MainSelectorComponent(ModeSelectorComponent):
 			else:
 				self._device_controller._is_active = False
 				self._device_controller.set_enabled(False)
+		self._set_up("device", as_active)
 
 	def _setup_user_mode(self, release_matrix=True, release_side_buttons=True, release_nav_buttons=True, drum_rack_mode=True):
 		# user1 -> All True but release_nav_buttons / user2 -> All false 
@@ -456,6 +490,13 @@ class MainSelectorComponent(ModeSelectorComponent):
 		if drum_rack_mode:#User1 enabled
 			self._config_button.send_value(2)#Set LP drum rack layout grid mapping mode
 		self._config_button.send_value(32)#Send enable flashing led config message to LP
+		self._set_up("user", True)
+
+	def _release_user_mode(self):
+		# Live drove the LEDs of the buttons it was forwarded, draw them all again
+		for button in self._all_buttons:
+			button.force_next_send()
+		self._set_up("user", False)
 				
 	def _setup_step_sequencer(self, as_active):
 		if(self._stepseq != None):
@@ -468,6 +509,7 @@ class MainSelectorComponent(ModeSelectorComponent):
 				self._stepseq.set_enabled(True)
 			else:
 				self._stepseq.set_enabled(False)
+		self._set_up("stepseq", as_active)
 
 	def _setup_step_sequencer2(self, as_active):
 		if(self._stepseq2 != None):
@@ -480,6 +522,7 @@ class MainSelectorComponent(ModeSelectorComponent):
 				self._stepseq2.set_enabled(True)
 			else:
 				self._stepseq2.set_enabled(False)
+		self._set_up("stepseq2", as_active)
 
 	def _setup_mixer(self, as_active):
 		assert isinstance(as_active, type(False))
@@ -493,6 +536,13 @@ class MainSelectorComponent(ModeSelectorComponent):
 				self._sub_modes.release_controls()
 
 		self._sub_modes.set_enabled(as_active)
+		self._set_up("mixer", as_active)
+
+	def _set_up(self, part, as_active):
+		if as_active:
+			self._set_up_parts.add(part)
+		else:
+			self._set_up_parts.discard(part)
 
 	def _init_session(self):
 		#self._session.set_stop_clip_value("Session.StopClip")
@@ -541,5 +591,7 @@ class MainSelectorComponent(ModeSelectorComponent):
 	def _update_control_channels(self):
 		new_channel = self.channel_for_current_mode()
 		for button in self._all_buttons:
-			button.set_channel(new_channel)
-			button.force_next_send()
+			# a button kept on its channel and by the script still shows what it sent last
+			if button.message_channel() != new_channel or not button.is_enabled():
+				button.set_channel(new_channel)
+				button.force_next_send()
@@ -13,20 +13,28 @@ class NoteEditorComponent(ControlSurfaceComponent):
 		self._note_cache = None
 		self._playhead = None
 
+		# colours are resolved once in the skin palette
+		skin = control_surface._skin
+
 		# playback step indicator
 		self.display_metronome = True
-		self.metronome_color = "StepSequencer.NoteEditor.Metronome"
+		self.metronome_color = skin.color("StepSequencer.NoteEditor.Metronome")
 		
 		# playback page indicator
 		self._current_page = -1
 
 		# Velocity color map. this must remain of length 3. WHY???
 		self.velocity_map = [20, 50, 80, 105, 127]
-		self.velocity_color_map = [	"StepSequencer.NoteEditor.Velocity0", "StepSequencer.NoteEditor.Velocity1", "StepSequencer.NoteEditor.Velocity2", "StepSequencer.NoteEditor.Velocity3", "StepSequencer.NoteEditor.Velocity4"]
+		self.velocity_color_map = [skin.color("StepSequencer.NoteEditor.Velocity" + str(index)) for index in range(len(self.velocity_map))]
 		
 		# other colors
-		self.muted_note_color = "StepSequencer.NoteEditor.Muted"
-		self.playing_note_color = "StepSequencer.NoteEditor.Playing"
+		self.muted_note_color = skin.color("StepSequencer.NoteEditor.Muted")
+		self.playing_note_color = skin.color("StepSequencer.NoteEditor.Playing")
+		self.page_marker_color = skin.color("StepSequencer.NoteEditor.PageMarker")
+		self.current_page_marker_color = skin.color("StepSequencer.NoteEditor.CurrentPageMarker")
+		self.current_page_marker_play_color = skin.color("StepSequencer.NoteEditor.CurrentPageMarkerPlay")
+		self.note_marker_color = skin.color("StepSequencer.NoteEditor.NoteMarker")
+		self.disabled_color = skin.color("DefaultButton.Disabled")
 
 		#hold button for 500 ms
 		self.long_button_press = 0.500
@@ -44,6 +52,7 @@ class NoteEditorComponent(ControlSurfaceComponent):
 
 		# notes
 		self._key_indexes = [36, 37, 38, 39, 40, 41, 42, 43]
+		self._key_index_map = self._make_key_index_map(self._key_indexes)
 		self._key_index_is_in_scale = [True, False, True, True, False, True, False, True]
 		self._key_index_is_root_note = [True, False, False, False, False, False, False, False]
 		self._number_of_lines_per_note = 1
@@ -51,6 +60,17 @@ class NoteEditorComponent(ControlSurfaceComponent):
 		# clip
 		self._force_update = True
 
+		# grid layers
+		self._layers_valid = False
+		self._note_layer = {}
+		self._marker_cells = set()
+		self._playing_cells = set()
+		self._metronome_cell = None
+		self._current_page_marker = -1
+		self._page_marker_under = False
+		self._page_marker_over = False
+		self._playhead_cells = set() # cells drawn by the playhead layer on last update
+
 		# quantization
 		self._quantization = 16
 
@@ -81,6 +101,7 @@ class NoteEditorComponent(ControlSurfaceComponent):
 	def set_multinote(self, is_mutlinote, number_of_lines_per_note):
 		self._is_mutlinote = is_mutlinote
 		self._number_of_lines_per_note = number_of_lines_per_note
+		self._invalidate_layers()
 
 	@property
 	def quantization(self):
@@ -88,6 +109,7 @@ class NoteEditorComponent(ControlSurfaceComponent):
 
 	def set_quantization(self, quantization):
 		self._quantization = quantization
+		self._invalidate_layers()
 
 	def set_scale(self, scale):
 		self._scale = scale
@@ -101,12 +123,23 @@ class NoteEditorComponent(ControlSurfaceComponent):
 
 	def set_key_indexes(self, key_indexes):
 		self._key_indexes = key_indexes
+		self._key_index_map = self._make_key_index_map(key_indexes)
+		self._invalidate_layers()
+
+	def _make_key_index_map(self, key_indexes):
+		# pitch -> first row using it, same as key_indexes.index()
+		key_index_map = {}
+		for i in range(len(key_indexes)):
+			key_index_map.setdefault(key_indexes[i], i)
+		return key_index_map
 
 	def set_key_index_is_in_scale(self, key_index_is_in_scale):
 		self._key_index_is_in_scale = key_index_is_in_scale
+		self._invalidate_layers()
 
 	def set_key_index_is_root_note(self, key_index_is_root_note):
 		self._key_index_is_root_note = key_index_is_root_note
+		self._invalidate_layers()
 
 	@property
 	def height(self):
@@ -114,6 +147,7 @@ class NoteEditorComponent(ControlSurfaceComponent):
 
 	def set_height(self, height):
 		self._height = height
+		self._invalidate_layers()
 
 	@property
 	def width(self):
@@ -131,16 +165,22 @@ class NoteEditorComponent(ControlSurfaceComponent):
 			self._page = page
 		else:
 			self._page = int(page / 4)  # 4 lines per note (32 steps seq)
+		self._invalidate_layers()
 
 	def set_clip(self, clip):
 		self._clip = clip
+		self._invalidate_layers()
 
 	def set_note_cache(self, note_cache):
 		self._note_cache = note_cache
+		self._invalidate_layers()
 
 	def set_playhead(self, playhead): # Playing cursor
 		self._playhead = playhead
-		self._update_matrix()
+		if self._layers_valid and not self._force_update:
+			self._update_playhead()
+		else:
+			self._update_matrix()
 
 	def update_notes(self): # Deprecated ???
 		if self._clip != None:
@@ -158,22 +198,19 @@ class NoteEditorComponent(ControlSurfaceComponent):
 			self._update_velocity_button()
 			self._update_matrix()
 
-	# Display the third amber column to show the current page in multinote mode OK
-	def _display_selected_page(self): # OK
-		for i in range(0, self._height):
-			self._grid_back_buffer[self._page % self.width][i] = "StepSequencer.NoteEditor.PageMarker"
-		
-	# Displays 3 buttons for the root of the scale and 1 for the in scale notes 	
-	def _display_note_markers(self):# (out of scale notes buttons are dark) OK
+	# Cells of the 3 buttons for the root of the scale and 1 for the in scale notes (out of scale notes buttons are dark) OK
+	def _note_marker_cells(self):
+		cells = set()
 		for i in range(0, int(self.height / self.number_of_lines_per_note)):
 			if self._key_index_is_root_note[i]:
 				for j in range(0, self.number_of_lines_per_note):
-					self._grid_back_buffer[0][self.height - i * self.number_of_lines_per_note - j - 1] = "StepSequencer.NoteEditor.NoteMarker"
-					self._grid_back_buffer[1][self.height - i * self.number_of_lines_per_note - j - 1] = "StepSequencer.NoteEditor.NoteMarker"
-					self._grid_back_buffer[2][self.height - i * self.number_of_lines_per_note - j - 1] = "StepSequencer.NoteEditor.NoteMarker"
+					cells.add((0, self.height - i * self.number_of_lines_per_note - j - 1))
+					cells.add((1, self.height - i * self.number_of_lines_per_note - j - 1))
+					cells.add((2, self.height - i * self.number_of_lines_per_note - j - 1))
 			elif self._key_index_is_in_scale[i]:
 				for j in range(0, self.number_of_lines_per_note):
-					self._grid_back_buffer[0][self.height - i * self.number_of_lines_per_note - j - 1] = "StepSequencer.NoteEditor.NoteMarker"
+					cells.add((0, self.height - i * self.number_of_lines_per_note - j - 1))
+		return cells
 
 
 
@@ -191,129 +228,192 @@ class NoteEditorComponent(ControlSurfaceComponent):
 				#self._height = self._matrix.height()
 				self._grid_buffer = [[0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0]]
 				self._grid_back_buffer = [[0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0]]
+			self._layers_valid = False
 
-
+	# The grid is drawn from two layers :
+	# - the note layer (page notes, note markers) only changes with the notes, page, scale or mode
+	# - the playhead layer (metronome, playing notes, page markers) is the only one redrawn on playhead moves
+	def _invalidate_layers(self):
+		self._layers_valid = False
 
 	# Updates the LP LEDs OK
 	def _update_matrix(self):  
 		if self.is_enabled() and self._matrix!=None:
-			
-			# clear back buffer
+			self._update_note_layer()
+			self._update_playhead_layer()
+			cells = []
 			for x in range(self.width):
 				for y in range(self.height):
-					self._grid_back_buffer[x][y] = "DefaultButton.Disabled"
-
-			# update back buffer
-			if self._clip != None and self._note_cache != None:
-
-				# play back position
-				if self._playhead != None:
-					play_position = self._playhead  # position in beats (integer = number of beats, decimal subdivisions)
-					play_page = int(play_position / self.quantization / self.width / self.number_of_lines_per_note)
-					play_row = int(play_position / self.quantization / self.width) % self.number_of_lines_per_note
-					play_x_position = int(play_position / self.quantization) % self.width
-					play_y_position = int(play_position / self.quantization / self.width) % self.height
-				else:
-					play_position = -1
-					play_page = -1
-					play_row = -1
-					play_x_position = -1
-					play_y_position = -1
-				# add play positition in amber
-				if(self.display_metronome):
-					if self._clip.is_playing and self.song().is_playing:
-						self._grid_back_buffer[play_x_position][play_y_position] = "StepSequencer.NoteEditor.Metronome"
-
-				# Display the selected page
-				if(self._display_page):
-					self._display_selected_page()
-					if self._display_page_time + 0.25 < time.time():
-						self._display_page = False
-						
-
-
-				# Display the notes in the 1st left column 
-				if self.is_multinote:
-					self._display_note_markers()
-					# Display the current played page
-					if(self._current_page !=play_page):
-						self._current_page=play_page
-						self._display_current_page()
-
-				# display clip notes
-				for note in self._note_cache:
-					note_position = note[1] # decimal value of a beat (1=beat, same as playhead)
-					note_key = note[0]  # key: 0-127 MIDI note #
-					note_velocity = note[3] # velocity: 0-127 value #
-					note_muted = note[4]#Boolean
-					note_page = int(note_position / self.quantization / self.width / self.number_of_lines_per_note)
-					note_grid_x_position = int(note_position / self.quantization) % self.width
-					note_grid_y_position = int(note_position / self.quantization / self.width) % self.height
-
-					#Calculate note position in the grid (note position to matrix button logic)
-					if self.is_multinote:
-						# compute base note, taking into account number_of_lines_per_note
-						try:
-							note_idx = self.key_indexes.index(note_key)
-						except ValueError:
-							note_idx = -1
-						note_grid_y_base = note_idx * self.number_of_lines_per_note
-						if(note_grid_y_base >= 0):
-							note_grid_y_base = (7 - note_grid_y_base) - (self.number_of_lines_per_note - 1)
-						if(note_grid_y_base < 0):
-							note_grid_y_base = -1
-
-						note_grid_y_offset = int(note_position / self.quantization / self.width) % self.number_of_lines_per_note
-					else:
-						idx = 1
-						try:
-							idx = self.key_indexes.index(note_key)
-						except ValueError:
-							idx = -1
-						
-						if idx == 0:
-							note_grid_y_base = 0
-						else:
-							note_grid_y_base = -1
-					note_grid_y_offset = int(note_position / self.quantization / self.width) % self.number_of_lines_per_note
+					cells.append((x, y))
+			self._draw_cells(cells)
 
-					if note_grid_y_base != -1 and note_grid_y_base < self.height:
-						note_grid_y_position = note_grid_y_base + note_grid_y_offset
+	# Redraws only the cells of the old and new playhead layer
+	def _update_playhead(self):
+		if self.is_enabled() and self._matrix!=None:
+			self._draw_cells(self._update_playhead_layer())
+
+	def _update_note_layer(self):
+		self._note_layer = {}
+		self._marker_cells = set()
+		if self._clip != None and self._note_cache != None:
+			# Display the notes in the 1st left column 
+			if self.is_multinote:
+				self._marker_cells = self._note_marker_cells()
+
+			# display clip notes of the page (only the ones on the displayed page can light a pad)
+			for note in self._visible_notes():
+				note_velocity = note[3] # velocity: 0-127 value #
+				note_muted = note[4]#Boolean
+				position = self._note_grid_position(note)
+				if position != None and position[2] == self._page: # if note is in current page, then update grid
+					if note_muted:
+						self._note_layer[(position[0], position[1])] = self.muted_note_color
 					else:
-						note_grid_x_position = -1
-						note_grid_y_position = -1
-				
-					#Set note color
-					if (note_grid_x_position >= 0):
 						# compute colors
 						velocity_color = self.velocity_color_map[0]
 						for index in range(len(self.velocity_map)):
 							if note_velocity >= self.velocity_map[index]:
 								velocity_color = self.velocity_color_map[index]
-						# highligh playing notes in red. even if they are from other pages.
-						if not note_muted and note_page == play_page and play_x_position == note_grid_x_position and (play_y_position == note_grid_y_position and not self.is_multinote or self.is_multinote and note_grid_y_offset == play_row) and self.song().is_playing and self._clip.is_playing:
-							self._grid_back_buffer[note_grid_x_position][note_grid_y_position] = self.playing_note_color
-						elif note_page == self._page:  # if note is in current page, then update grid
-							# do not erase current note highlight
-							if self._grid_back_buffer[note_grid_x_position][note_grid_y_position] != self.playing_note_color:
-								if note_muted:
-									self._grid_back_buffer[note_grid_x_position][note_grid_y_position] = self.muted_note_color
-								else:
-									self._grid_back_buffer[note_grid_x_position][note_grid_y_position] = velocity_color
-
-				#Display the column to show the page for half a second
-				if self._display_page:
-					if time.time() - self._display_page_time > 0.5:
-						self._display_page = False
-					self._display_selected_page()
-
-			# caching : compare back buffer to buffer and update grid. this should minimize midi traffic quite a bit.
-			for x in range(self.width):
-				for y in range(self.height):
-					if self._grid_back_buffer[x][y] != self._grid_buffer[x][y] or self._force_update:
-						self._grid_buffer[x][y] = self._grid_back_buffer[x][y]
-						self._matrix.get_button(x, y).set_light(self._grid_buffer[x][y])
-			self._force_update = False
+						self._note_layer[(position[0], position[1])] = velocity_color
+		self._layers_valid = True
+
+	# returns the cells that have to be redrawn
+	def _update_playhead_layer(self):
+		self._metronome_cell = None
+		self._playing_cells = set()
+		self._current_page_marker = -1
+		self._page_marker_under = False
+		self._page_marker_over = False
+		cells = set()
+		if self._clip != None and self._note_cache != None:
+
+			# play back position
+			is_playing = self._playhead != None and self._clip.is_playing and self._control_surface.live_state().is_playing
+			if self._playhead != None:
+				play_position = self._playhead  # position in beats (integer = number of beats, decimal subdivisions)
+				play_page = int(play_position / self.quantization / self.width / self.number_of_lines_per_note)
+				play_x_position = int(play_position / self.quantization) % self.width
+				play_y_position = int(play_position / self.quantization / self.width) % self.height
+			else:
+				play_page = -1
+			# add play positition in amber
+			if self.display_metronome and is_playing:
+				self._metronome_cell = (play_x_position, play_y_position)
+				cells.add(self._metronome_cell)
+
+			# Display the selected page
+			if self._display_page:
+				self._page_marker_under = True
+				if self._display_page_time + 0.25 < time.time():
+					self._display_page = False
+
+			# Display the current played page
+			if self.is_multinote and self._current_page != play_page:
+				self._current_page = play_page
+				self._current_page_marker = self._current_page % self.width
+
+			# highligh playing notes in red. even if they are from other pages.
+			if is_playing:
+				play_step = int(play_position / self.quantization)
+				note_index = self._stepsequencer._note_index
+				for key in self._key_index_map:
+					for note in note_index.notes_at_step(key, self.quantization, play_step):
+						note_muted = note[4]
+						position = self._note_grid_position(note)
+						if not note_muted and position != None:
+							self._playing_cells.add((position[0], position[1]))
+				cells.update(self._playing_cells)
+
+			#Display the column to show the page for half a second
+			if self._display_page:
+				if time.time() - self._display_page_time > 0.5:
+					self._display_page = False
+				self._page_marker_over = True
+
+			for y in range(self.height):
+				if self._current_page_marker != -1:
+					cells.add((self._current_page_marker, y))
+				if self._page_marker_under or self._page_marker_over:
+					cells.add((self._page % self.width, y))
+
+		dirty_cells = cells | self._playhead_cells
+		self._playhead_cells = cells
+		return dirty_cells
+
+	def _cell_color(self, x, y):
+		if self._clip == None or self._note_cache == None:
+			return self.disabled_color
+		if self._page_marker_over and x == self._page % self.width:
+			return self.page_marker_color
+		if (x, y) in self._playing_cells:
+			return self.playing_note_color
+		if (x, y) in self._note_layer:
+			return self._note_layer[(x, y)]
+		if x == self._current_page_marker:
+			# third red column to show the current page in multinote mode each time that the metronome goes to new page
+			if self._page == self._current_page:
+				return self.current_page_marker_play_color
+			return self.current_page_marker_color
+		if (x, y) in self._marker_cells:
+			return self.note_marker_color
+		if self._page_marker_under and x == self._page % self.width:
+			return self.page_marker_color
+		if (x, y) == self._metronome_cell:
+			return self.metronome_color
+		return self.disabled_color
+
+	def _draw_cells(self, cells):
+		# caching : compare back buffer to buffer and update grid. this should minimize midi traffic quite a bit.
+		for x, y in cells:
+			if x < self.width and y < self.height:
+				self._grid_back_buffer[x][y] = self._cell_color(x, y)
+				if self._grid_back_buffer[x][y] != self._grid_buffer[x][y] or self._force_update:
+					self._grid_buffer[x][y] = self._grid_back_buffer[x][y]
+					self._matrix.get_button(x, y).set_light(self._grid_buffer[x][y])
+		self._force_update = False
+
+	# (x, y, page) of a note in the grid (note position to matrix button logic), None if its key is not displayed
+	def _note_grid_position(self, note):
+		note_position = note[1] # decimal value of a beat (1=beat, same as playhead)
+		note_key = note[0]  # key: 0-127 MIDI note #
+		note_page = int(note_position / self.quantization / self.width / self.number_of_lines_per_note)
+		note_grid_x_position = int(note_position / self.quantization) % self.width
+		if self.is_multinote:
+			# compute base note, taking into account number_of_lines_per_note
+			note_idx = self._key_index_map.get(note_key, -1)
+			note_grid_y_base = note_idx * self.number_of_lines_per_note
+			if(note_grid_y_base >= 0):
+				note_grid_y_base = (7 - note_grid_y_base) - (self.number_of_lines_per_note - 1)
+			if(note_grid_y_base < 0):
+				note_grid_y_base = -1
+		else:
+			idx = self._key_index_map.get(note_key, -1)
+			if idx == 0:
+				note_grid_y_base = 0
+			else:
+				note_grid_y_base = -1
+		note_grid_y_offset = int(note_position / self.quantization / self.width) % self.number_of_lines_per_note
+		if note_grid_y_base != -1 and note_grid_y_base < self.height:
+			return note_grid_x_position, note_grid_y_base + note_grid_y_offset, note_page
+		return None
+
+	# Notes of the displayed page for every visible key
+	def _visible_notes(self):
+		note_index = self._stepsequencer._note_index
+		page_steps = self.width * self.number_of_lines_per_note
+		first_step = self._page * page_steps
+		end_step = first_step + page_steps
+		if first_step == 0:
+			first_step = 1 - page_steps # int() rounds negative positions towards page 0
+		notes = []
+		for key in self._key_index_map:
+			notes.extend(note_index.notes_in_steps(key, self.quantization, first_step, end_step))
+		return notes
+
+	def page_time_range(self):
+		""" (start, end) in beats of the displayed page """
+		page_length = self.width * self.number_of_lines_per_note * self.quantization
+		return self._page * page_length, (self._page + 1) * page_length
 
 	def request_display_page(self): # Reset page column display timer
 		self._display_page = True
@@ -360,37 +460,25 @@ class NoteEditorComponent(ControlSurfaceComponent):
 				velocity = self._velocity #setted by velocity button
 				duration = self.quantization #setted by quantization button in StepSequencerComponent
 
-				# TODO: use new better way for editing clip
-
-				self._clip.select_all_notes()
-				note_cache = self._clip.get_selected_notes()
-				if self._note_cache != note_cache:
-					self._note_cache = note_cache
-
-				note_cache = list(self._note_cache)
-				for note in note_cache:
-					if pitch == note[0] and time == note[1]:
+				# only the toggled note is sent to Live
+				self._stepsequencer.refresh_notes(time, time + self.quantization)
+				for note in self._stepsequencer._note_index.notes_at_step(pitch, self.quantization, int(time / self.quantization)):
+					if time == note[1]:
 						if self._is_velocity_shifted:
 							# update velocity of the note
 							new_velocity_index = 0
 							for index in range(len(self.velocity_map)):
 								if note[3] >= self.velocity_map[index]:
 									new_velocity_index = (index + 1) % len(self.velocity_map)
-							note_cache.append([note[0], note[1], note[2], self.velocity_map[new_velocity_index], note[4]])  # (pitch, time, duration, velocity, mute state)
+							self._stepsequencer.edit_notes(modified=[(note, (note[0], note[1], note[2], self.velocity_map[new_velocity_index], note[4]))])  # (pitch, time, duration, velocity, mute state)
 						elif not self._is_mute_shifted:
-							note_cache.remove(note)
+							self._stepsequencer.edit_notes(removed=[note])
 						else:
 							# mute / un mute note.
-							note_cache.append([note[0], note[1], note[2], note[3], not note[4]])  # (pitch, time, duration, velocity, mute state)
+							self._stepsequencer.edit_notes(modified=[(note, (note[0], note[1], note[2], note[3], not note[4]))])  # (pitch, time, duration, velocity, mute state)
 						break
 				else:
-					note_cache.append([pitch, time, duration, velocity, self._is_mute_shifted]) # (pitch, time, duration, velocity, mute state)
-				self._clip.select_all_notes()
-				self._clip.replace_selected_notes(tuple(note_cache))
-
-				note_cache = self._clip.get_selected_notes()
-				if self._note_cache != note_cache:
-					self._note_cache = note_cache
+					self._stepsequencer.edit_notes(added=[(pitch, time, duration, velocity, self._is_mute_shifted)]) # (pitch, time, duration, velocity, mute state)
 
 #*********************VELOCITY/BTN_SHIFT*********************
 
@@ -402,9 +490,9 @@ class NoteEditorComponent(ControlSurfaceComponent):
 					self._velocity_button.set_on_off_values("StepSequencer.NoteEditor.VelocityShifted")
 					self._velocity_button.turn_on()
 				else:
-					self._velocity_button.set_light("StepSequencer.NoteEditor.Velocity"+str(self._velocity_index))
+					self._velocity_button.set_light(self.velocity_color_map[self._velocity_index])
 			else:
-				self._velocity_button.set_light("DefaultButton.Disabled")
+				self._velocity_button.set_light(self.disabled_color)
 
 	# Refresh button and its listener OK
 	def set_velocity_button(self, button): 
@@ -449,28 +537,10 @@ class NoteEditorComponent(ControlSurfaceComponent):
 	# Mute all entries for a given MIDI note OK
 	def mute_lane(self, pitch_to_mute):
 		if self.is_enabled() and self._clip != None:
-			self._clip.select_all_notes()
-			note_cache = self._clip.get_selected_notes()
-			if self._note_cache != note_cache:
-				self._note_cache = note_cache
-			note_cache = list(self._note_cache)
-			notes_changed = 0
-			for note in self._note_cache:
-				if note[0] == pitch_to_mute:
-					notes_changed = notes_changed + 1
-					note_to_mute = note
-					note_cache.remove(note)
-					note_cache.append([note_to_mute[0], note_to_mute[1], note_to_mute[2], note_to_mute[3], not note_to_mute[4]])
-			if notes_changed > 0:
-				self._clip.select_all_notes()
-				self._clip.replace_selected_notes(tuple(note_cache))
-				note_cache = self._clip.get_selected_notes()
+			self._stepsequencer.refresh_notes()
+			modified = []
+			for note in self._stepsequencer._note_index.notes_of_pitch(pitch_to_mute):
+				modified.append((note, (note[0], note[1], note[2], note[3], not note[4])))
+			if len(modified) > 0:
+				self._stepsequencer.edit_notes(modified=modified)
 			self.update()
-
-	# Display the third red column to show the current page in multinote mode each time that the metronome goes to new pageOK
-	def _display_current_page(self): # OK
-		for i in range(0, self._height):
-			if(self._page==self._current_page):
-				self._grid_back_buffer[self._current_page % self.width][i] = "StepSequencer.NoteEditor.CurrentPageMarkerPlay"
-			else:
-				self._grid_back_buffer[self._current_page % self.width][i] = "StepSequencer.NoteEditor.CurrentPageMarker"
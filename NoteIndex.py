@@ -0,0 +1,167 @@
+from bisect import bisect_left, bisect_right, insort
+
+# Note tuples coming from Live : (pitch, time, duration, velocity, mute)
+NOTE_PITCH = 0
+NOTE_TIME = 1
+NOTE_DURATION = 2
+
+
+def _note_time(note):
+	return note[NOTE_TIME]
+
+
+class NoteIndex(object):
+	""" Notes of a clip, built once per notes change and patched by the step sequencer own edits.
+	Notes are bucketed by (pitch, step) and kept sorted by start time so the
+	step sequencer only has to look at the notes it can actually display. """
+
+	def __init__(self, notes=()):
+		self._by_time = sorted([tuple(note) for note in notes], key=_note_time)
+		self._times = [note[NOTE_TIME] for note in self._by_time]
+		self._by_pitch = {} # pitch -> notes sorted by start time
+		self._pitch_times = {} # pitch -> start times of the notes above
+		self._longest = {} # pitch -> longest note duration, bounds the "is playing" search
+		for note in self._by_time:
+			pitch = note[NOTE_PITCH]
+			if pitch in self._by_pitch:
+				self._by_pitch[pitch].append(note)
+				self._pitch_times[pitch].append(note[NOTE_TIME])
+				if note[NOTE_DURATION] > self._longest[pitch]:
+					self._longest[pitch] = note[NOTE_DURATION]
+			else:
+				self._by_pitch[pitch] = [note]
+				self._pitch_times[pitch] = [note[NOTE_TIME]]
+				self._longest[pitch] = note[NOTE_DURATION]
+		self._step_tables = {} # quantization -> (buckets, steps), built on first use
+
+	def __len__(self):
+		return len(self._by_time)
+
+	@property
+	def notes(self):
+		return tuple(self._by_time)
+
+	def add(self, note):
+		note = tuple(note)
+		pitch = note[NOTE_PITCH]
+		time = note[NOTE_TIME]
+		i = bisect_right(self._times, time)
+		self._by_time.insert(i, note)
+		self._times.insert(i, time)
+		if pitch in self._by_pitch:
+			i = bisect_right(self._pitch_times[pitch], time)
+			self._by_pitch[pitch].insert(i, note)
+			self._pitch_times[pitch].insert(i, time)
+			if note[NOTE_DURATION] > self._longest[pitch]:
+				self._longest[pitch] = note[NOTE_DURATION]
+		else:
+			self._by_pitch[pitch] = [note]
+			self._pitch_times[pitch] = [time]
+			self._longest[pitch] = note[NOTE_DURATION]
+		for quantization, (buckets, steps) in self._step_tables.items():
+			key = (pitch, int(time / quantization))
+			if key in buckets:
+				bucket = buckets[key]
+				i = len(bucket)
+				while i > 0 and bucket[i - 1][NOTE_TIME] > time:
+					i = i - 1
+				bucket.insert(i, note)
+			else:
+				buckets[key] = [note]
+				insort(steps.setdefault(pitch, []), key[1])
+
+	def remove(self, note):
+		""" Removes one note equal to note, returns False if there is none """
+		note = tuple(note)
+		pitch = note[NOTE_PITCH]
+		time = note[NOTE_TIME]
+		i = self._find(self._by_time, self._times, note)
+		if i == -1:
+			return False
+		del self._by_time[i]
+		del self._times[i]
+		i = self._find(self._by_pitch[pitch], self._pitch_times[pitch], note)
+		del self._by_pitch[pitch][i]
+		del self._pitch_times[pitch][i]
+		if not self._by_pitch[pitch]:
+			del self._by_pitch[pitch]
+			del self._pitch_times[pitch]
+			del self._longest[pitch]
+		# _longest is only an upper bound, no need to shrink it
+		for quantization, (buckets, steps) in self._step_tables.items():
+			key = (pitch, int(time / quantization))
+			bucket = buckets[key]
+			bucket.remove(note)
+			if not bucket:
+				del buckets[key]
+				steps[pitch].remove(key[1])
+				if not steps[pitch]:
+					del steps[pitch]
+		return True
+
+	def _find(self, notes, times, note):
+		for i in range(bisect_left(times, note[NOTE_TIME]), bisect_right(times, note[NOTE_TIME])):
+			if notes[i] == note:
+				return i
+		return -1
+
+	def _step_table(self, quantization):
+		table = self._step_tables.get(quantization)
+		if table == None:
+			buckets = {} # (pitch, step) -> notes sorted by start time
+			steps = {} # pitch -> sorted list of the non empty steps
+			for note in self._by_time:
+				# same rounding as the note editor grid position
+				step = int(note[NOTE_TIME] / quantization)
+				key = (note[NOTE_PITCH], step)
+				if key in buckets:
+					buckets[key].append(note)
+				else:
+					buckets[key] = [note]
+					steps.setdefault(note[NOTE_PITCH], []).append(step)
+			for pitch_steps in steps.values():
+				pitch_steps.sort()
+			table = (buckets, steps)
+			self._step_tables[quantization] = table
+		return table
+
+	def notes_of_pitch(self, pitch):
+		return self._by_pitch.get(pitch, ())
+
+	def notes_at_step(self, pitch, quantization, step):
+		return self._step_table(quantization)[0].get((pitch, step), ())
+
+	def notes_in_steps(self, pitch, quantization, first_step, end_step):
+		""" Notes of a pitch in the steps [first_step, end_step[ """
+		buckets, steps = self._step_table(quantization)
+		pitch_steps = steps.get(pitch)
+		notes = []
+		if pitch_steps:
+			for i in range(bisect_left(pitch_steps, first_step), bisect_left(pitch_steps, end_step)):
+				notes.extend(buckets[(pitch, pitch_steps[i])])
+		return notes
+
+	def notes_playing(self, pitch, position):
+		""" Notes of a pitch that are sounding at position """
+		times = self._pitch_times.get(pitch)
+		notes = []
+		if times:
+			pitch_notes = self._by_pitch[pitch]
+			for i in range(bisect_left(times, position - self._longest[pitch]), bisect_right(times, position)):
+				note = pitch_notes[i]
+				if note[NOTE_TIME] + note[NOTE_DURATION] >= position:
+					notes.append(note)
+		return notes
+
+	def notes_in_range(self, start, end=None):
+		""" Notes starting in [start, end[, or after start if end is None """
+		first = bisect_left(self._times, start)
+		if end == None:
+			return self._by_time[first:]
+		return self._by_time[first:bisect_left(self._times, end)]
+
+	def has_notes_in_range(self, start, end=None):
+		first = bisect_left(self._times, start)
+		if end == None:
+			return first < len(self._times)
+		return first < bisect_left(self._times, end)
@@ -1,3 +1,4 @@
+from collections import namedtuple, OrderedDict
 from _Framework.ControlSurfaceComponent import ControlSurfaceComponent
 
 #fix for python3
@@ -46,6 +47,10 @@ MUSICAL_MODES = [
 TOP_OCTAVE = {"chromatic_gtr": 7, "diatonic_ns": 2, "diatonic_chords": 7, "diatonic": 6,  
 			"chromatic": 7}
 
+# pad layouts already computed, see ScaleComponent.get_layout
+LAYOUT_CACHE_SIZE = 64
+_layouts = OrderedDict()
+
 
 class ScaleComponent(ControlSurfaceComponent):
 	
@@ -471,6 +476,20 @@ class ScaleComponent(ControlSurfaceComponent):
 		return self._quick_scale
 	
 	
+	def get_layout(self, width, height):
+		""" What each pad plays for the current settings : layout[x][y] is a
+		MelodicPattern.PadNote, y going up from the bottom row.
+		Layouts are computed once and kept for the last LAYOUT_CACHE_SIZE settings. """
+		key = (self._modus, self._key, self._octave, self._mode, self._is_drumrack, self._is_horizontal, self._is_absolute, self._interval, width, height)
+		layout = _layouts.pop(key, None)
+		if layout == None:
+			layout = self.get_pattern().layout(width, height)
+			if len(_layouts) >= LAYOUT_CACHE_SIZE:
+				_layouts.popitem(last=False)
+		# most recently used last
+		_layouts[key] = layout
+		return layout
+
 	def get_pattern(self):
 		notes = self.notes
 		# origin
@@ -555,6 +574,9 @@ class MelodicPattern(object):
 		self.chromatic_gtr_mode = chromatic_gtr_mode
 		self.diatonic_ns_mode = diatonic_ns_mode
 
+	# one pad of a layout, immutable so layouts can be shared
+	PadNote = namedtuple('PadNote', 'index root highlight in_scale valid')
+
 	class NoteInfo:
 
 		def __init__(self, index, channel, root = False, highlight = False, in_scale = False, valid = False):
@@ -604,4 +626,18 @@ class MelodicPattern(object):
 			valid = valid
 		)
 
-
+	def layout(self, width, height):
+		""" note(x, y) for all the pads, as tuples of PadNote : layout[x][y] """
+		scale = set(self.scale)
+		valid_notes = set(self.valid_notes)
+		root = self.scale[0]
+		highlight = (self.scale[2], self.scale[4])
+		columns = []
+		for x in xrange(width):
+			column = []
+			for y in xrange(height):
+				octave, note = self._octave_and_note(x, y)
+				index = (self.base_note + 12 * octave + note) % 128
+				column.append(self.PadNote(index, note == root, note in highlight, note in scale, index in valid_notes))
+			columns.append(tuple(column))
+		return tuple(columns)
@@ -12,6 +12,18 @@ class Settings():
 	#STEPSEQ__LINK_WITH_SESSION = True
 	STEPSEQ__LINK_WITH_SESSION = False
 
+	# LED output of the classic launchpads (mk1, S, mini).
+	# "double buffer" : each update is drawn in the hidden LED buffer then shown at once
+	# "direct" : every LED is sent as soon as it changes
+	#LED_OUTPUT__MK1 = "direct"
+	LED_OUTPUT__MK1 = "double buffer"
+
+	# Most LED MIDI bytes sent per display tick (~100ms). LED updates over it wait
+	# for the next ticks, the LEDs of the pressed buttons always go first.
+	# None : no limit
+	#LED_OUTPUT__BYTES_PER_TICK = None
+	LED_OUTPUT__BYTES_PER_TICK = 384
+
 	# configure what user modes buttons do.
 	# the 3 first value configure the 3 sub modes of button user mode 1, 
 	# and following ones are for user mode 2 button
@@ -35,7 +47,31 @@ class Settings():
 	STEPSEQ__SAVE_SCALE = None
 	INSTRUMENT__SAVE_SCALE = None
 
+	# Step sequencer edits made within this many display ticks (~100ms) are written
+	# to the clip together, in one write (one undo step in Live). The pads show them
+	# right away. 0 : every edit is written as it is made
+	#STEPSEQ__COMMIT_WINDOW = 0
+	STEPSEQ__COMMIT_WINDOW = 1
+
 	# Map buttons to levels in volume slider. Exactly 7 values must be provided.
 	# The lowest button is always set to -inf. Lowest supported value is -69 dB.
 	# So far the values are not exact: -24 dB below equals -23.7 dB in Ableton.
 	VOLUME_LEVELS = (6, 0, -6, -12, -18, -24, -42)
+
+	# Debug : log how many Live values each update pass read (and how many the
+	# snapshot of the pass served without asking Live again)
+	#DEBUG__LIVE_READS = True
+	DEBUG__LIVE_READS = False
+
+	# Debug : count the reads, writes, calls and listener registrations the script
+	# makes on Live objects, per component and call site. The ranked report is
+	# written on disconnect to DEBUG__LIVE_PROFILE_FILE (None : the Live log).
+	# Slows the script down, leave it off outside of debugging.
+	#DEBUG__LIVE_PROFILE = True
+	DEBUG__LIVE_PROFILE = False
+	DEBUG__LIVE_PROFILE_FILE = None
+
+	# Debug : log how long each mode switch took, and on disconnect the number,
+	# mean and worst time of the switches per mode left and mode entered
+	#DEBUG__MODE_TRANSITIONS = True
+	DEBUG__MODE_TRANSITIONS = False
@@ -1,4 +1,4 @@
-from _Framework.Skin import Skin
+from .SkinPalette import SkinPalette
 from .ColorsMK1 import Rgb
 
 
@@ -359,5 +359,5 @@ class Colors:
 			Tripplet = Rgb.RED_THIRD		
 			
 def make_skin():
-	return Skin(Colors)
+	return SkinPalette(Colors)
 
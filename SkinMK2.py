@@ -1,4 +1,4 @@
-from _Framework.Skin import Skin
+from .SkinPalette import SkinPalette
 from .ColorsMK2 import Rgb
 
 class Colors:
@@ -199,6 +199,8 @@ class Colors:
 			Metronome = Rgb.BLUE
 			NoteMarker = Rgb.AMBER
 			PageMarker = Rgb.YELLOW
+			CurrentPageMarker = Rgb.RED_THIRD
+			CurrentPageMarkerPlay = Rgb.GREEN_THIRD
 				
 	class StepSequencer2:
 		class Pitch:
@@ -351,4 +353,4 @@ class Colors:
 			Tripplet = Rgb.RED_THIRD			
 
 def make_skin():
-	return Skin(Colors)
\ No newline at end of file
+	return SkinPalette(Colors)
\ No newline at end of file
@@ -0,0 +1,86 @@
+from collections import namedtuple
+from inspect import isclass
+from _Framework.Skin import SkinColorMissingError
+
+# one colour of the skin, compiled : sends are the (value, channel) the button sends to draw it
+PaletteColor = namedtuple('PaletteColor', 'id name sends')
+
+
+class _DrawRecorder(object):
+	# stands in for the button while a colour draws itself
+
+	def __init__(self):
+		self.sends = []
+
+	def send_value(self, value, channel=None, **k):
+		self.sends.append((int(value), channel))
+
+
+class SkinPalette(object):
+	""" A skin compiled once the model is known. Every dotted colour name
+	("StepSequencer.NoteEditor.Velocity3") gets an integer id and the MIDI
+	values that draw it, so drawing is one dict lookup (none for components
+	holding PaletteColors) instead of a Skin lookup, a Color.draw call and
+	SkinColorMissingError handling for names that are not colours.
+
+	Can be used wherever a _Framework Skin is : [] gives the Color objects. """
+
+	def __init__(self, colors=None):
+		self._colors = {} # dotted name -> Color
+		self._compiled = {} # dotted name -> PaletteColor
+		self._pairs = {} # name -> (name.On, name.Off), see on_off
+		self.colors = [] # id -> PaletteColor
+		if colors != None:
+			self._fill_colors(colors)
+		for name in sorted(self._colors):
+			recorder = _DrawRecorder()
+			self._colors[name].draw(recorder)
+			color = PaletteColor(len(self.colors), name, tuple(recorder.sends))
+			self.colors.append(color)
+			self._compiled[name] = color
+
+	def _fill_colors(self, colors, pathname=''):
+		for name, value in vars(colors).items():
+			if name.startswith('_'):
+				continue
+			if isclass(value):
+				self._fill_colors(value, pathname + name + '.')
+			else:
+				self._colors[pathname + name] = value
+
+	def __getitem__(self, key):
+		color = self.get(key)
+		if color == None:
+			raise SkinColorMissingError('Skin color missing: %s' % str(key))
+		return self._colors[color.name]
+
+	def __contains__(self, key):
+		return self.get(key) != None
+
+	def __iter__(self):
+		return iter(self._colors.items())
+
+	def get(self, value):
+		""" PaletteColor of a colour name, None if value is not one """
+		if type(value) is PaletteColor:
+			return value
+		if isinstance(value, str):
+			return self._compiled.get(value)
+		return None
+
+	def color(self, name):
+		""" PaletteColor of a colour name. Components resolve their colours with
+		it when they are built, so a misspelled name fails there and not on each draw """
+		color = self._compiled.get(name)
+		if color == None:
+			raise SkinColorMissingError('Skin color missing: %s' % str(name))
+		return color
+
+	def on_off(self, name):
+		""" (name.On, name.Off), compiled when the skin has them """
+		pair = self._pairs.get(name)
+		if pair == None:
+			on_name = str(name) + ".On"
+			off_name = str(name) + ".Off"
+			pair = self._pairs[name] = (self._compiled.get(on_name, on_name), self._compiled.get(off_name, off_name))
+		return pair
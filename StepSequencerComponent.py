@@ -9,9 +9,13 @@ except ImportError:
     # Python 3...
     imap=map
 from .NoteEditorComponent import NoteEditorComponent
+from .ClipNotes import ClipNotes, notes_fingerprint
+from .ClipStateCache import ClipStateCache
 from .TrackControllerComponent import TrackControllerComponent
 import time
+import math
 from .ScaleComponent import ScaleComponent, MUSICAL_MODES, KEY_NAMES
+from collections import namedtuple
 try:
     exec("from .Settings import Settings")
 except ImportError:
@@ -27,6 +31,13 @@ STEPSEQ_MODE_SCALE_EDIT = 10
 
 LONG_BUTTON_PRESS = 1.0
 
+# after a notes change in Live, pages around the displayed one read with it
+NOTES_PREFETCH_PAGES = 1
+# clips whose parsed notes are kept once left, coming back to them reads nothing from Live
+CLIP_STATE_CACHE_SIZE = 12
+# parsed state of a clip : notes as read from Live, their NoteIndex, and what the note editor made of them
+ClipState = namedtuple('ClipState', 'note_cache index editor')
+
 #Allows to note selection and navigation through note groups and pages
 class NoteSelectorComponent(ControlSurfaceComponent):
 
@@ -60,6 +71,7 @@ class NoteSelectorComponent(ControlSurfaceComponent):
                         -1, -1, -1, -1, 
                         -1, -1, -1, -1]
         self._was_velocity_shifted = False
+        self._playing_offsets = set() # offset buttons drawn as playing
         for button in self._offset_buttons:
             assert isinstance(button, ButtonElement)
             button.remove_value_listener(self.note_offset_button_value)
@@ -73,7 +85,10 @@ class NoteSelectorComponent(ControlSurfaceComponent):
 
     def set_playhead(self, playhead):
         self._playhead = playhead
-        self._update_matrix()
+        if self._force:
+            self._update_matrix()
+        else:
+            self._update_playing_offsets()
 
     @property
     def _is_mute_shifted(self):
@@ -87,6 +102,10 @@ class NoteSelectorComponent(ControlSurfaceComponent):
     def _drum_group_device(self):
         return self._step_sequencer._drum_group_device
 
+    @property
+    def _note_index(self):
+        return self._step_sequencer._note_index
+
     @property
     def is_drumrack(self):
         return self._step_sequencer._scale_selector.is_drumrack and self._drum_group_device != None
@@ -205,7 +224,7 @@ class NoteSelectorComponent(ControlSurfaceComponent):
                 except ValueError:
                     self._offset = -1
                 if self.is_drumrack and self._drum_group_device!=None:
-                    self._drum_group_device.view.selected_drum_pad = self._drum_group_device.drum_pads[self.selected_note]
+                    self._drum_group_device.view.selected_drum_pad = self._step_sequencer.drum_rack.pad(self.selected_note)
 
                 self._step_sequencer._scale_updated()
 
@@ -226,53 +245,67 @@ class NoteSelectorComponent(ControlSurfaceComponent):
 
     def _update_matrix(self):
         if self._enable_offset_button and self.is_enabled():
+            self._playing_offsets = set()
             for i in range(len(self._offset_buttons)):
-                if self._clip == None:
-                    self._offset_buttons[i].set_light("DefaultButton.Disabled")
-                    self._offset_buttons[i].set_enabled(True)
+                self._update_offset_button(i)
+            self._force = False
+
+    # A playhead move only redraws the offset buttons of the notes starting or stopping to play
+    def _update_playing_offsets(self):
+        if self._enable_offset_button and self.is_enabled() and self._clip != None and not (self._is_velocity_shifted and not self._step_sequencer._is_locked):
+            for i in range(len(self._offset_buttons)):
+                playing = self._playhead != None and self.note_is_playing(self._clip, self._note_index, self._root_note + i, self._playhead)
+                if playing != (i in self._playing_offsets):
+                    self._update_offset_button(i)
+
+    def _update_offset_button(self, i):
+        if self._clip == None:
+            self._offset_buttons[i].set_light("DefaultButton.Disabled")
+            self._offset_buttons[i].set_enabled(True)
+        else:
+            note = self._root_note + i
+            if self.is_drumrack:
+                if self._step_sequencer.drum_rack.is_filled(note):
+                    self._offset_buttons[i].set_on_off_values("DrumGroup.PadSelected","DrumGroup.PadFilled")
                 else:
-                    note = self._root_note + i
-                    if self.is_drumrack:
-                        if self._drum_group_device.drum_pads[note].chains:
-                            self._offset_buttons[i].set_on_off_values("DrumGroup.PadSelected","DrumGroup.PadFilled")
-                        else:
-                            self._offset_buttons[i].set_on_off_values("DrumGroup.PadSelected", "DrumGroup.PadEmpty")
-                    else:
-                        if self._scale != None:
-                            if i % 12 == self._scale[0]:
-                                self._offset_buttons[i].set_on_off_values("StepSequencer.NoteSelector.Selected", "Note.Pads.Root")
-                            elif i % 12 == self._scale[2] or i % 12 == self._scale[4]:
-                                self._offset_buttons[i].set_on_off_values("StepSequencer.NoteSelector.Selected", "Note.Pads.Highlight")
-                            elif self._scale != None and i % 12 in self._scale:
-                                self._offset_buttons[i].set_on_off_values("StepSequencer.NoteSelector.Selected", "Note.Pads.InScale")
-                            else:
-                                self._offset_buttons[i].set_on_off_values("StepSequencer.NoteSelector.Selected", "Note.Pads.OutOfScale")
-                        else:
-                            self._offset_buttons[i].set_on_off_values("StepSequencer.NoteSelector.Selected", "Note.Pads.OutOfScale")
-
-                    if self._is_velocity_shifted and not self._step_sequencer._is_locked:
-                        #self._offset_buttons[i].force_next_send()
-                        #self._offset_buttons[i].turn_off()
-                        self._offset_buttons[i].set_enabled(False)
-                        self._offset_buttons[i].set_channel(11)
-                        self._offset_buttons[i].set_identifier(note)
+                    self._offset_buttons[i].set_on_off_values("DrumGroup.PadSelected", "DrumGroup.PadEmpty")
+            else:
+                if self._scale != None:
+                    if i % 12 == self._scale[0]:
+                        self._offset_buttons[i].set_on_off_values("StepSequencer.NoteSelector.Selected", "Note.Pads.Root")
+                    elif i % 12 == self._scale[2] or i % 12 == self._scale[4]:
+                        self._offset_buttons[i].set_on_off_values("StepSequencer.NoteSelector.Selected", "Note.Pads.Highlight")
+                    elif self._scale != None and i % 12 in self._scale:
+                        self._offset_buttons[i].set_on_off_values("StepSequencer.NoteSelector.Selected", "Note.Pads.InScale")
                     else:
-                        #self._offset_buttons[i].force_next_send()
-                        self._offset_buttons[i].set_enabled(True)
-                        self._offset_buttons[i].use_default_message()
-
-                        if self._playhead != None and self.note_is_playing(self._clip, self._note_cache, note, self._playhead):
-                            self._offset_buttons[i].set_on_off_values("StepSequencer.NoteSelector.Playing","StepSequencer.NoteSelector.Playing")
+                        self._offset_buttons[i].set_on_off_values("StepSequencer.NoteSelector.Selected", "Note.Pads.OutOfScale")
+                else:
+                    self._offset_buttons[i].set_on_off_values("StepSequencer.NoteSelector.Selected", "Note.Pads.OutOfScale")
 
-                    if self.selected_note == note:
-                        if self._cache[i] != self._offset_buttons[i]._on_value or self._force:
-                            self._offset_buttons[i].turn_on()
-                            self._cache[i] = self._offset_buttons[i]._on_value
-                    else:
-                        if self._cache[i] != self._offset_buttons[i]._off_value or self._force:
-                            self._offset_buttons[i].turn_off()
-                            self._cache[i] = self._offset_buttons[i]._off_value
-            self._force = False
+            if self._is_velocity_shifted and not self._step_sequencer._is_locked:
+                #self._offset_buttons[i].force_next_send()
+                #self._offset_buttons[i].turn_off()
+                self._offset_buttons[i].set_enabled(False)
+                self._offset_buttons[i].set_channel(11)
+                self._offset_buttons[i].set_identifier(note)
+            else:
+                #self._offset_buttons[i].force_next_send()
+                self._offset_buttons[i].set_enabled(True)
+                self._offset_buttons[i].use_default_message()
+
+                self._playing_offsets.discard(i)
+                if self._playhead != None and self.note_is_playing(self._clip, self._note_index, note, self._playhead):
+                    self._playing_offsets.add(i)
+                    self._offset_buttons[i].set_on_off_values("StepSequencer.NoteSelector.Playing","StepSequencer.NoteSelector.Playing")
+
+            if self.selected_note == note:
+                if self._cache[i] != self._offset_buttons[i]._on_value or self._force:
+                    self._offset_buttons[i].turn_on()
+                    self._cache[i] = self._offset_buttons[i]._on_value
+            else:
+                if self._cache[i] != self._offset_buttons[i]._off_value or self._force:
+                    self._offset_buttons[i].turn_off()
+                    self._cache[i] = self._offset_buttons[i]._off_value
 
     def set_enabled(self, enabled):
         if enabled:
@@ -288,15 +321,11 @@ class NoteSelectorComponent(ControlSurfaceComponent):
             self._scale[i] = self._scale[i] - self._key
 
     #Is the cursor in the current button range and contain a note
-    def note_is_playing(self, clip, note_cache, midi_note, playhead):
-        if clip != None and clip.is_playing and note_cache != None:
-            for note in note_cache:
-                note_key = note[0]
-                note_position = note[1]
-                note_length = note[2]
-                # note_velocity = note[3]
+    def note_is_playing(self, clip, note_index, midi_note, playhead):
+        if clip != None and clip.is_playing and note_index != None:
+            for note in note_index.notes_playing(midi_note, playhead):
                 note_muted = note[4]
-                if midi_note == note_key and note_position <= playhead and note_position + note_length >= playhead and not note_muted:
+                if not note_muted:
                     return True
         return False
 
@@ -387,7 +416,7 @@ class NoteSelectorComponent(ControlSurfaceComponent):
 
     def note_is_available(self, key): # deprecated???
         if self.is_drumrack:
-            if self._drum_group_device.drum_pads[key].chains:
+            if self._step_sequencer.drum_rack.is_filled(key):
                 return True
             else:
                 return False
@@ -440,6 +469,7 @@ class LoopSelectorComponent(ControlSurfaceComponent):
         self._loop_point2 = -1
 
         self._cache = [-1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1] # Length=16
+        self._playing_block = None # block drawn as playing
 
         self._buttons = buttons
         for button in self._buttons: # iterate 16 buttons of 4x4 lower right matrix section
@@ -467,9 +497,22 @@ class LoopSelectorComponent(ControlSurfaceComponent):
     def set_note_cache(self, note_cache):
         self._note_cache = note_cache
 
+    @property
+    def _note_index(self):
+        return self._step_sequencer._note_index
+
     def set_playhead(self, playhead):
         self._playhead = playhead
-        self.update()
+        # the buttons only change when the playhead enters another block
+        if self._force or self._block_of(playhead) != self._playing_block:
+            self.update()
+
+    def _block_of(self, position):
+        if position == None:
+            return None
+        if position < 0:
+            return -1
+        return int(position / (self._blocksize * self._quantization))
 
     @property
     def _is_mute_shifted(self):
@@ -589,6 +632,7 @@ class LoopSelectorComponent(ControlSurfaceComponent):
     def update(self):
         if self.is_enabled():
             self._get_clip_loop() # gets the loop start/end values from the clip -> self._loop_start & self._loop_end
+            self._playing_block = self._block_of(self._playhead)
             i = 0
             for button in self._buttons: # iterate 16 buttons of 4x4 lower right matrix section
                 if self._clip == None: #Disable/turn off all buttons
@@ -634,6 +678,7 @@ class LoopSelectorComponent(ControlSurfaceComponent):
 
     #Make a copy of the current loop to the next N empty blocks OK
     def _extend_clip_content(self, loop_start, old_loop_end, new_loop_end):
+        self._step_sequencer.refresh_notes()
         if(self._no_notes_in_range(old_loop_end, new_loop_end, True)):
             clip_looping_length = 0
             if(old_loop_end > 1):
@@ -650,40 +695,29 @@ class LoopSelectorComponent(ControlSurfaceComponent):
 
     #Does the note by note copy OK
     def _copy_notes_in_range(self, start, end, new_start):
-        new_notes = list(self._note_cache)
-        # for i in range()
-        for note in new_notes:
-            if note[1] >= start and note[1] < end:
-                new_notes.append([note[0], note[1] + new_start - start, note[2], note[3], note[4]])
-        self._clip.select_all_notes()
-        self._clip.replace_selected_notes(tuple(new_notes))
+        new_notes = []
+        for note in self._note_index.notes_in_range(start, end):
+            new_notes.append((note[0], note[1] + new_start - start, note[2], note[3], note[4]))
+        self._step_sequencer.edit_notes(added=new_notes)
     
     #Checks if a range is empty OK
     def _no_notes_in_range(self, start, end, or_after):
-        for note in list(self._note_cache):
-            if note[1] >= start and (note[1] < end or or_after):
-                return(False)
-        return(True)
+        if or_after:
+            return not self._note_index.has_notes_in_range(start)
+        return not self._note_index.has_notes_in_range(start, end)
 
     #Deletes a block of notes OK
     def _delete_notes_in_range(self, start, end):
-        new_notes = list()
-        for note in list(self._note_cache):
-            if note[1] < start or note[1] >= end:
-                new_notes.append(note)
-        self._clip.select_all_notes()
-        self._clip.replace_selected_notes(tuple(new_notes))
+        self._step_sequencer.refresh_notes(start, end)
+        self._step_sequencer.edit_notes(removed=self._note_index.notes_in_range(start, end))
 
     #Mutes a block of notes OK
     def _mute_notes_in_range(self, start, end):
-        new_notes = list()
-        for note in list(self._note_cache): #Note -> tuple containing pitch, time, duration, velocity, and mute
-            if note[1] < start or note[1] >= end: #Note time
-                new_notes.append(note)
-            else:
-                new_notes.append([note[0], note[1], note[2], note[3], not note[4]]) # Negate mute state
-        self._clip.select_all_notes()
-        self._clip.replace_selected_notes(tuple(new_notes))
+        self._step_sequencer.refresh_notes(start, end)
+        modified = []
+        for note in self._note_index.notes_in_range(start, end): #Note -> tuple containing pitch, time, duration, velocity, and mute
+            modified.append((note, (note[0], note[1], note[2], note[3], not note[4]))) # Negate mute state
+        self._step_sequencer.edit_notes(modified=modified)
 
 
 class StepSequencerComponent(CompoundComponent):
@@ -700,7 +734,18 @@ class StepSequencerComponent(CompoundComponent):
         self._clip = None
         self._clip_slot = None
         self._note_cache = []
+        self._clip_notes = ClipNotes() # mirror of the clip notes, shared by the note editor, note selector and loop selector
+        self._clip_states = ClipStateCache(CLIP_STATE_CACHE_SIZE) # parsed states of the clips we left
+        self._flush_scheduled = False # staged edits wait for the end of the commit window
+        self._notes_changed_while_staged = False
+        self._notes_fingerprint = None # of the notes last read from the clip, None : read them in full
+        self._notes_refetch_scheduled = False
+        self.notes_changes_received = 0 # notes listener calls
+        self.notes_changes_coalesced = 0 # calls answered by a read already scheduled for the tick
         self._playhead = 0
+        self._forwarded_playhead_step = None # (quantization, step, page) last sent to the subcomponents
+        self.playhead_ticks_received = 0
+        self.playhead_ticks_forwarded = 0
         self._new_clip_pages = 4
         # mode
         self._mode = -1
@@ -734,7 +779,10 @@ class StepSequencerComponent(CompoundComponent):
         # self.on_clip_slot_changed()
 
     def disconnect(self):
+        self.flush_notes()
         self._clip = None
+        self._observe_slot_indexes(None)
+        self._clip_states.clear()
 
         self._lock_button = None
         self._shift_button = None
@@ -764,6 +812,7 @@ class StepSequencerComponent(CompoundComponent):
         self._lock_button = None
         self.set_lock_button(self._side_buttons[1])#Pan
         self._selected_track = None
+        self._slot_index_track = None # track whose fired/playing slot index is followed (locked to track)
             
     def _set_mute_shift_function(self): #Allow to mute notes in the grid or all notes if selecting on Note Selector #FIX bad behavior
         self._mute_shift_button = None
@@ -894,11 +943,10 @@ class StepSequencerComponent(CompoundComponent):
     def _is_velocity_shifted(self):
         return self._note_editor._is_velocity_shifted
 
-    def index_of(self, pad_list, pad):
-        for i in range(0, len(pad_list)):
-            if (pad_list[i] == pad):
-                return i
-        return(-1)
+    @property
+    def drum_rack(self):
+        """ DrumRackModel of the drum rack we sequence, None if there is none """
+        return self._control_surface.drum_rack(self._drum_group_device)
 
 # enabled
     def set_enabled(self, enabled):
@@ -907,6 +955,7 @@ class StepSequencerComponent(CompoundComponent):
                 self.set_mode(self._mode_backup)
             # clear note editor cache
             self._note_editor._force_update = True
+            self._forwarded_playhead_step = None
 
             # todo: find a better way to init?
             if self._mode == -1:
@@ -916,7 +965,7 @@ class StepSequencerComponent(CompoundComponent):
             # sync to selected pad
             self._update_drum_group_device()
             if(self._drum_group_device): #Select the note 
-                self._note_selector.set_selected_note(self.index_of(self._drum_group_device.drum_pads,self._drum_group_device.view.selected_drum_pad)) #FIX set view again
+                self._note_selector.set_selected_note(self.drum_rack.index_of(self._drum_group_device.view.selected_drum_pad)) #FIX set view again
 
             #load scale settings from clip
             if Settings.STEPSEQ__SAVE_SCALE != None and Settings.STEPSEQ__SAVE_SCALE == "clip":  #????
@@ -936,6 +985,7 @@ class StepSequencerComponent(CompoundComponent):
             self._update_OSD()
 
         else:
+            self.flush_notes()
             self._track_controller.set_enabled(enabled)
             self._loop_selector.set_enabled(enabled)
             self._note_selector.set_enabled(enabled)
@@ -944,6 +994,7 @@ class StepSequencerComponent(CompoundComponent):
 
     def set_mode(self, mode, number_of_lines_per_note=1):
         if self._mode != mode or number_of_lines_per_note != self._number_of_lines_per_note:
+            self.flush_notes()
             self._number_of_lines_per_note = number_of_lines_per_note
             self._note_editor.set_multinote(mode == STEPSEQ_MODE_MULTINOTE, number_of_lines_per_note)
             if mode == STEPSEQ_MODE_NORMAL:
@@ -1078,7 +1129,7 @@ class StepSequencerComponent(CompoundComponent):
 
     def _on_loop_changed(self):
         if self.is_enabled() and self._clip != None:
-            self._loop_selector._get_clip_loop()
+            self._loop_selector.update()
 
     def on_clip_slot_has_clip_changed(self):
         # the clip was deleted. unlock.
@@ -1087,49 +1138,61 @@ class StepSequencerComponent(CompoundComponent):
         self.on_clip_slot_changed()
         self.update()
 
-    def on_clip_slot_changed(self, scheduled=False):
+    def _on_slot_index_changed(self):
+        # a clip was fired or started on the track we are locked to
+        self.on_clip_slot_changed()
+        self.update()
+
+    def _observe_slot_indexes(self, track):
+        if track != self._slot_index_track:
+            if self._slot_index_track != None:
+                if self._slot_index_track.fired_slot_index_has_listener(self._on_slot_index_changed):
+                    self._slot_index_track.remove_fired_slot_index_listener(self._on_slot_index_changed)
+                if self._slot_index_track.playing_slot_index_has_listener(self._on_slot_index_changed):
+                    self._slot_index_track.remove_playing_slot_index_listener(self._on_slot_index_changed)
+            self._slot_index_track = track
+            if track != None:
+                track.add_fired_slot_index_listener(self._on_slot_index_changed)
+                track.add_playing_slot_index_listener(self._on_slot_index_changed)
+
+    def _update_slot_index_observer(self):
+        if self._lock_to_track and self._is_locked:
+            self._observe_slot_indexes(self._selected_track)
+        else:
+            self._observe_slot_indexes(None)
+
+    def on_clip_slot_changed(self):
         # get old reference to clipslot
         clip_slot = self._clip_slot
 
         # update track if not track locked
+        live_state = self._control_surface.live_state()
         if not self._is_locked or self._selected_track == None:
-            self._selected_track = self.song().view.selected_track
+            self._selected_track = live_state.selected_track
+        self._update_slot_index_observer()
 
         # update scene
         if self._selected_track != None:
             idx = -1
             if self._lock_to_track and self._is_locked:
-                # track locked mode
-
-                # schedule a refresh as scene fire happens after scene selection
-                # so that we can catch the clip scheduled for playing
-                if not scheduled:
-                    self._control_surface.schedule_message(5, self.on_clip_slot_changed, (True))
-
-                # locate with clip pending fire
-                for i in range(len(self.song().scenes)):
-                    if self._selected_track.clip_slots[i].has_clip and self._selected_track.clip_slots[i].clip.is_triggered:
-                        idx = i
-                # no tirggered clip, locate with playing clip
-                if idx == -1:
-                    for i in range(len(self.song().scenes)):
-                        if self._selected_track.clip_slots[i].has_clip and self._selected_track.clip_slots[i].clip.is_playing:
-                            idx = i
+                # track locked mode : locate with clip pending fire, then with playing clip.
+                # the track calls back when they change (_on_slot_index_changed)
+                clip_slots = self._selected_track.clip_slots
+                for slot_index in (self._selected_track.fired_slot_index, self._selected_track.playing_slot_index):
+                    if slot_index >= 0 and slot_index < len(clip_slots) and clip_slots[slot_index].has_clip:
+                        idx = slot_index
+                        break
                 # fallback: use scene selection
                 if idx == -1:
-                    try:
-                        idx = list(self.song().scenes).index(self.song().view.selected_scene)
-                    except ValueError: 
-                        idx = -1
+                    idx = self._control_surface.live_index().scene_index(live_state.selected_scene)
 
             # unlocked mode
             if not self._is_locked:
-                try:
-                    idx = list(self.song().scenes).index(self.song().view.selected_scene)
-                except ValueError:
-                    idx = -1
-            if(idx != -1 and idx < len(list(self._selected_track.clip_slots))):
-                clip_slot = self._selected_track.clip_slots[idx]
+                idx = self._control_surface.live_index().scene_index(live_state.selected_scene)
+            if idx != None and idx != -1:
+                clip_slots = self._selected_track.clip_slots
+                if idx < len(clip_slots):
+                    clip_slot = clip_slots[idx]
 
         # update clip slot
         if clip_slot != self._clip_slot or self._clip_slot == None:
@@ -1145,8 +1208,8 @@ class StepSequencerComponent(CompoundComponent):
             if self._clip == None or self._clip != self._clip_slot.clip:
                 # unlink
                 if self._clip != None and self._clip.is_midi_clip:
-                    if self._clip.notes_has_listener(self._on_notes_changed):
-                        self._clip.remove_notes_listener(self._on_notes_changed)
+                    if self._clip.notes_has_listener(self._on_clip_notes_changed):
+                        self._clip.remove_notes_listener(self._on_clip_notes_changed)
                     if self._clip.playing_status_has_listener(self._on_playing_status_changed):
                         self._clip.remove_playing_status_listener(self._on_playing_status_changed)
                     if self._clip.playing_position_has_listener(self._on_playing_position_changed):
@@ -1167,7 +1230,7 @@ class StepSequencerComponent(CompoundComponent):
                     self._note_selector.set_selected_note(self._scale_selector._octave * 12 + self._scale_selector._key)
                 
                 # link new clip
-                self._clip_slot.clip.add_notes_listener(self._on_notes_changed)
+                self._clip_slot.clip.add_notes_listener(self._on_clip_notes_changed)
                 self._clip_slot.clip.add_playing_status_listener(self._on_playing_status_changed)
                 self._clip_slot.clip.add_playing_position_listener(self._on_playing_position_changed)
                 self._clip_slot.clip.add_loop_start_listener(self._on_loop_changed)
@@ -1188,8 +1251,8 @@ class StepSequencerComponent(CompoundComponent):
         else:
             # unlink
             if self._clip != None:
-                if self._clip.notes_has_listener(self._on_notes_changed):
-                    self._clip.remove_notes_listener(self._on_notes_changed)
+                if self._clip.notes_has_listener(self._on_clip_notes_changed):
+                    self._clip.remove_notes_listener(self._on_clip_notes_changed)
                 if self._clip.playing_status_has_listener(self._on_playing_status_changed):
                     self._clip.remove_playing_status_listener(self._on_playing_status_changed)
                 if self._clip.playing_position_has_listener(self._on_playing_position_changed):
@@ -1204,32 +1267,140 @@ class StepSequencerComponent(CompoundComponent):
             self._clip_changed()
 
     def _clip_changed(self):  # triggered by _on_clip_slot_changed() or manually on enable.
+        # the staged edits belong to the clip we leave. self._clip is already the new clip : a notes
+        # change Live made while they were staged, or whose refetch did not run yet, can't be read
+        # now, the clip we leave is not parked
+        missed = self._notes_changed_while_staged or self._notes_refetch_scheduled
+        self._notes_changed_while_staged = False
+        self._clip_notes.flush()
+        # park what we know of the clip we leave, None : it missed a notes change while we were disabled
+        if self._clip_notes.clip != None and self._note_cache != None and not self._clip_notes.is_stale and not missed:
+            self._clip_states.put(self._clip_notes.clip, ClipState(self._note_cache, self._clip_notes.index, self._editor_state()))
+        self._clip_notes.set_clip(self._clip)
+        self._note_cache = None # the new clip notes must go through even if they look the same
         self._note_editor.set_clip(self._clip)
         self._note_selector.set_clip(self._clip)
         self._loop_selector.set_clip(self._clip)
         self._note_editor.set_playhead(None)
         self._note_selector.set_playhead(None)
         self._loop_selector.set_playhead(None)
+        self._forwarded_playhead_step = None
         # reload notes
         self._on_notes_changed()
             
-    def _on_notes_changed(self):  # trigger by callback on clip or via _clip_changed.
-        if self.is_enabled():
+    def _on_clip_notes_changed(self):  # notes listener : Live's notes are read once per tick at most
+        self.notes_changes_received += 1
+        if self._clip_notes.is_editing:
+            return # edit_notes() updates the cache itself
+        self._clip_notes.invalidate()
+        if self._notes_refetch_scheduled:
+            self.notes_changes_coalesced += 1
+        else:
+            self._notes_refetch_scheduled = True
+            self._control_surface.schedule_message(1, self._on_notes_refetch)
+
+    def _on_notes_refetch(self):
+        self._notes_refetch_scheduled = False
+        self._catch_up_notes()
+
+    def _catch_up_notes(self):
+        # the displayed page and the pages around it are read first, then one more window per tick
+        if self._clip_notes.has_pending or not self.is_enabled() or not self._clip_notes.can_refresh:
+            self._on_notes_changed()
+            return
+        start, end = self._note_editor.page_time_range()
+        margin = (end - start) * NOTES_PREFETCH_PAGES
+        changed = self._clip_notes.refresh(start - margin, end + margin)
+        changed = self._clip_notes.refresh_next() or changed
+        if changed:
+            self._set_note_cache(self._clip_notes.notes)
+        if self._clip_notes.is_stale and not self._notes_refetch_scheduled:
+            self._notes_refetch_scheduled = True
+            self._control_surface.schedule_message(1, self._on_notes_refetch)
+
+    def refresh_notes(self, start=None, end=None):
+        """ Brings the notes of [start, end[ up to date before they are edited.
+        None : the whole clip (loop extension, scale change...), read at once """
+        if self._clip_notes.is_stale:
+            self._clip_notes.flush() # the windows read must hold our staged edits
+            if start == None or not self._clip_notes.can_refresh:
+                self._on_notes_changed()
+            elif self._clip_notes.refresh(start, end) and self.is_enabled():
+                self._set_note_cache(self._clip_notes.notes)
+
+    def _on_notes_changed(self):  # trigger by _on_clip_notes_changed or via _clip_changed.
+        if self._clip_notes.has_pending:
+            # Live does not have our staged edits yet, read its notes once they are written
+            self._notes_changed_while_staged = True
+        elif self.is_enabled() and not self._clip_notes.is_editing: # edit_notes() updates the cache itself
             # get notes
             if self._clip == None:
                 note_cache = []
             else:
+                state = self._clip_states.pop(self._clip)
+                if state != None:
+                    # back to a clip we left, its notes did not change since
+                    self._clip_notes.set_index(state.index)
+                    self._restore_editor_state(state.editor)
+                    self._set_note_cache(state.note_cache)
+                    return
                 self._clip.select_all_notes()
                 note_cache = self._clip.get_selected_notes()
                 self._clip.deselect_all_notes()
+            fingerprint = notes_fingerprint(note_cache)
+            if self._note_cache == None or fingerprint != self._notes_fingerprint:
+                self._clip_notes.set_notes(note_cache)
+                self._set_note_cache(note_cache)
+                self._notes_fingerprint = fingerprint
+            else:
+                self._clip_notes.set_current() # the notes did not change after all
+        elif not self._clip_notes.is_editing:
+            self._note_cache = None # missed, read them again when enabled
+
+    # what the note editor parsed from the notes, kept with the clip state (see StepSequencerComponent2)
+    def _editor_state(self):
+        return None
+
+    def _restore_editor_state(self, editor_state):
+        pass
+
+    # Add/remove/modify some notes of the clip, only the edited notes are sent to Live.
+    # The pads show the edit at once, Live gets it with the other edits of the commit window
+    def edit_notes(self, removed=(), added=(), modified=()):
+        if Settings.STEPSEQ__COMMIT_WINDOW > 0:
+            self._clip_notes.stage(removed, added, modified)
+            if self._clip_notes.has_pending and not self._flush_scheduled:
+                self._flush_scheduled = True
+                self._control_surface.schedule_message(Settings.STEPSEQ__COMMIT_WINDOW, self._on_commit_window_end)
+            moved = 0
+        else:
+            moved = self._clip_notes.edit(removed, added, modified)
+        if self.is_enabled():
+            self._set_note_cache(self._clip_notes.notes)
+        return moved
+
+    def _on_commit_window_end(self):
+        self._flush_scheduled = False
+        self.flush_notes()
+
+    def flush_notes(self):
+        """ Writes the staged edits to the clip now """
+        self._clip_notes.flush()
+        if self._notes_changed_while_staged:
+            self._notes_changed_while_staged = False
+            self._catch_up_notes()
 
-            # update if needed
-            if note_cache != self._note_cache:
-                self._note_cache = note_cache
-                self._note_editor.set_note_cache(self._note_cache)
-                self._note_selector.set_note_cache(self._note_cache)
-                self._loop_selector.set_note_cache(self._note_cache)
-                self._note_editor.update()
+    def _set_note_cache(self, note_cache):
+        self._note_cache = note_cache
+        self._notes_fingerprint = None
+        self._note_editor.set_note_cache(self._note_cache)
+        self._note_selector.set_note_cache(self._note_cache)
+        self._loop_selector.set_note_cache(self._note_cache)
+        self._note_editor.update()
+
+    @property
+    def _note_index(self):
+        return self._clip_notes.index
 
 # PLAY POSITION
     def _on_playing_status_changed(self):  # playing status changed listener
@@ -1238,28 +1409,31 @@ class StepSequencerComponent(CompoundComponent):
 
     def _on_playing_position_changed(self):  # playing position changed listener
         if self.is_enabled():
-            if self._clip != None and self._clip.is_playing and self.song().is_playing:
+            if self._clip != None and self._clip.is_playing and self._control_surface.live_state().is_playing:
                 self._playhead = self._clip.playing_position
             else:
                 self._playhead = None
-            self._loop_selector.set_playhead(self._playhead)
-            self._note_selector.set_playhead(self._playhead)
-            self._note_editor.set_playhead(self._playhead)
+            self.playhead_ticks_received += 1
+            # the grids can only show steps : only tell the subcomponents when the playhead enters another step or page
+            playhead_step = self._playhead_step(self._playhead)
+            if playhead_step != self._forwarded_playhead_step:
+                self._forwarded_playhead_step = playhead_step
+                self.playhead_ticks_forwarded += 1
+                self._loop_selector.set_playhead(self._playhead)
+                self._note_selector.set_playhead(self._playhead)
+                self._note_editor.set_playhead(self._playhead)
             self.updateQuantizationButton()
 
+    def _playhead_step(self, playhead):
+        if playhead == None:
+            return None
+        return (self._quantization, int(math.floor(playhead / self._quantization)), self._loop_selector.block)
+
 # DRUM_GROUP_DEVICE
     def _update_drum_group_device(self):
-        if self.song().view.selected_track != None:
-            track = self.song().view.selected_track
-            if(track.devices != None and len(track.devices) > 0):
-                #device = track.devices[0]
-                device = self.find_drum_group_device(track)
-                if(device!= None and device.can_have_drum_pads and device.has_drum_pads):#Is drumrack and it have pads
-                    self._drum_group_device = device
-                else:
-                    self._drum_group_device = None
-            else:
-                self._drum_group_device = None
+        device = self._control_surface.drum_group_device(self._control_surface.live_state().selected_track)
+        if(device!= None and device.can_have_drum_pads and device.has_drum_pads):#Is drumrack and it have pads
+            self._drum_group_device = device
         else:
             self._drum_group_device = None
 
@@ -1268,16 +1442,6 @@ class StepSequencerComponent(CompoundComponent):
             self._update_drum_group_device()
             self._scale_selector.set_drumrack(self._drum_group_device != None)
     
-    def find_drum_group_device(self, track):
-        device = find_if(lambda d: d.type == Live.Device.DeviceType.instrument, track.devices)#find track's Instrument device
-        if device:
-            if device.can_have_drum_pads:#device is a drum rack??
-                return device
-            elif device.can_have_chains:#device is a rack??
-                return find_if(bool, imap(self.find_drum_group_device, device.chains))#recursive->returns the first drum rack item of the chain
-        else:
-            return None
-            
 # SCALE Selector Button
     def _update_scale_selector_button(self):
         if self.is_enabled():
@@ -1506,11 +1670,13 @@ class StepSequencerComponent(CompoundComponent):
                     if not self._is_locked:
                         self._control_surface.show_message("stepseq : locked to clip '"+str(self._clip.name)+"'")
                         self._is_locked = True
+                    self._update_slot_index_observer()
                     self._update_lock_button()
                 else:
                     self._is_locked = (not self._is_locked)
                     if self._is_locked:
                         self._control_surface.show_message("stepseq : locked to clip '"+str(self._clip.name)+"'")
+                    self._update_slot_index_observer()
                     self._update_lock_button()
                     self._update_OSD()
 
@@ -1595,7 +1761,7 @@ class StepSequencerComponent(CompoundComponent):
             try:
                 if not self._is_locked or self._lock_to_track:
                     track = self._clip_slot.canonical_parent
-                    newIdx = track.duplicate_clip_slot(list(track.clip_slots).index(self._clip_slot))
+                    newIdx = track.duplicate_clip_slot(self._control_surface.live_index().slot_index(self._clip_slot))
                     self.song().view.selected_scene = self.song().scenes[newIdx]
                     #if track.clip_slots[newIdx] != None:
                         #track.clip_slots[newIdx].fire()
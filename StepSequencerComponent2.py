@@ -3,6 +3,7 @@ from _Framework.ButtonMatrixElement import ButtonMatrixElement
 from .StepSequencerComponent import StepSequencerComponent, ButtonElement, NoteSelectorComponent, LoopSelectorComponent, QUANTIZATION_NAMES
 from .ScaleComponent import MUSICAL_MODES, KEY_NAMES
 from .TrackControllerComponent import TrackControllerComponent
+from .ClipNotes import note_diff
 from random import randrange
 import time
 
@@ -13,6 +14,13 @@ STEPSEQ_MODE_NOTES_LENGTHS = 4
 
 LONG_BUTTON_PRESS = 1.0
 
+STEPS = 128 # steps stored per clip
+DEGREES = 7 # pitch rows of the grid : bit j of a step pitches byte is degree j, drawn on row 6 - j
+# velocity, octave and length indexes of a step no note set
+DEFAULT_VELOCITY = 4
+DEFAULT_OCTAVE = 2
+DEFAULT_LENGTH = 3
+
 # TODO :
 # extend / clear region (possible via drum step seq for now)
 # not even clip lengths (using shift notes ?)
@@ -50,7 +58,15 @@ class MelodicNoteEditorComponent(ControlSurfaceComponent):
 		# clip
 		self._clip = None
 		self._note_cache = []
+		self._pitch_table_keys = None # keys _first_match and _degree_of_key were built for
+		self._first_match = {}
+		self._degree_of_key = {}
 		self._force_update = True
+		self._layers_valid = False
+		self._playhead_column = None # column holding the metronome on last update
+		self._grid_note_layer = [[0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0], 
+		[0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0], 
+		[0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0]]
 		self._init_data()
 
 		self._velocity_map = [0, 30, 60, 80, 100, 115, 127]
@@ -106,21 +122,47 @@ class MelodicNoteEditorComponent(ControlSurfaceComponent):
 		self._mode_notes_octaves_button = None
 		self._mode_notes_velocities_button = None
 		self._mode_notes_pitches_button = None
-		self._notes_pitches = None
+		self._step_pitches = None
 		self._notes_velocities = None
 		self._notes_octaves = None
 		self._notes_lengths = None
 		self._clip = None
 
 	def _init_data(self):
-		pages = 128
-		self._notes_pitches = [0] * (7 * pages)
-		self._notes_velocities = [4] * pages
-		self._notes_octaves = [2] * pages
-		self._notes_lengths = [3] * pages
+		# one byte per step : pitches as a bitmask of the degrees, then velocity, octave and length indexes
+		self._step_pitches = bytearray(STEPS)
+		self._notes_velocities = bytearray([DEFAULT_VELOCITY]) * STEPS
+		self._notes_octaves = bytearray([DEFAULT_OCTAVE]) * STEPS
+		self._notes_lengths = bytearray([DEFAULT_LENGTH]) * STEPS
+
+	def _has_pitch(self, step, degree):
+		return (self._step_pitches[step] >> degree) & 1
+
+	def _set_pitch(self, step, degree, on=True):
+		if on:
+			self._step_pitches[step] |= 1 << degree
+		else:
+			self._step_pitches[step] &= ~(1 << degree) & 0xFF
+
+	def _pitch_table(self):
+		# pitch -> (degree, octave) of its first match in the keys, built once per set of keys
+		if self._pitch_table_keys != self._key_indexes:
+			self._pitch_table_keys = list(self._key_indexes)
+			self._first_match = {}
+			self._degree_of_key = {}
+			for j in range(max(DEGREES, len(self._key_indexes))):
+				key = self._key_indexes[j]
+				if key not in self._degree_of_key:
+					self._degree_of_key[key] = j
+				for octave in range(7):
+					pitch = key + 12 * (octave - 2)
+					if pitch not in self._first_match:
+						self._first_match[pitch] = (j, octave)
+		return self._first_match
 
 	def set_mode(self, mode):
 		self._mode = mode
+		self._invalidate_layers()
 		self._force_update = True
 		self.update()
 
@@ -128,15 +170,47 @@ class MelodicNoteEditorComponent(ControlSurfaceComponent):
 		if self._clip != clip:
 			self._init_data()
 			self._clip = clip
+			self._invalidate_layers()
 
 	def set_note_cache(self, note_cache):
 		if self._note_cache != note_cache:
 			self._note_cache = note_cache
 			self._parse_notes()
 
+	def _parse_key(self):
+		# what _parse_notes depends on, besides the notes
+		return (self._quantization, tuple(self._key_indexes), self._is_monophonic)
+
+	def parsed_state(self):
+		# what _parse_notes would give : the velocity, octave and length set on a step without notes
+		# never reach the clip, they go back to the defaults
+		first_match = self._pitch_table()
+		velocities = bytearray([DEFAULT_VELOCITY]) * STEPS
+		octaves = bytearray([DEFAULT_OCTAVE]) * STEPS
+		lengths = bytearray([DEFAULT_LENGTH]) * STEPS
+		parsed = bytearray(STEPS)
+		for note in self._note_cache or ():
+			i = int(note[1] / self._quantization)
+			if not note[4] and 0 <= i < STEPS and not parsed[i]:
+				parsed[i] = 1
+				velocities[i] = self._notes_velocities[i]
+				lengths[i] = self._notes_lengths[i]
+				if note[0] in first_match:
+					octaves[i] = self._notes_octaves[i]
+		return (self._parse_key(), self._note_cache, self._step_pitches, velocities, octaves, lengths)
+
+	def restore_parsed_state(self, state):
+		""" Takes back a parsed_state of the clip, unless the scale or quantization changed since """
+		if state != None and state[0] == self._parse_key():
+			self._note_cache, self._step_pitches, self._notes_velocities, self._notes_octaves, self._notes_lengths = state[1:]
+			self._invalidate_layers()
+
 	def set_playhead(self, playhead):
 		self._playhead = playhead
-		self._update_matrix()
+		if self._layers_valid and not self._force_update:
+			self._update_playhead()
+		else:
+			self._update_matrix()
 
 	def set_multinote(self, x=0, y=0):
 		pass
@@ -146,6 +220,7 @@ class MelodicNoteEditorComponent(ControlSurfaceComponent):
 		return self._quantization
 
 	def set_quantization(self, quantization):
+		self._step_sequencer.refresh_notes() # the steps are rewritten from what we parsed
 		old_quantize = self._quantization
 		self._quantization = quantization
 		# update loop point
@@ -170,6 +245,7 @@ class MelodicNoteEditorComponent(ControlSurfaceComponent):
 
 	def set_key_indexes(self, key_indexes):
 		if self._key_indexes != key_indexes:
+			self._step_sequencer.refresh_notes()
 			self._key_indexes = key_indexes
 			self._update_clip_notes()
 
@@ -181,68 +257,87 @@ class MelodicNoteEditorComponent(ControlSurfaceComponent):
 
 	def set_page(self, page):
 		self._page = page
+		self._invalidate_layers()
 
-	def _parse_notes(self):
-		# clear notes
-		for i in range(len(self._notes_pitches)):
-			self._notes_pitches[i] = 0
+	def page_time_range(self):
+		return self._page * 8 * self._quantization, (self._page + 1) * 8 * self._quantization
 
-		first_note = [True] * 128
+	def _parse_notes(self):
+		first_match = self._pitch_table()
+		degree_of_key = self._degree_of_key
+		step_pitches = self._step_pitches = bytearray(STEPS)
+		parsed = bytearray(STEPS) # steps whose first note set velocity, length and octave
 
 		for note in self._note_cache:
-			note_position = note[1]
 			note_key = note[0]
 			note_length = note[2]
 			note_velocity = note[3]
 			note_muted = note[4]
-			i = int(note_position / self._quantization)
+			i = int(note[1] / self._quantization)
 
-			if not note_muted:
-				if first_note[i]:
-					first_note[i] = False
+			if not note_muted and 0 <= i < STEPS:
+				if not parsed[i]:
+					parsed[i] = 1
 
 					# velocity
-					for x in range(7):
+					for x in range(6, -1, -1):
 						if note_velocity >= self._velocity_map[x]:
 							self._notes_velocities[i] = x
+							break
 
 					# length
-					for x in range(7):
+					for x in range(6, -1, -1):
 						if note_length * 4 >= self._length_map[x] * self._quantization:
 							self._notes_lengths[i] = x
+							break
 
 					# note and octave
-					found = False
-					for j in range(max(7, len(self._key_indexes))):
-						for octave in range(7):
-							if note_key == self._key_indexes[j] + 12 * (octave - 2) and not found:
-								found = True
-								self._notes_octaves[i] = octave
-								self._notes_pitches[i * 7 + j] = 1
+					match = first_match.get(note_key)
+					if match != None:
+						self._notes_octaves[i] = match[1]
+						j = match[0]
+					else:
+						j = None
 				elif not self._is_monophonic:
 					# note
-					found = False
-					for j in range(max(7, len(self._key_indexes))):
-						if note_key == self._key_indexes[j] + 12 * (self._notes_octaves[i] - 2) and not found:
-							found = True
-							self._notes_pitches[i * 7 + j] = 1
+					j = degree_of_key.get(note_key - 12 * (self._notes_octaves[i] - 2))
+				else:
+					j = None
+				if j != None:
+					# the 8th key lands on the lowest degree of the next step
+					step = i + j // DEGREES
+					if step < STEPS:
+						step_pitches[step] |= 1 << (j % DEGREES)
 		self._update_matrix()
 
-	def _update_clip_notes(self):
+	def _update_clip_notes(self, steps=None):
+		""" Writes steps to the clip. None : the whole clip becomes the steps (scale or quantization change).
+		Only the notes that differ from the clip are sent, in one edit """
+		self._invalidate_layers()
 		if self._clip != None and self._step_sequencer.is_enabled():
+			note_index = self._step_sequencer._note_index
+			if steps == None:
+				steps = range(STEPS)
+				clip_notes = note_index.notes
+			else:
+				steps = sorted(set(steps))
+				clip_notes = []
+				for x in steps:
+					clip_notes.extend(note_index.notes_in_range(x * self._quantization, (x + 1) * self._quantization))
 			note_cache = list()
-			for x in range(len(self._notes_velocities)):
-				for note_index in range(7):
-					if self._notes_pitches[x * 7 + note_index] == 1:
+			for x in steps:
+				if x >= STEPS or not self._step_pitches[x]:
+					continue
+				for note_index in range(DEGREES):
+					if self._has_pitch(x, note_index):
 						time = x * self._quantization
 						velocity = self._velocity_map[self._notes_velocities[x]]
 						length = self._length_map[self._notes_lengths[x]] * self._quantization / 4.0
 						pitch = self._key_indexes[note_index] + 12 * (self._notes_octaves[x] - 2)
 						if(pitch >= 0 and pitch < 128 and velocity >= 0 and velocity < 128 and length >= 0):
-							note_cache.append([pitch, time, length, velocity, False])
-			self._clip.select_all_notes()
-			self._clip.replace_selected_notes(tuple(note_cache))	
-			#self._control_surface.schedule_message(1, self._sch_update, ([self._clip,tuple(note_cache)]))
+							note_cache.append((pitch, time, length, velocity, False))
+			removed, added = note_diff(clip_notes, note_cache)
+			self._step_sequencer.edit_notes(removed=removed, added=added)
 
 	def _sch_update(self, data):
 			clip = data[0]
@@ -301,109 +396,133 @@ class MelodicNoteEditorComponent(ControlSurfaceComponent):
 			if self._matrix != None:
 				self._matrix.add_value_listener(self._matrix_value)
 
+	# The grid is drawn from the note layer, that only changes with the notes, page or mode,
+	# and the playhead column, the only one redrawn on playhead moves.
+	def _invalidate_layers(self):
+		self._layers_valid = False
+
 	def _update_matrix(self):  # step grid LEDs are updated here
 		if self.is_enabled() and self._matrix != None:
-			# clear back buffer
+			self._update_note_layer()
+			self._draw_columns(range(8))
+
+	def _update_playhead(self):
+		if self.is_enabled() and self._matrix != None:
+			columns = set([self._playhead_column])
+			if self._clip != None and self._playhead != None:
+				columns.add(int(self._playhead / self.quantization) % 8)
+			columns.discard(None)
+			self._draw_columns(columns)
+
+	def _update_note_layer(self):
+		# clear note layer
+		for x in range(8):
+			for y in range(8):
+				self._grid_note_layer[x][y] = 0
+
+		if self._clip != None:
+			
 			for x in range(8):
-				for y in range(8):
-					self._grid_back_buffer[x][y] = 0
+				pitches = self._step_pitches[x + 8 * self._page]
+				has_note = pitches != 0
 
-			# update back buffer
-			if self._clip != None:
-				
-				for x in range(8):
-					has_note = False
-					for y in range(7):
-						if self._notes_pitches[(x + 8 * self._page) * 7 + 6 - y] == 1:
-							has_note = True
+				for y in range(7):
+					if self._mode == STEPSEQ_MODE_NOTES:
+						if (pitches >> (6 - y)) & 1:
+							self._grid_note_layer[x][y] = "StepSequencer2.Pitch.On"
+						else:
+							self._grid_note_layer[x][y] = "StepSequencer2.Pitch.Off"
 
-					for y in range(7):
-						if self._mode == STEPSEQ_MODE_NOTES:
-							if self._notes_pitches[(x + 8 * self._page) * 7 + 6 - y] == 1:
-								self._grid_back_buffer[x][y] = "StepSequencer2.Pitch.On"
+					elif self._mode == STEPSEQ_MODE_NOTES_OCTAVES:
+						if(has_note):
+							if self._notes_octaves[x + 8 * self._page] == 6 - y:
+								self._grid_note_layer[x][y] = "StepSequencer2.Octave.On"
+							else:
+								self._grid_note_layer[x][y] = "StepSequencer2.Octave.Off"
+						else:
+							if self._notes_octaves[x + 8 * self._page] == 6 - y:
+								self._grid_note_layer[x][y] = "StepSequencer2.Octave.Dim"
 							else:
-								self._grid_back_buffer[x][y] = "StepSequencer2.Pitch.Off"
-
-						elif self._mode == STEPSEQ_MODE_NOTES_OCTAVES:
-							if(has_note):
-								if self._notes_octaves[x + 8 * self._page] == 6 - y:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Octave.On"
-								else:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Octave.Off"
+								self._grid_note_layer[x][y] = "StepSequencer2.Octave.Off"
+
+					elif self._mode == STEPSEQ_MODE_NOTES_VELOCITIES:
+						if(has_note):
+							if self._notes_velocities[x + 8 * self._page] >= 6 - y:
+								self._grid_note_layer[x][y] = "StepSequencer2.Velocity.On"
 							else:
-								if self._notes_octaves[x + 8 * self._page] == 6 - y:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Octave.Dim"
-								else:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Octave.Off"
-
-						elif self._mode == STEPSEQ_MODE_NOTES_VELOCITIES:
-							if(has_note):
-								if self._notes_velocities[x + 8 * self._page] >= 6 - y:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Velocity.On"
-								else:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Velocity.Off"
+								self._grid_note_layer[x][y] = "StepSequencer2.Velocity.Off"
+						else:
+							if self._notes_velocities[x + 8 * self._page] >= 6 - y:
+								self._grid_note_layer[x][y] = "StepSequencer2.Velocity.Dim"
 							else:
-								if self._notes_velocities[x + 8 * self._page] >= 6 - y:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Velocity.Dim"
-								else:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Velocity.Off"
-
-						elif self._mode == STEPSEQ_MODE_NOTES_LENGTHS:
-							if has_note:
-								if self._notes_lengths[x + 8 * self._page] >= 6 - y:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Length.On"
-								else:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Length.Off"
+								self._grid_note_layer[x][y] = "StepSequencer2.Velocity.Off"
+
+					elif self._mode == STEPSEQ_MODE_NOTES_LENGTHS:
+						if has_note:
+							if self._notes_lengths[x + 8 * self._page] >= 6 - y:
+								self._grid_note_layer[x][y] = "StepSequencer2.Length.On"
 							else:
-								if self._notes_lengths[x + 8 * self._page] >= 6 - y:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Length.Dim"
-								else:
-									self._grid_back_buffer[x][y] = "StepSequencer2.Length.Off"
-				# metronome
-				if self._playhead != None:
-					play_position = int(self._playhead / self.quantization)
-					play_x_position = int(self._playhead / self.quantization) % 8
-					page = int(self._playhead / self.quantization / 8)
-					if self._mode == STEPSEQ_MODE_NOTES_LENGTHS:
-						if page == self._page:
-							metronome_color = "StepSequencer2.NoteEditor.MetronomeInPage"
+								self._grid_note_layer[x][y] = "StepSequencer2.Length.Off"
 						else:
-							metronome_color = "StepSequencer2.NoteEditor.MetronomeInOtherPage"
+							if self._notes_lengths[x + 8 * self._page] >= 6 - y:
+								self._grid_note_layer[x][y] = "StepSequencer2.Length.Dim"
+							else:
+								self._grid_note_layer[x][y] = "StepSequencer2.Length.Off"
+		else:
+			for x in range(8):
+				for y in range(7):
+					self._grid_note_layer[x][y] = "DefaultButton.Disabled"
+		self._layers_valid = True
+
+	def _draw_columns(self, columns):
+		for x in columns:
+			for y in range(8):
+				self._grid_back_buffer[x][y] = self._grid_note_layer[x][y]
+
+		self._playhead_column = None
+		if self._clip != None:
+			# metronome
+			if self._playhead != None:
+				play_position = int(self._playhead / self.quantization)
+				play_x_position = int(self._playhead / self.quantization) % 8
+				page = int(self._playhead / self.quantization / 8)
+				if self._mode == STEPSEQ_MODE_NOTES_LENGTHS:
+					if page == self._page:
+						metronome_color = "StepSequencer2.NoteEditor.MetronomeInPage"
 					else:
-						if page == self._page:
-							metronome_color = "StepSequencer2.NoteEditor.MetronomeInPage"
-						else:
-							metronome_color = "StepSequencer2.NoteEditor.MetronomeInOtherPage"
-					self._grid_back_buffer[play_x_position][6] = metronome_color
-
-					# playing notes
-					if self._mode == STEPSEQ_MODE_NOTES:
-						for y in range(7):
-							if self._notes_pitches[play_position * 7 + 6 - y] == 1:
-								if page == self._page:
-									self._grid_back_buffer[play_x_position][y] = "StepSequencer2.NoteEditor.PlayInPage"
-								else:
-									self._grid_back_buffer[play_x_position][y] = "StepSequencer2.NoteEditor.PlayInOtherPage"
+						metronome_color = "StepSequencer2.NoteEditor.MetronomeInOtherPage"
+				else:
+					if page == self._page:
+						metronome_color = "StepSequencer2.NoteEditor.MetronomeInPage"
+					else:
+						metronome_color = "StepSequencer2.NoteEditor.MetronomeInOtherPage"
+				self._playhead_column = play_x_position
+				self._grid_back_buffer[play_x_position][6] = metronome_color
 
-			else:
-				for x in range(8):
+				# playing notes
+				if self._mode == STEPSEQ_MODE_NOTES:
 					for y in range(7):
-						self._grid_back_buffer[x][y] = "DefaultButton.Disabled"
-
-			# caching : compare back buffer to buffer and update grid. this should minimize midi traffic quite a bit.
-			for x in range(8):
-				for y in range(7):
-					if self._grid_back_buffer[x][y] != self._grid_buffer[x][y] or self._force_update:
-						self._grid_buffer[x][y] = self._grid_back_buffer[x][y]
-						self._matrix.get_button(x,y).set_light(self._grid_buffer[x][y])
-						
-			self._force_update = False
+						if play_position < STEPS and self._has_pitch(play_position, 6 - y):
+							if page == self._page:
+								self._grid_back_buffer[play_x_position][y] = "StepSequencer2.NoteEditor.PlayInPage"
+							else:
+								self._grid_back_buffer[play_x_position][y] = "StepSequencer2.NoteEditor.PlayInOtherPage"
+
+		# caching : compare back buffer to buffer and update grid. this should minimize midi traffic quite a bit.
+		for x in columns:
+			for y in range(7):
+				if self._grid_back_buffer[x][y] != self._grid_buffer[x][y] or self._force_update:
+					self._grid_buffer[x][y] = self._grid_back_buffer[x][y]
+					self._matrix.get_button(x,y).set_light(self._grid_buffer[x][y])
+					
+		self._force_update = False
 
 	def _matrix_value(self, value, x, y, is_momentary):  # matrix buttons listener
 		if self.is_enabled() and self._matrix!=None:
 			if self._clip == None:
 				self._step_sequencer.create_clip()
 			else:
+				self._step_sequencer.refresh_notes()
 				start = int(self._clip.loop_start / self._quantization)
 				end = int(self._clip.loop_end / self._quantization)
 				if (self._page + 1) * 8 > end or self._page * 8 < start:
@@ -413,24 +532,24 @@ class MelodicNoteEditorComponent(ControlSurfaceComponent):
 					end = (self._page + 1) * 8
 
 				if ((value != 0) or (not is_momentary)) and y < 7:
+					steps = [x + 8 * self._page] # steps to write, all the loop when shifted
 					if self._mode == STEPSEQ_MODE_NOTES:
 						if self._is_notes_pitches_shifted:
+							steps = range(start, end)
 							for x in range(start, end):
-								for yy in range(7):
-									self._notes_pitches[(x) * 7 + 6 - yy] = 0
-								self._notes_pitches[(x) * 7 + 6 - y] = 1
+								self._step_pitches[x] = 1 << (6 - y)
 						else:
 							# clear note
-							if self._notes_pitches[(x + 8 * self._page) * 7 + 6 - y] == 1:
-								self._notes_pitches[(x + 8 * self._page) * 7 + 6 - y] = 0
+							if self._has_pitch(x + 8 * self._page, 6 - y):
+								self._set_pitch(x + 8 * self._page, 6 - y, False)
 							else:
 								# clear step
 								if self._is_monophonic:
-									for yy in range(7):
-										self._notes_pitches[(x + 8 * self._page) * 7 + 6 - yy] = 0
-								self._notes_pitches[(x + 8 * self._page) * 7 + 6 - y] = 1
+									self._step_pitches[x + 8 * self._page] = 0
+								self._set_pitch(x + 8 * self._page, 6 - y)
 					elif self._mode == STEPSEQ_MODE_NOTES_OCTAVES:
 						if self._is_notes_octaves_shifted:
+							steps = range(start, end)
 							if(x < 4):
 								for x in range(start, end):
 									self._notes_octaves[x] = 6 - y
@@ -444,6 +563,7 @@ class MelodicNoteEditorComponent(ControlSurfaceComponent):
 							self._notes_octaves[x + 8 * self._page] = 6 - y
 					elif self._mode == STEPSEQ_MODE_NOTES_VELOCITIES:
 						if self._is_notes_velocities_shifted:
+							steps = range(start, end)
 							if(x < 4):
 								for x in range(start, end):
 									self._notes_velocities[x] = 6 - y
@@ -458,6 +578,7 @@ class MelodicNoteEditorComponent(ControlSurfaceComponent):
 							self._notes_velocities[x + 8 * self._page] = 6 - y
 					elif self._mode == STEPSEQ_MODE_NOTES_LENGTHS:
 						if self._is_notes_lengths_shifted:
+							steps = range(start, end)
 							if(x < 4):
 								for x in range(start, end):
 									self._notes_lengths[x] = 6 - y
@@ -470,7 +591,7 @@ class MelodicNoteEditorComponent(ControlSurfaceComponent):
 						else:
 							self._notes_lengths[x + 8 * self._page] = 6 - y
 					self._update_matrix()
-					self._update_clip_notes()
+					self._update_clip_notes(steps)
 
 
 # RANDOM
@@ -506,6 +627,7 @@ class MelodicNoteEditorComponent(ControlSurfaceComponent):
 				self._random_button.turn_on()
 
 	def _randomise(self):
+		self._step_sequencer.refresh_notes()
 		start = int(self._clip.loop_start / self._quantization)
 		end = int(self._clip.loop_end / self._quantization)
 		if (self._page + 1) * 8 > end or self._page * 8 < start:
@@ -517,8 +639,7 @@ class MelodicNoteEditorComponent(ControlSurfaceComponent):
 		for x in range(start, end):
 			if self._mode == STEPSEQ_MODE_NOTES:
 				val2 = randrange(0, 9)
-				for y in range(7):
-					self._notes_pitches[x * 7 + 6 - y] = val2 == y
+				self._step_pitches[x] = 1 << (6 - val2) if val2 < 7 else 0
 			elif self._mode == STEPSEQ_MODE_NOTES_OCTAVES:
 				val = randrange(2, 6)
 				self._notes_octaves[x] = val
@@ -529,7 +650,7 @@ class MelodicNoteEditorComponent(ControlSurfaceComponent):
 				val = randrange(0, 4)
 				self._notes_lengths[x] = val
 
-		self._update_clip_notes()
+		self._update_clip_notes(range(start, end))
 
 
 # PITCHES
@@ -742,6 +863,12 @@ class StepSequencerComponent2(StepSequencerComponent):
 		# no drum rack mode for me. i am a melodic step seq.
 		self._drum_group_device = None
 
+	def _editor_state(self):
+		return self._note_editor.parsed_state()
+
+	def _restore_editor_state(self, editor_state):
+		self._note_editor.restore_parsed_state(editor_state)
+
 	def _update_OSD(self):
 		if self._osd != None:
 			self._osd.set_mode('Melodic Step Sequencer')
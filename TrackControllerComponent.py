@@ -58,8 +58,7 @@ class TrackControllerComponent(MixerComponent):
 		if self.is_enabled and not enabled:
 			# disable implicit arm while leaving.
 			if self._implicit_arm:
-				if self.selected_track.can_be_armed:
-					self.selected_track.implicit_arm = False
+				self._control_surface.set_implicit_arm_track(None)
 		MixerComponent.set_enabled(self, enabled)
 
 	#def _do_select_scene(self, scene):
@@ -155,13 +154,15 @@ class TrackControllerComponent(MixerComponent):
 		if self.is_enabled():
 			if self._prev_track_button != None:
 				self._prev_track_button.set_on_off_values("Mode."+self._skin_name)
-				if self.selected_track_idx > 0:
+				idx = self.selected_track_idx
+				if idx != None and idx > 0:
 					self._prev_track_button.turn_on()
 				else:
 					self._prev_track_button.turn_off()
 			if self._next_track_button != None :
 				self._next_track_button.set_on_off_values("Mode."+self._skin_name)
-				if self.selected_track_idx < len(self.song().tracks) - 1:
+				idx = self.selected_track_idx
+				if idx != None and idx < len(self._control_surface.live_state().tracks) - 1:
 					self._next_track_button.turn_on()
 				else:
 					self._next_track_button.turn_off()
@@ -180,8 +181,10 @@ class TrackControllerComponent(MixerComponent):
 		assert (value in range(128))
 		if self.is_enabled():
 			if not sender.is_momentary() or value is not 0:
-				if self.selected_track_idx < len(self.song().tracks) - 1:
-					self.song().view.selected_track = self.song().tracks[self.selected_track_idx + 1]
+				tracks = self._control_surface.live_index().tracks()
+				idx = self.selected_track_idx
+				if idx != None and idx < len(tracks) - 1:
+					self.song().view.selected_track = tracks[idx + 1]
 					self._do_implicit_arm()
 
 #PREV TRACK
@@ -199,8 +202,9 @@ class TrackControllerComponent(MixerComponent):
 		assert (value in range(128))
 		if self.is_enabled():
 			if not sender.is_momentary() or value is not 0:
-				if self.selected_track_idx > 0:
-					self.song().view.selected_track = self.song().tracks[self.selected_track_idx - 1]
+				idx = self.selected_track_idx
+				if idx != None and idx > 0:
+					self.song().view.selected_track = self._control_surface.live_index().tracks()[idx - 1]
 					self._do_implicit_arm()
 
 # SCENE BUTTONS
@@ -209,14 +213,16 @@ class TrackControllerComponent(MixerComponent):
 		if self.is_enabled():
 			if self._prev_scene_button != None:
 				self._prev_scene_button.set_on_off_values("Mode."+self._skin_name)
-				if self.selected_scene_idx > 0:
+				idx = self.selected_scene_idx
+				if idx != None and idx > 0:
 					self._prev_scene_button.turn_on()
 				else:
 					self._prev_scene_button.turn_off()
 
 			if self._next_scene_button != None:
 				self._next_scene_button.set_on_off_values("Mode."+self._skin_name)
-				if self.selected_scene_idx < len(self.song().scenes) - 1:
+				idx = self.selected_scene_idx
+				if idx != None and idx < len(self._control_surface.live_state().scenes) - 1:
 					self._next_scene_button.turn_on()
 				else:
 					self._next_scene_button.turn_off()
@@ -226,16 +232,19 @@ class TrackControllerComponent(MixerComponent):
 		assert (value in range(128))
 		if self.is_enabled():
 			if not sender.is_momentary() or value is not 0:
-				if self.selected_scene_idx > 0:
-					self.song().view.selected_scene = self.song().scenes[self.selected_scene_idx - 1]
+				idx = self.selected_scene_idx
+				if idx != None and idx > 0:
+					self.song().view.selected_scene = self._control_surface.live_index().scenes()[idx - 1]
 				
 	def _next_scene_value(self, value, sender):
 		assert (self._next_scene_button != None)
 		assert (value in range(128))
 		if self.is_enabled():
 			if not sender.is_momentary() or value is not 0:
-				if self.selected_scene_idx < len(self.song().scenes) - 1:
-					self.song().view.selected_scene = self.song().scenes[self.selected_scene_idx + 1]			
+				scenes = self._control_surface.live_index().scenes()
+				idx = self.selected_scene_idx
+				if idx != None and idx < len(scenes) - 1:
+					self.song().view.selected_scene = scenes[idx + 1]			
 
 
 # PREV SCENE			
@@ -402,7 +411,7 @@ class TrackControllerComponent(MixerComponent):
 					self._session_record_button.set_on_off_values("TrackController.ImplicitRecording")
 				else:
 					self._session_record_button.set_on_off_values("TrackController.Recording")
-				if(self.song().session_record):
+				if(self._control_surface.live_state().session_record):
 					self._session_record_button.turn_on()
 				else:
 					self._session_record_button.turn_off()
@@ -447,18 +456,17 @@ class TrackControllerComponent(MixerComponent):
 
 		MixerComponent.update(self)
 
-	def can_implicit_arm_track(self, track):
-		return track.can_be_armed and track.has_midi_input
-
 	def _do_implicit_arm(self, arm = True):
 		if self.is_enabled():
 			if self._implicit_arm:
 				self._control_surface.set_controlled_track(self.selected_track)
 			else:
 				self._control_surface.release_controlled_track()
-			for track in self.song().tracks:
-				if self.can_implicit_arm_track(track):
-					track.implicit_arm = self._implicit_arm and arm and self.selected_track == track
+			# only the track armed so far and the selected one are written
+			if self._implicit_arm and arm:
+				self._control_surface.set_implicit_arm_track(self.selected_track)
+			else:
+				self._control_surface.set_implicit_arm_track(None)
 
 		
 	def on_selected_track_changed(self):
@@ -471,19 +479,20 @@ class TrackControllerComponent(MixerComponent):
 	
 	@property
 	def selected_track(self):
-		return self.song().view.selected_track
+		return self._control_surface.live_state().selected_track
 
 	@property
 	def selected_track_idx(self):
-		return list(self.song().tracks).index(self.song().view.selected_track) if self.song().view.selected_track in list(self.song().tracks) else None  
+		# None when the selected track is a return or the master track
+		return self._control_surface.live_index().track_index(self.selected_track)
 
 	@property
 	def selected_scene_idx(self):
-		return list(self.song().scenes).index(self.song().view.selected_scene)
+		return self._control_surface.live_index().scene_index(self.selected_scene)
 		
 	@property
 	def selected_scene(self):
-		return self.song().view.selected_scene
+		return self._control_surface.live_state().selected_scene
 
 	@property
 	def selected_clip(self):
@@ -0,0 +1,87 @@
+""" Synthetic Live sets for the benchmarks: songs, clips and drum racks. """
+import random
+
+import Live
+
+C_MAJOR = (0, 2, 4, 5, 7, 9, 11)
+
+
+def make_song(num_tracks=8, num_scenes=8, num_returns=2, live_version=(10, 1, 30)):
+	""" Creates a song and installs it as the document of Live's application. """
+	song = Live.Song.Song(num_tracks, num_scenes, num_returns)
+	clip_class = Live.Clip.Clip11 if live_version[0] >= 11 else Live.Clip.Clip
+	for track in song.tracks:
+		for slot in track.clip_slots:
+			slot.clip_class = clip_class
+	Live.Application.set_application(Live.Application.Application(song, live_version))
+	return song
+
+
+def drum_notes(count, pitches=range(36, 52), step=0.25, seed=0):
+	""" Returns `count` notes spread over `pitches` on a 1/16 grid, filling the
+	grid pitch by pitch so the clip stays as short as possible. Roughly one
+	note in eight is muted and velocities cover the whole colour map. """
+	rnd = random.Random(seed)
+	pitches = list(pitches)
+	notes = []
+	for index in range(count):
+		pitch = pitches[index % len(pitches)]
+		time = (index // len(pitches)) * step
+		notes.append((pitch, time, step, rnd.choice((10, 40, 70, 100, 127)), rnd.random() < 0.125))
+	return notes
+
+
+def melodic_notes(count, root=36, scale=C_MAJOR, steps=64, step=0.25, seed=0):
+	""" Returns `count` in-scale notes spread over the first `steps` sequencer steps. """
+	rnd = random.Random(seed)
+	notes = []
+	for index in range(count):
+		degree = rnd.randrange(len(scale))
+		octave = rnd.randrange(4)
+		pitch = root + 12 * octave + scale[degree]
+		time = (index % steps) * step
+		notes.append((pitch, time, step * rnd.choice((1, 2, 4)), rnd.choice((20, 60, 90, 127)), False))
+	return notes
+
+
+def clip_length(notes, step=0.25, bar=4.0):
+	end = max([n[1] + step for n in notes] or [bar])
+	return max(bar, bar * int((end + bar - step) / bar))
+
+
+def put_clip(song, track_index, scene_index, notes, playing=True):
+	""" Creates a clip holding `notes`, selects it and optionally starts it. """
+	track = song.tracks[track_index]
+	slot = track.clip_slots[scene_index]
+	if slot.has_clip:
+		slot.delete_clip()
+	clip = slot.create_clip(clip_length(notes))
+	clip.set_notes(tuple(notes))
+	clip.reset_stats()
+	song.view.selected_track = track
+	song.view.selected_scene = song.scenes[scene_index]
+	if playing:
+		song.is_playing = True
+		slot.fire()
+		track.start_fired_clip()
+	return clip
+
+
+def drum_rack(filled_notes=range(36, 52)):
+	return Live.Device.DrumRackDevice(filled_notes=filled_notes)
+
+
+def instrument(name='Operator', num_parameters=32):
+	return Live.Device.Device(name, name, Live.Device.DeviceType.instrument, num_parameters)
+
+
+def drum_track(song, track_index=0, filled_notes=range(36, 52)):
+	track = song.tracks[track_index]
+	track.set_devices([drum_rack(filled_notes)])
+	return track
+
+
+def instrument_track(song, track_index=1, name='Operator'):
+	track = song.tracks[track_index]
+	track.set_devices([instrument(name)])
+	return track
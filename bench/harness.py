@@ -0,0 +1,193 @@
+""" Loads Launchpad95 against the headless Live/_Framework stand-ins.
+
+	harness = Harness(model='mk2')
+	harness.set_mode('drum stepseq')
+	with harness.midi() as traffic:
+		...
+	print(traffic.messages, traffic.bytes)
+"""
+from __future__ import with_statement
+import os
+import sys
+from contextlib import contextmanager
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+STUBS_DIR = os.path.join(BENCH_DIR, 'stubs')
+PACKAGE_NAME = 'Launchpad95'
+
+if STUBS_DIR not in sys.path:
+	sys.path.insert(0, STUBS_DIR)
+
+import Live  # noqa: E402
+from . import fixtures  # noqa: E402
+
+MODELS = ('mk1', 'mk2', 'mk3', 'lpx')
+MAIN_MODES = {'session': 0, 'user1': 1, 'user2': 2, 'mixer': 3}
+
+
+def load_script():
+	""" Imports the repository as the `Launchpad95` package, as Live would. """
+	if PACKAGE_NAME in sys.modules:
+		return sys.modules[PACKAGE_NAME]
+	import importlib.util
+	spec = importlib.util.spec_from_file_location(PACKAGE_NAME, os.path.join(REPO_DIR, '__init__.py'), submodule_search_locations=[REPO_DIR])
+	module = importlib.util.module_from_spec(spec)
+	sys.modules[PACKAGE_NAME] = module
+	spec.loader.exec_module(module)
+	return module
+
+
+def script_module(name):
+	load_script()
+	return sys.modules[PACKAGE_NAME + '.' + name]
+
+
+class FakeNoteRepeat(object):
+	enabled = False
+	repeat_rate = 1.0
+
+
+class FakeCInstance(object):
+	""" The c_instance Live hands to create_instance(); records outgoing MIDI. """
+
+	def __init__(self):
+		self.sent = []
+		self.log = []
+		self.messages = []
+		self.note_repeat = FakeNoteRepeat()
+		self.feedback_velocity = None
+		self.midi_map_rebuilds = 0
+
+	def send_midi(self, midi_bytes):
+		self.sent.append(tuple(midi_bytes))
+
+	def show_message(self, message):
+		self.messages.append(message)
+
+	def log_message(self, message):
+		self.log.append(message)
+
+	def request_rebuild_midi_map(self):
+		self.midi_map_rebuilds += 1
+
+	def set_feedback_velocity(self, velocity):
+		self.feedback_velocity = velocity
+
+	def set_feedback_channels(self, channels):
+		pass
+
+	def set_session_highlight(self, *a):
+		pass
+
+
+class Traffic(object):
+	""" MIDI sent between start() and stop(). """
+
+	def __init__(self, c_instance):
+		self._c_instance = c_instance
+		self._start = len(c_instance.sent)
+		self.sent = []
+
+	def stop(self):
+		self.sent = self._c_instance.sent[self._start:]
+
+	@property
+	def messages(self):
+		return len(self.sent)
+
+	@property
+	def bytes(self):
+		return sum(len(m) for m in self.sent)
+
+
+def challenge_response(model, challenge):
+	response = Live.Application.encrypt_challenge2(challenge)
+	lo, hi = response & 0x7F, (response >> 8) & 0x7F
+	if model == 'mk1':
+		return (240, 0, 32, 41, 6, lo, hi, 247)
+	if model == 'mk2':
+		return (240, 0, 32, 41, 2, 24, 64, lo, hi, 247)
+	family = (19, 1) if model == 'mk3' else (3, 1)
+	return (240, 126, 0, 6, 2, 0, 32, 41) + family + (0, 0, 0, 0, 247)
+
+
+class Harness(object):
+
+	def __init__(self, model='mk2', song=None, live_version=(10, 1, 30)):
+		assert model in MODELS
+		self.model = model
+		self.song = song if song is not None else fixtures.make_song(live_version=live_version)
+		if Live.Application.get_application().get_document() is not self.song:
+			Live.Application.set_application(Live.Application.Application(self.song, live_version))
+		self.script = load_script()
+		self.c_instance = FakeCInstance()
+		self.surface = self.script.create_instance(self.c_instance)
+		with self.surface.component_guard():
+			self.surface.refresh_state()
+		self.tick(6)
+		with self.surface.component_guard():
+			self.surface.handle_sysex(challenge_response(model, self.surface._challenge))
+		assert self.surface._init_done, 'challenge response was not accepted'
+
+	@property
+	def selector(self):
+		return self.surface._selector
+
+	@property
+	def matrix(self):
+		return self.selector._matrix
+
+	def disconnect(self):
+		with self.surface.component_guard():
+			self.surface.disconnect()
+
+	def tick(self, count=1):
+		for _ in range(count):
+			self.surface.update_display()
+
+	def new_tick(self):
+		""" Starts a new display tick for the LED output budget, without running
+		the scheduled tasks update_display would run. """
+		self.surface._led_frame.next_tick()
+
+	def press(self, button, velocity=127):
+		with self.surface.component_guard():
+			button.receive_value(velocity)
+			button.receive_value(0)
+
+	def press_pad(self, x, y, velocity=127):
+		self.press(self.matrix.get_button(x, y), velocity)
+
+	def set_mode(self, name):
+		""" Presses top buttons until `name` ('session', 'mixer', or one of the
+		USER_MODES_1/USER_MODES_2 entries from Settings) is the active mode. """
+		Settings = script_module('Settings').Settings
+		if name in MAIN_MODES:
+			main, sub, modes = MAIN_MODES[name], None, None
+		elif name in Settings.USER_MODES_1:
+			main, sub, modes = 1, Settings.USER_MODES_1.index(name), Settings.USER_MODES_1
+		else:
+			main, sub, modes = 2, Settings.USER_MODES_2.index(name), Settings.USER_MODES_2
+		mode_button = self.selector._modes_buttons[main]
+		if self.selector._main_mode_index != main:
+			self.press(mode_button)
+		if sub is not None:
+			for _ in range(len(modes)):
+				if self.selector._sub_mode_list[main] == sub:
+					break
+				self.press(mode_button)
+		assert self.selector._main_mode_index == main
+
+	def play(self, clip, position):
+		""" Moves the playhead of a playing clip, notifying its listeners. """
+		with self.surface.component_guard():
+			clip.playing_position = position
+
+	@contextmanager
+	def midi(self):
+		traffic = Traffic(self.c_instance)
+		try:
+			yield traffic
+		finally:
+			traffic.stop()
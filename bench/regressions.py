@@ -0,0 +1,113 @@
+""" Regression checks for Launchpad95, run headless against bench/stubs.
+
+Usage (from the repository root):
+
+	python3 -m bench.regressions [--only clip_switch]
+
+Each check drives the surface through a scenario that once went wrong and
+compares what the script shows with what the stub Live set holds. Prints one
+line per case and exits with status 1 if any of them failed.
+"""
+from __future__ import print_function
+import argparse
+import sys
+
+from .harness import Harness, script_module
+from . import fixtures
+
+import Live
+
+
+class ClipWithoutRangedQuery(Live.Clip.Clip):
+	""" A clip of a Live without get_notes : only a full read brings the notes """
+
+	@property
+	def get_notes(self):
+		raise AttributeError('get_notes')
+
+
+def clip_notes(clip):
+	clip.select_all_notes()
+	notes = clip.get_selected_notes()
+	clip.deselect_all_notes()
+	return sorted(tuple(note) for note in notes)
+
+
+def check_clip_switch_while_staged():
+	""" Live changes the notes of a clip while an edit of ours is staged, then
+	another clip is selected before the edit is written. Coming back, the step
+	sequencer must show the notes of that clip, not the ones of the other clip
+	or the ones it had before the change. """
+	Settings = script_module('Settings').Settings
+	commit_window = Settings.STEPSEQ__COMMIT_WINDOW
+	failures = []
+	try:
+		for mode, make_notes in (('drum stepseq', fixtures.drum_notes), ('melodic stepseq', fixtures.melodic_notes)):
+			for live in (8, 9, 10, 11):
+				for window, refetched in ((1, True), (3, True), (3, False)):
+					Settings.STEPSEQ__COMMIT_WINDOW = window
+					song = fixtures.make_song(live_version=(max(live, 9), 1, 30))
+					if live == 8:
+						for track in song.tracks:
+							for slot in track.clip_slots:
+								slot.clip_class = ClipWithoutRangedQuery
+					if mode == 'drum stepseq':
+						fixtures.drum_track(song, 0)
+					else:
+						fixtures.instrument_track(song, 0)
+					fixtures.put_clip(song, 0, 0, make_notes(30))
+					fixtures.put_clip(song, 0, 1, make_notes(12, seed=3))
+					harness = Harness('mk2', song)
+					harness.set_mode(mode)
+					sequencer = harness.selector._stepseq if mode == 'drum stepseq' else harness.selector._stepseq2
+					# visit both clips so the first one gets parked and taken back
+					for scene in (1, 0):
+						song.view.selected_scene = song.scenes[scene]
+						harness.tick(2)
+					clip = song.tracks[0].clip_slots[0].clip
+					with harness.surface.component_guard():
+						harness.press_pad(0, 1) # staged until the commit window ends
+						clip.set_notes(((60, 3.0, 0.25, 100, False),))
+					if refetched:
+						harness.tick(1) # the notes refetch runs, the edit may still be staged
+					with harness.surface.component_guard():
+						song.view.selected_scene = song.scenes[1]
+					harness.tick(3)
+					song.view.selected_scene = song.scenes[0]
+					harness.tick(3)
+					expected = clip_notes(clip)
+					shown = sorted(tuple(note) for note in sequencer._note_cache)
+					mirror = sorted(tuple(note) for note in sequencer._clip_notes.notes)
+					case = '%s live=%d window=%d%s' % (mode, live, window, '' if refetched else ' before refetch')
+					if shown != expected or mirror != expected:
+						failures.append('%s: clip has %d notes, shown %d, mirror %d' % (case, len(expected), len(shown), len(mirror)))
+					else:
+						print('ok   ' + case)
+					harness.disconnect()
+	finally:
+		Settings.STEPSEQ__COMMIT_WINDOW = commit_window
+	return failures
+
+
+CHECKS = (
+	('clip_switch_while_staged', check_clip_switch_while_staged),
+)
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--only', default=None, help='run checks whose name contains this')
+	options = parser.parse_args(argv)
+	script_module('Launchpad')
+	failed = 0
+	for name, check in CHECKS:
+		if options.only and options.only not in name:
+			continue
+		for failure in check():
+			print('FAIL ' + failure)
+			failed += 1
+	return 1 if failed else 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,290 @@
+""" Render-path benchmarks for Launchpad95, run headless against bench/stubs.
+
+Usage (from the repository root):
+
+	python3 -m bench.run_benchmarks [--sizes 10,1000,50000] [--frames 64]
+	                                [--model mk2] [--live 10] [--only note_editor]
+	                                [--profile-live]
+
+Each benchmark builds a fresh synthetic set, switches the surface into the
+relevant mode, then times one render call per frame while the playhead
+advances a 1/16 step per frame. MIDI traffic is what the surface handed to
+c_instance.send_midi during the timed calls. With --profile-live, each row is
+followed by the Live object accesses of its timed calls (Settings.DEBUG__LIVE_PROFILE),
+timings then include the profiling cost. mode_transitions is followed by the
+time of each mode switch per pair of modes, as MainSelectorComponent measured it.
+"""
+from __future__ import print_function, with_statement
+import argparse
+import time
+
+from .harness import Harness, script_module
+from . import fixtures
+
+try:
+	clock = time.perf_counter
+except AttributeError:
+	clock = time.time
+
+DEFAULT_SIZES = (10, 100, 1000, 10000, 50000)
+STEP = 0.25
+
+
+class Result(object):
+
+	def __init__(self, name, notes, frames):
+		self.name = name
+		self.notes = notes
+		self.frames = frames
+		self.timings = []
+		self.messages = 0
+		self.bytes = 0
+		self.live_profile = None # report lines, --profile-live
+		self.details = None # report lines of the benchmark itself
+
+	def row(self):
+		mean = sum(self.timings) / len(self.timings) * 1000.0
+		worst = max(self.timings) * 1000.0
+		notes = '-' if self.notes is None else str(self.notes)
+		return '%-24s %7s %7d %10.3f %10.3f %9.1f %9.1f' % (
+			self.name, notes, self.frames, mean, worst,
+			float(self.messages) / self.frames, float(self.bytes) / self.frames)
+
+
+HEADER = '%-24s %7s %7s %10s %10s %9s %9s' % ('benchmark', 'notes', 'frames', 'ms/frame', 'ms worst', 'msg/frame', 'B/frame')
+
+
+def run_frames(harness, name, notes, frames, render, before=None):
+	""" Calls before(frame) untimed, then render() timed, once per frame. """
+	result = Result(name, notes, frames)
+	if before is not None:
+		before(-1)
+	render()
+	live_profile = harness.surface._live_profile
+	if live_profile is not None:
+		live_profile.reset()
+	with harness.surface.component_guard():
+		with harness.midi() as traffic:
+			for frame in range(frames):
+				if before is not None:
+					before(frame)
+				harness.new_tick()
+				start = clock()
+				render()
+				result.timings.append(clock() - start)
+	result.messages = traffic.messages
+	result.bytes = traffic.bytes
+	if live_profile is not None:
+		result.live_profile = live_profile.report(limit=10)
+	return result
+
+
+def bench_note_editor(options, size):
+	song = fixtures.make_song(live_version=options.live)
+	fixtures.drum_track(song, 0)
+	clip = fixtures.put_clip(song, 0, 0, fixtures.drum_notes(size))
+	harness = Harness(options.model, song, options.live)
+	harness.set_mode('drum stepseq')
+	editor = harness.selector._stepseq._note_editor
+
+	def before(frame):
+		editor._playhead = max(frame, 0) * STEP
+
+	return run_frames(harness, 'note_editor', size, options.frames, editor._update_matrix, before)
+
+
+def bench_melodic_note_editor(options, size):
+	song = fixtures.make_song(live_version=options.live)
+	fixtures.instrument_track(song, 1)
+	clip = fixtures.put_clip(song, 1, 0, fixtures.melodic_notes(size))
+	harness = Harness(options.model, song, options.live)
+	harness.set_mode('melodic stepseq')
+	editor = harness.selector._stepseq2._note_editor
+
+	def before(frame):
+		editor._playhead = max(frame, 0) * STEP
+
+	return run_frames(harness, 'melodic_note_editor', size, options.frames, editor._update_matrix, before)
+
+
+def bench_playhead(options, size):
+	results = []
+	for mode, label in (('drum stepseq', 'stepseq_playhead'), ('melodic stepseq', 'melodic_stepseq_playhead')):
+		song = fixtures.make_song(live_version=options.live)
+		fixtures.drum_track(song, 0)
+		fixtures.instrument_track(song, 1)
+		if mode == 'drum stepseq':
+			clip = fixtures.put_clip(song, 0, 0, fixtures.drum_notes(size))
+		else:
+			clip = fixtures.put_clip(song, 1, 0, fixtures.melodic_notes(size))
+			song.view.selected_track = song.tracks[1]
+		harness = Harness(options.model, song, options.live)
+		harness.set_mode(mode)
+		position = [0.0]
+
+		def before(frame):
+			position[0] = max(frame, 0) * STEP / 4
+
+		def move():
+			clip.playing_position = position[0]
+
+		results.append(run_frames(harness, label, size, options.frames, move, before))
+	return results
+
+
+def bench_notes_changed(options, size):
+	song = fixtures.make_song(live_version=options.live)
+	fixtures.drum_track(song, 0)
+	clip = fixtures.put_clip(song, 0, 0, fixtures.drum_notes(size))
+	harness = Harness(options.model, song, options.live)
+	harness.set_mode('drum stepseq')
+	stepseq = harness.selector._stepseq
+	return run_frames(harness, 'stepseq_notes_changed', size, options.frames, stepseq._on_notes_changed)
+
+
+def bench_step_toggle(options, size):
+	song = fixtures.make_song(live_version=options.live)
+	fixtures.drum_track(song, 0)
+	clip = fixtures.put_clip(song, 0, 0, fixtures.drum_notes(size))
+	harness = Harness(options.model, song, options.live)
+	harness.set_mode('drum stepseq')
+	stepseq = harness.selector._stepseq
+	editor = stepseq._note_editor
+	pads = [(x, y) for y in range(4) for x in range(8)]
+
+	def before(frame):
+		toggle.pad = pads[max(frame, 0) % len(pads)]
+
+	def toggle():
+		editor._matrix_value_message([127, toggle.pad[0], toggle.pad[1], True])
+		stepseq.flush_notes() # the write to the clip is part of the toggle
+
+	return run_frames(harness, 'step_toggle', size, options.frames, toggle, before)
+
+
+def bench_instrument_controller(options, size):
+	song = fixtures.make_song(live_version=options.live)
+	fixtures.drum_track(song, 0)
+	fixtures.instrument_track(song, 1)
+	harness = Harness(options.model, song, options.live)
+	harness.set_mode('instrument')
+	controller = harness.selector._instrument_controller
+	results = []
+	for index, label in ((0, 'instrument_drumrack'), (1, 'instrument_melodic')):
+		with harness.surface.component_guard():
+			song.view.selected_track = song.tracks[index]
+		results.append(run_frames(harness, label, None, options.frames, controller._update_matrix))
+	return results
+
+
+def bench_scale_component(options, size):
+	song = fixtures.make_song(live_version=options.live)
+	fixtures.instrument_track(song, 0)
+	harness = Harness(options.model, song, options.live)
+	harness.set_mode('instrument')
+	scales = harness.selector._instrument_controller._scales
+	with harness.surface.component_guard():
+		scales.set_enabled(True)
+	return run_frames(harness, 'scale_component', None, options.frames, scales.update)
+
+
+def bench_device_component(options, size):
+	song = fixtures.make_song(live_version=options.live)
+	track = fixtures.instrument_track(song, 0)
+	harness = Harness(options.model, song, options.live)
+	harness.set_mode('device')
+	device_component = harness.selector._device_controller
+	with harness.surface.component_guard():
+		song.view.select_device(track.devices[0])
+	return run_frames(harness, 'device_component', None, options.frames, device_component.update)
+
+
+def bench_mode_switch(options, size):
+	""" Full repaints: cycles session, mixer and the user modes, one switch per frame. """
+	song = fixtures.make_song(live_version=options.live)
+	fixtures.drum_track(song, 0)
+	fixtures.instrument_track(song, 1)
+	harness = Harness(options.model, song, options.live)
+	buttons = harness.selector._modes_buttons
+
+	def switch():
+		button = buttons[switch.frame % len(buttons)]
+		switch.frame += 1
+		button.receive_value(127)
+		button.receive_value(0)
+	switch.frame = 0
+	return run_frames(harness, 'mode_switch', None, options.frames, switch)
+
+
+def bench_mode_transitions(options, size):
+	""" Every ordered pair of modes in turn, followed by the time of each pair as measured by MainSelectorComponent. """
+	song = fixtures.make_song(live_version=options.live)
+	fixtures.drum_track(song, 0)
+	fixtures.instrument_track(song, 1)
+	harness = Harness(options.model, song, options.live)
+	Settings = script_module('Settings').Settings
+	modes = ['session', 'mixer'] + list(Settings.USER_MODES_1) + list(Settings.USER_MODES_2)
+	pairs = [(left, entered) for left in modes for entered in modes if left != entered]
+	timed = {} # the selector's times of the timed switches only
+
+	def before(frame):
+		harness.selector._transition_times = {}
+		harness.set_mode(pairs[frame % len(pairs)][0])
+		harness.selector._transition_times = timed
+		switch.entered = pairs[frame % len(pairs)][1]
+
+	def switch():
+		harness.set_mode(switch.entered)
+	result = run_frames(harness, 'mode_transitions', None, options.frames, switch, before)
+	result.details = harness.selector.transition_report()
+	return result
+
+
+# (name, callable, depends on clip size)
+BENCHMARKS = (
+	('note_editor', bench_note_editor, True),
+	('melodic_note_editor', bench_melodic_note_editor, True),
+	('stepseq_notes_changed', bench_notes_changed, True),
+	('stepseq_playhead', bench_playhead, True),
+	('step_toggle', bench_step_toggle, True),
+	('instrument_controller', bench_instrument_controller, False),
+	('scale_component', bench_scale_component, False),
+	('device_component', bench_device_component, False),
+	('mode_switch', bench_mode_switch, False),
+	('mode_transitions', bench_mode_transitions, False),
+)
+
+
+def parse_args(argv=None):
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help='comma separated clip sizes in notes')
+	parser.add_argument('--frames', type=int, default=64, help='timed frames per benchmark')
+	parser.add_argument('--model', default='mk2', choices=('mk1', 'mk2', 'mk3', 'lpx'))
+	parser.add_argument('--live', type=int, default=10, help='major Live version to emulate')
+	parser.add_argument('--only', default=None, help='run benchmarks whose name contains this')
+	parser.add_argument('--profile-live', action='store_true', help='count Live object accesses of the timed calls')
+	options = parser.parse_args(argv)
+	options.sizes = [int(s) for s in options.sizes.split(',') if s]
+	options.live = (options.live, 0, 0)
+	return options
+
+
+def main(argv=None):
+	options = parse_args(argv)
+	script_module('Launchpad')
+	script_module('Settings').Settings.DEBUG__LIVE_PROFILE = options.profile_live
+	print('model=%s live=%d frames=%d' % (options.model, options.live[0], options.frames))
+	print(HEADER)
+	for name, bench, sized in BENCHMARKS:
+		if options.only and options.only not in name:
+			continue
+		for size in (options.sizes if sized else [None]):
+			results = bench(options, size)
+			for result in (results if isinstance(results, list) else [results]):
+				print(result.row())
+				for line in (result.details or []) + (result.live_profile or []):
+					print('    ' + line)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,96 @@
+from .Base import Subject
+
+_application = None
+
+
+class Application(Subject):
+
+	class View(Subject):
+
+		class NavDirection(object):
+			up = 0
+			down = 1
+			left = 2
+			right = 3
+
+		def __init__(self):
+			Subject.__init__(self)
+			self._visible = {'Session': True, 'Detail': True, 'Detail/Clip': False, 'Detail/DeviceChain': True}
+
+		def is_view_visible(self, name, main_window_only=True):
+			return self._visible.get(name, False)
+
+		def show_view(self, name):
+			# like Live, listeners only hear about views that changed
+			if self._visible.get(name, False):
+				return
+			self._visible[name] = True
+			if name.startswith('Detail/'):
+				other = 'Detail/Clip' if name == 'Detail/DeviceChain' else 'Detail/DeviceChain'
+				self._visible[other] = False
+			self.notify('is_view_visible', name)
+
+		def hide_view(self, name):
+			if not self._visible.get(name, False):
+				return
+			self._visible[name] = False
+			self.notify('is_view_visible', name)
+
+		def focus_view(self, name):
+			self.show_view(name)
+
+		def scroll_view(self, direction, name, modifier_pressed):
+			pass
+
+		def add_is_view_visible_listener(self, name, cb):
+			self._add_listener('is_view_visible', cb, (name,))
+
+		def remove_is_view_visible_listener(self, name, cb):
+			self._remove_listener('is_view_visible', cb, (name,))
+
+		def is_view_visible_has_listener(self, name, cb):
+			return cb in self._listeners.get(('is_view_visible', name), [])
+
+	def __init__(self, document=None, version=(10, 1, 30)):
+		Subject.__init__(self)
+		self.view = Application.View()
+		self._document = document
+		self._version = version
+
+	def get_document(self):
+		return self._document
+
+	def get_major_version(self):
+		return self._version[0]
+
+	def get_minor_version(self):
+		return self._version[1]
+
+	def get_bugfix_version(self):
+		return self._version[2]
+
+
+def get_application():
+	global _application
+	if _application is None:
+		_application = Application()
+	return _application
+
+
+def set_application(application):
+	""" Harness hook: install the Application returned by get_application(). """
+	global _application
+	_application = application
+	return application
+
+
+def combine_apcs():
+	return False
+
+
+def get_random_int(lower, upper):
+	return (lower + upper) // 2
+
+
+def encrypt_challenge2(challenge):
+	return (challenge & 0x7F) | ((challenge >> 1) & 0x7F00)
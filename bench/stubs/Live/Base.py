@@ -0,0 +1,61 @@
+class LimitationError(Exception):
+	pass
+
+
+class Subject(object):
+	""" Listener bookkeeping shared by all fake Live objects.
+
+	Live exposes add_<prop>_listener / remove_<prop>_listener /
+	<prop>_has_listener triples for every observable property. They are
+	synthesised here from __listenable__ so subclasses only have to list the
+	property names and call notify(name) when a value changes. """
+
+	__listenable__ = ()
+
+	def __init__(self):
+		self._listeners = {}
+
+	def __getattr__(self, name):
+		if name.startswith('_'):
+			raise AttributeError(name)
+		for prefix, op in (('add_', self._add_listener), ('remove_', self._remove_listener)):
+			if name.startswith(prefix) and name.endswith('_listener'):
+				prop = name[len(prefix):-len('_listener')]
+				if prop in self.__listenable__:
+					return lambda cb, *a: op(prop, cb, a)
+		if name.endswith('_has_listener'):
+			prop = name[:-len('_has_listener')]
+			if prop in self.__listenable__:
+				return lambda cb, *a: cb in self._listeners.get((prop,) + a, [])
+		raise AttributeError(name)
+
+	def _add_listener(self, prop, cb, extra=()):
+		key = (prop,) + tuple(extra)
+		listeners = self._listeners.setdefault(key, [])
+		assert cb not in listeners, 'listener already added'
+		listeners.append(cb)
+
+	def _remove_listener(self, prop, cb, extra=()):
+		self._listeners[(prop,) + tuple(extra)].remove(cb)
+
+	def listener_count(self, prop=None):
+		return sum(len(v) for k, v in self._listeners.items() if prop is None or k[0] == prop)
+
+	def notify(self, prop, *extra):
+		for cb in list(self._listeners.get((prop,) + extra, ())):
+			cb()
+
+
+def observable(name, default=None):
+	""" Property that notifies its listeners whenever the value changes. """
+	attr = '_' + name
+
+	def getter(self):
+		return getattr(self, attr, default)
+
+	def setter(self, value):
+		if getattr(self, attr, default) != value:
+			setattr(self, attr, value)
+			self.notify(name)
+
+	return property(getter, setter)
@@ -0,0 +1,13 @@
+from .Base import Subject
+
+
+class Chain(Subject):
+	__listenable__ = ('devices', 'name', 'mute', 'solo')
+
+	def __init__(self, name='Chain', devices=None, canonical_parent=None):
+		Subject.__init__(self)
+		self.name = name
+		self.devices = list(devices or [])
+		self.mute = False
+		self.solo = False
+		self.canonical_parent = canonical_parent
@@ -0,0 +1,229 @@
+from .Base import Subject
+
+
+class MidiNoteSpecification(object):
+
+	def __init__(self, pitch, start_time, duration, velocity=100, mute=False, probability=1.0, velocity_deviation=0.0, release_velocity=64):
+		self.pitch = pitch
+		self.start_time = start_time
+		self.duration = duration
+		self.velocity = velocity
+		self.mute = mute
+		self.probability = probability
+		self.velocity_deviation = velocity_deviation
+		self.release_velocity = release_velocity
+
+
+class MidiNote(MidiNoteSpecification):
+
+	def __init__(self, note_id, pitch, start_time, duration, velocity=100, mute=False, **k):
+		MidiNoteSpecification.__init__(self, pitch, start_time, duration, velocity, mute, **k)
+		self.note_id = note_id
+
+
+def _in(value, start, span):
+	return start <= value < start + span
+
+
+class Clip(Subject):
+	""" MIDI clip exposing the Live 9/10 note API.
+
+	Notes are held as (pitch, time, duration, velocity, mute) tuples, the
+	same shape Live hands to scripts. ``stats`` counts how many calls crossed
+	the API boundary and how many notes travelled with them. """
+
+	__listenable__ = ('notes', 'playing_position', 'playing_status', 'loop_start', 'loop_end',
+		'start_marker', 'end_marker', 'name', 'color', 'is_recording', 'muted', 'looping')
+
+	def __init__(self, length=4.0, notes=(), name='Clip', canonical_parent=None):
+		Subject.__init__(self)
+		self.name = name
+		self.color = 0x3D9B2A
+		self.canonical_parent = canonical_parent
+		self.is_midi_clip = True
+		self.is_audio_clip = False
+		self.is_recording = False
+		self.is_triggered = False
+		self.will_record_on_start = False
+		self.is_playing = False
+		self.looping = True
+		self.muted = False
+		self._loop_start = 0.0
+		self._loop_end = float(length)
+		self.start_marker = 0.0
+		self.end_marker = float(length)
+		self._playing_position = 0.0
+		self._notes = [tuple(n) for n in notes]
+		self._selected = []
+		self.reset_stats()
+
+	def reset_stats(self):
+		self.stats = {'calls': 0, 'notes_read': 0, 'notes_written': 0, 'notes_notifications': 0}
+
+	def _count(self, read=0, written=0):
+		self.stats['calls'] += 1
+		self.stats['notes_read'] += read
+		self.stats['notes_written'] += written
+
+	def _notes_changed(self):
+		self.stats['notes_notifications'] += 1
+		self.notify('notes')
+
+	@property
+	def length(self):
+		return self._loop_end - self._loop_start
+
+	def _get_loop_start(self):
+		return self._loop_start
+
+	def _set_loop_start(self, value):
+		self._loop_start = value
+		self.notify('loop_start')
+
+	loop_start = property(_get_loop_start, _set_loop_start)
+
+	def _get_loop_end(self):
+		return self._loop_end
+
+	def _set_loop_end(self, value):
+		self._loop_end = value
+		self.notify('loop_end')
+
+	loop_end = property(_get_loop_end, _set_loop_end)
+
+	def _get_playing_position(self):
+		return self._playing_position
+
+	def _set_playing_position(self, value):
+		self._playing_position = value
+		self.notify('playing_position')
+
+	playing_position = property(_get_playing_position, _set_playing_position)
+
+	def set_playing(self, playing):
+		self.is_playing = playing
+		self.notify('playing_status')
+
+	def _sorted(self, notes):
+		return tuple(sorted(notes, key=lambda n: (n[1], n[0])))
+
+	# Live 9/10 note API
+
+	def select_all_notes(self):
+		self.stats['calls'] += 1
+		self._selected = list(range(len(self._notes)))
+
+	def deselect_all_notes(self):
+		self.stats['calls'] += 1
+		self._selected = []
+
+	def get_selected_notes(self):
+		notes = self._sorted([self._notes[i] for i in self._selected])
+		self._count(read=len(notes))
+		return notes
+
+	def replace_selected_notes(self, notes):
+		notes = [tuple(n) for n in notes]
+		self._count(written=len(notes))
+		selected = set(self._selected)
+		self._notes = [n for i, n in enumerate(self._notes) if i not in selected] + notes
+		self._selected = list(range(len(self._notes) - len(notes), len(self._notes)))
+		self._notes_changed()
+
+	def set_notes(self, notes):
+		notes = [tuple(n) for n in notes]
+		self._count(written=len(notes))
+		self._notes.extend(notes)
+		self._notes_changed()
+
+	def get_notes(self, from_time, from_pitch, time_span, pitch_span):
+		notes = self._sorted([n for n in self._notes if _in(n[1], from_time, time_span) and _in(n[0], from_pitch, pitch_span)])
+		self._count(read=len(notes))
+		return notes
+
+	def remove_notes(self, from_time, from_pitch, time_span, pitch_span):
+		self._count()
+		before = len(self._notes)
+		self._notes = [n for n in self._notes if not (_in(n[1], from_time, time_span) and _in(n[0], from_pitch, pitch_span))]
+		self._selected = []
+		if len(self._notes) != before:
+			self._notes_changed()
+
+	def fire(self):
+		self.is_triggered = True
+
+	def stop(self):
+		self.is_playing = False
+		self.is_triggered = False
+
+
+class Clip11(Clip):
+	""" MIDI clip that additionally exposes the Live 11 extended note API. """
+
+	def __init__(self, *a, **k):
+		Clip.__init__(self, *a, **k)
+		self._ids = list(range(1, len(self._notes) + 1))
+		self._next_id = len(self._notes) + 1
+
+	def _new_ids(self, count):
+		ids = list(range(self._next_id, self._next_id + count))
+		self._next_id += count
+		return ids
+
+	def replace_selected_notes(self, notes):
+		selected = set(self._selected)
+		self._ids = [n for i, n in enumerate(self._ids) if i not in selected] + self._new_ids(len(notes))
+		Clip.replace_selected_notes(self, notes)
+
+	def set_notes(self, notes):
+		self._ids.extend(self._new_ids(len(notes)))
+		Clip.set_notes(self, notes)
+
+	def remove_notes(self, from_time, from_pitch, time_span, pitch_span):
+		keep = [not (_in(n[1], from_time, time_span) and _in(n[0], from_pitch, pitch_span)) for n in self._notes]
+		self._ids = [i for i, k in zip(self._ids, keep) if k]
+		Clip.remove_notes(self, from_time, from_pitch, time_span, pitch_span)
+
+	def _as_midi_notes(self, pairs):
+		return tuple(MidiNote(i, n[0], n[1], n[2], n[3], n[4]) for i, n in sorted(pairs, key=lambda p: (p[1][1], p[1][0])))
+
+	def get_notes_extended(self, from_pitch, pitch_span, from_time, time_span):
+		notes = self._as_midi_notes([(i, n) for i, n in zip(self._ids, self._notes) if _in(n[1], from_time, time_span) and _in(n[0], from_pitch, pitch_span)])
+		self._count(read=len(notes))
+		return notes
+
+	def get_all_notes_extended(self):
+		notes = self._as_midi_notes(list(zip(self._ids, self._notes)))
+		self._count(read=len(notes))
+		return notes
+
+	def remove_notes_extended(self, from_pitch, pitch_span, from_time, time_span):
+		self.remove_notes(from_time, from_pitch, time_span, pitch_span)
+
+	def remove_notes_by_id(self, ids):
+		ids = set(ids)
+		self._count()
+		keep = [i not in ids for i in self._ids]
+		self._notes = [n for n, k in zip(self._notes, keep) if k]
+		self._ids = [i for i, k in zip(self._ids, keep) if k]
+		self._selected = []
+		self._notes_changed()
+
+	def add_new_notes(self, specs):
+		specs = list(specs)
+		self._count(written=len(specs))
+		ids = self._new_ids(len(specs))
+		self._notes.extend((s.pitch, s.start_time, s.duration, s.velocity, s.mute) for s in specs)
+		self._ids.extend(ids)
+		self._notes_changed()
+		return tuple(ids)
+
+	def apply_note_modifications(self, notes):
+		notes = list(notes)
+		self._count(written=len(notes))
+		index = dict((note_id, i) for i, note_id in enumerate(self._ids))
+		for note in notes:
+			i = index.get(note.note_id)
+			if i is not None:
+				self._notes[i] = (note.pitch, note.start_time, note.duration, note.velocity, note.mute)
+		self._notes_changed()
@@ -0,0 +1,58 @@
+from .Base import Subject
+from .Clip import Clip
+
+
+class ClipSlot(Subject):
+	__listenable__ = ('has_clip', 'is_triggered', 'playing_status', 'color', 'controls_other_clips', 'has_stop_button')
+
+	clip_class = Clip
+
+	def __init__(self, canonical_parent=None):
+		Subject.__init__(self)
+		self.canonical_parent = canonical_parent
+		self.clip = None
+		self.has_stop_button = True
+		self.controls_other_clips = False
+		self.is_triggered = False
+		self.is_playing = False
+		self.is_recording = False
+		self.will_record_on_start = False
+		self.playing_status = 0
+		self.color = None
+
+	@property
+	def has_clip(self):
+		return self.clip is not None
+
+	@property
+	def name(self):
+		return self.clip.name if self.clip is not None else ''
+
+	def set_clip(self, clip):
+		clip.canonical_parent = self
+		self.clip = clip
+		self.notify('has_clip')
+		return clip
+
+	def create_clip(self, length):
+		assert self.clip is None
+		return self.set_clip(self.clip_class(length))
+
+	def delete_clip(self):
+		self.clip = None
+		self.notify('has_clip')
+
+	def fire(self, *a, **k):
+		self.is_triggered = True
+		track = self.canonical_parent
+		if track is not None:
+			track.fire_slot(track.clip_slots.index(self))
+
+	def stop(self):
+		self.is_triggered = False
+		track = self.canonical_parent
+		if track is not None:
+			track.stop_all_clips()
+
+	def set_fire_button_state(self, state):
+		pass
@@ -0,0 +1,96 @@
+from .Base import Subject
+from .DeviceParameter import DeviceParameter
+from .DrumPad import DrumPad
+from .Chain import Chain
+
+
+class DeviceType(object):
+	undefined = 0
+	instrument = 1
+	audio_effect = 2
+	midi_effect = 4
+
+
+class View(Subject):
+	__listenable__ = ('selected_drum_pad', 'selected_chain', 'is_collapsed')
+
+	def __init__(self, device):
+		Subject.__init__(self)
+		self.canonical_parent = device
+		self._selected_drum_pad = None
+		self.selected_chain = None
+		self.is_collapsed = False
+
+	def _get_selected_drum_pad(self):
+		return self._selected_drum_pad
+
+	def _set_selected_drum_pad(self, pad):
+		self._selected_drum_pad = pad
+		self.notify('selected_drum_pad')
+
+	selected_drum_pad = property(_get_selected_drum_pad, _set_selected_drum_pad)
+
+
+class Device(Subject):
+	__listenable__ = ('name', 'parameters', 'drum_pads', 'chains', 'visible_drum_pads')
+
+	def __init__(self, name='Device', class_name='Operator', type=DeviceType.instrument, num_parameters=16, canonical_parent=None):
+		Subject.__init__(self)
+		self.name = name
+		self.class_name = class_name
+		self.class_display_name = class_name
+		self.type = type
+		self.canonical_parent = canonical_parent
+		self.parameters = [DeviceParameter('Device On', 1.0, 0.0, 1.0, True, self)] + [
+			DeviceParameter('%s %d' % (name, i + 1), 0.0, 0.0, 1.0, False, self) for i in range(num_parameters)]
+		self.can_have_chains = False
+		self.can_have_drum_pads = False
+		self.has_drum_pads = False
+		self.drum_pads = []
+		self.chains = []
+		self.view = View(self)
+
+	def store_chosen_bank(self, *a):
+		pass
+
+
+class RackDevice(Device):
+
+	def __init__(self, name='Rack', class_name='InstrumentGroupDevice', type=DeviceType.instrument, chains=None, **k):
+		Device.__init__(self, name=name, class_name=class_name, type=type, num_parameters=8, **k)
+		self.can_have_chains = True
+		self.chains = list(chains or [])
+		for chain in self.chains:
+			chain.canonical_parent = self
+
+	def set_chains(self, chains):
+		self.chains = list(chains)
+		self.notify('chains')
+
+
+class DrumRackDevice(RackDevice):
+
+	def __init__(self, name='Drum Rack', filled_notes=range(36, 52), **k):
+		RackDevice.__init__(self, name=name, class_name='DrumGroupDevice', **k)
+		self.can_have_drum_pads = True
+		self.has_drum_pads = True
+		self.drum_pads = [DrumPad(note, self) for note in range(128)]
+		for note in filled_notes:
+			self.fill_pad(note, notify=False)
+		self.view.selected_drum_pad = self.drum_pads[36]
+
+	def fill_pad(self, note, notify=True):
+		chain = Chain('Chain %d' % note, [Device('Simpler', 'OriginalSimpler')], self.drum_pads[note])
+		self.chains.append(chain)
+		self.drum_pads[note].chains = [chain]
+		if notify:
+			self.drum_pads[note].notify('chains')
+			self.notify('chains')
+
+	def clear_pad(self, note, notify=True):
+		for chain in self.drum_pads[note].chains:
+			self.chains.remove(chain)
+		self.drum_pads[note].chains = []
+		if notify:
+			self.drum_pads[note].notify('chains')
+			self.notify('chains')
@@ -0,0 +1,29 @@
+from .Base import Subject
+
+
+class DeviceParameter(Subject):
+	__listenable__ = ('value', 'name')
+
+	def __init__(self, name='Param', value=0.0, min=0.0, max=1.0, is_quantized=False, canonical_parent=None):
+		Subject.__init__(self)
+		self.name = name
+		self._value = value
+		self.min = min
+		self.max = max
+		self.default_value = value
+		self.is_quantized = is_quantized
+		self.is_enabled = True
+		self.canonical_parent = canonical_parent
+
+	def _get_value(self):
+		return self._value
+
+	def _set_value(self, value):
+		if value != self._value:
+			self._value = value
+			self.notify('value')
+
+	value = property(_get_value, _set_value)
+
+	def __str__(self):
+		return str(self._value)
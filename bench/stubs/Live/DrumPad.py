@@ -0,0 +1,18 @@
+from .Base import Subject
+
+
+class DrumPad(Subject):
+	__listenable__ = ('chains', 'name', 'mute', 'solo')
+
+	def __init__(self, note, canonical_parent=None):
+		Subject.__init__(self)
+		self.note = note
+		self.name = 'Pad %d' % note
+		self.mute = False
+		self.solo = False
+		self.chains = []
+		self.canonical_parent = canonical_parent
+
+	def set_chains(self, chains):
+		self.chains = list(chains)
+		self.notify('chains')
@@ -0,0 +1,21 @@
+from .Base import Subject
+
+
+class Scene(Subject):
+	__listenable__ = ('name', 'color', 'is_triggered')
+
+	def __init__(self, song, index):
+		Subject.__init__(self)
+		self.canonical_parent = song
+		self.name = 'Scene %d' % (index + 1)
+		self.color = 0
+		self.is_triggered = False
+
+	@property
+	def clip_slots(self):
+		index = list(self.canonical_parent.scenes).index(self)
+		return [t.clip_slots[index] for t in self.canonical_parent.tracks]
+
+	def fire(self, *a, **k):
+		for slot in self.clip_slots:
+			slot.fire()
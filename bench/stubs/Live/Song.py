@@ -0,0 +1,109 @@
+from .Base import Subject, observable
+from .Scene import Scene
+from .Track import Track
+
+
+class View(Subject):
+	__listenable__ = ('selected_track', 'selected_scene', 'detail_clip', 'selected_parameter', 'selected_chain')
+
+	selected_track = observable('selected_track')
+	selected_scene = observable('selected_scene')
+	detail_clip = observable('detail_clip')
+
+	def __init__(self, song):
+		Subject.__init__(self)
+		self.canonical_parent = song
+		self.selected_parameter = None
+		self.follow_song = False
+		self.draw_mode = True
+
+	@property
+	def highlighted_clip_slot(self):
+		song = self.canonical_parent
+		track = self.selected_track
+		if track in song.tracks:
+			return track.clip_slots[list(song.scenes).index(self.selected_scene)]
+		return None
+
+	def select_device(self, device, *a):
+		track = device.canonical_parent
+		while track is not None and not isinstance(track, Track):
+			track = getattr(track, 'canonical_parent', None)
+		if track is not None:
+			track.view.selected_device = device
+			self.selected_track = track
+		self.canonical_parent.appointed_device = device
+
+
+class Song(Subject):
+	__listenable__ = ('tracks', 'visible_tracks', 'return_tracks', 'scenes', 'is_playing', 'session_record',
+		'session_record_status', 'swing_amount', 'metronome', 'appointed_device', 'tempo', 'record_mode',
+		'overdub', 'can_undo', 'can_redo', 'midi_recording_quantization', 'current_song_time',
+		'signature_numerator', 'signature_denominator', 'nudge_down', 'nudge_up', 'loop')
+
+	is_playing = observable('is_playing', False)
+	session_record = observable('session_record', False)
+	swing_amount = observable('swing_amount', 0.0)
+	metronome = observable('metronome', False)
+	appointed_device = observable('appointed_device')
+	midi_recording_quantization = observable('midi_recording_quantization', 0)
+
+	def __init__(self, num_tracks=8, num_scenes=8, num_returns=2):
+		Subject.__init__(self)
+		self.tempo = 120.0
+		self.signature_numerator = 4
+		self.signature_denominator = 4
+		self.current_song_time = 0.0
+		self.session_record_status = 0
+		self.record_mode = False
+		self.overdub = False
+		self.can_undo = True
+		self.can_redo = False
+		self.scenes = [Scene(self, i) for i in range(num_scenes)]
+		self.tracks = [Track(self, 'Track %d' % (i + 1), num_scenes, num_sends=num_returns) for i in range(num_tracks)]
+		self.return_tracks = [Track(self, 'Return %s' % chr(65 + i), 0, False, num_returns) for i in range(num_returns)]
+		self.master_track = Track(self, 'Master', 0, False, 0)
+		self.view = View(self)
+		self.view.selected_track = self.tracks[0] if self.tracks else None
+		self.view.selected_scene = self.scenes[0] if self.scenes else None
+
+	@property
+	def visible_tracks(self):
+		return self.tracks
+
+	def create_scene(self, index=-1):
+		index = len(self.scenes) if index < 0 else index
+		self.scenes.insert(index, Scene(self, index))
+		for track in self.tracks:
+			track.clip_slots.insert(index, type(track.clip_slots[0])(track) if track.clip_slots else None)
+			track.notify('clip_slots')
+		self.notify('scenes')
+		return self.scenes[index]
+
+	def create_midi_track(self, index=-1):
+		index = len(self.tracks) if index < 0 else index
+		track = Track(self, 'Track %d' % (len(self.tracks) + 1), len(self.scenes), num_sends=len(self.return_tracks))
+		self.tracks.insert(index, track)
+		self.notify('tracks')
+		self.notify('visible_tracks')
+		return track
+
+	def delete_track(self, index):
+		track = self.tracks.pop(index)
+		if self.view.selected_track is track:
+			self.view.selected_track = self.tracks[min(index, len(self.tracks) - 1)]
+		self.notify('tracks')
+		self.notify('visible_tracks')
+
+	def undo(self):
+		pass
+
+	def redo(self):
+		pass
+
+	def stop_all_clips(self, *a):
+		for track in self.tracks:
+			track.stop_all_clips()
+
+	def get_beats_loop_length(self):
+		return 4.0
@@ -0,0 +1,108 @@
+from .Base import Subject, observable
+from .ClipSlot import ClipSlot
+from .DeviceParameter import DeviceParameter
+
+
+class MixerDevice(Subject):
+	__listenable__ = ('sends', 'crossfade_assign')
+
+	def __init__(self, track, num_sends=2):
+		Subject.__init__(self)
+		self.canonical_parent = track
+		self.volume = DeviceParameter('Track Volume', 0.85, 0.0, 1.0, False, self)
+		self.panning = DeviceParameter('Track Panning', 0.0, -1.0, 1.0, False, self)
+		self.track_activator = DeviceParameter('Speaker On', 1.0, 0.0, 1.0, True, self)
+		self.sends = [DeviceParameter('Send %s' % chr(65 + i), 0.0, 0.0, 1.0, False, self) for i in range(num_sends)]
+		self.crossfade_assign = 1
+
+
+class View(Subject):
+	__listenable__ = ('selected_device', 'is_collapsed')
+
+	selected_device = observable('selected_device')
+
+	def __init__(self, track):
+		Subject.__init__(self)
+		self.canonical_parent = track
+		self.is_collapsed = False
+
+	def select_instrument(self):
+		for device in self.canonical_parent.devices:
+			self.selected_device = device
+			return True
+		return False
+
+
+class Track(Subject):
+	__listenable__ = ('arm', 'implicit_arm', 'mute', 'solo', 'name', 'color', 'devices', 'clip_slots',
+		'playing_slot_index', 'fired_slot_index', 'current_monitoring_state', 'output_meter_level',
+		'input_routing_type', 'is_frozen', 'muted_via_solo')
+
+	arm = observable('arm', False)
+	implicit_arm = observable('implicit_arm', False)
+	mute = observable('mute', False)
+	solo = observable('solo', False)
+	playing_slot_index = observable('playing_slot_index', -1)
+	fired_slot_index = observable('fired_slot_index', -1)
+
+	def __init__(self, song, name='Track', num_slots=8, is_midi=True, num_sends=2):
+		Subject.__init__(self)
+		self.canonical_parent = song
+		self.name = name
+		self.color = 0x1AFF2F
+		self.has_midi_input = is_midi
+		self.has_audio_input = not is_midi
+		self.has_midi_output = not is_midi
+		self.can_be_armed = True
+		self.is_foldable = False
+		self.is_grouped = False
+		self.is_frozen = False
+		self.is_visible = True
+		self.muted_via_solo = False
+		self.current_monitoring_state = 1
+		self.output_meter_level = 0.0
+		self.clip_slots = [ClipSlot(self) for _ in range(num_slots)]
+		self.devices = []
+		self.view = View(self)
+		self.mixer_device = MixerDevice(self, num_sends)
+
+	def set_devices(self, devices):
+		self.devices = list(devices)
+		for device in self.devices:
+			device.canonical_parent = self
+		self.notify('devices')
+		if self.view.selected_device not in self.devices:
+			self.view.selected_device = self.devices[0] if self.devices else None
+
+	def add_clip_slot(self):
+		self.clip_slots.append(ClipSlot(self))
+		self.notify('clip_slots')
+
+	def duplicate_clip_slot(self, index):
+		source = self.clip_slots[index]
+		target = index + 1
+		song = self.canonical_parent
+		if target >= len(self.clip_slots) or self.clip_slots[target].has_clip:
+			song.create_scene(target)
+		clip = source.clip
+		copy = type(clip)(clip.length, clip._notes, clip.name)
+		self.clip_slots[target].set_clip(copy)
+		return target
+
+	def fire_slot(self, index):
+		self.fired_slot_index = index
+
+	def stop_all_clips(self, *a):
+		self.fired_slot_index = -2
+
+	def start_fired_clip(self):
+		""" Called by the harness to emulate Live's launch quantization. """
+		index = self.fired_slot_index
+		if index >= 0:
+			for i, slot in enumerate(self.clip_slots):
+				if slot.clip is not None:
+					slot.clip.set_playing(i == index)
+			self.playing_slot_index = index
+		elif index == -2:
+			self.playing_slot_index = -1
+		self.fired_slot_index = -1
@@ -0,0 +1,17 @@
+# Headless stand-in for Ableton Live's embedded ``Live`` module.
+#
+# Only the parts of the Live Object Model that Launchpad95 touches are
+# modelled here. Objects are plain Python so benchmarks can build songs of
+# arbitrary size without a running Live instance.
+
+from . import Base
+from . import DeviceParameter
+from . import Chain
+from . import DrumPad
+from . import Device
+from . import Clip
+from . import ClipSlot
+from . import Scene
+from . import Track
+from . import Song
+from . import Application
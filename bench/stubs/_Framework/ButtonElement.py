@@ -0,0 +1,88 @@
+from .InputControlElement import InputControlElement
+from .Skin import Skin
+from .Util import in_range
+
+
+class _OnValue(object):
+	pass
+
+
+class _OffValue(object):
+	pass
+
+
+ON_VALUE = _OnValue()
+OFF_VALUE = _OffValue()
+
+
+class Color(object):
+
+	def __init__(self, midi_value=0, *a, **k):
+		self._midi_value = midi_value
+
+	@property
+	def midi_value(self):
+		return self._midi_value
+
+	def __int__(self):
+		return self._midi_value
+
+	def __eq__(self, other):
+		return isinstance(other, Color) and self.midi_value == other.midi_value
+
+	def __ne__(self, other):
+		return not self == other
+
+	def __hash__(self):
+		return hash(self._midi_value)
+
+	def draw(self, interface):
+		interface.send_value(self.midi_value)
+
+
+class ButtonElement(InputControlElement):
+
+	def __init__(self, is_momentary, msg_type, channel, identifier, skin=None, *a, **k):
+		InputControlElement.__init__(self, msg_type, channel, identifier, *a, **k)
+		self._is_momentary = bool(is_momentary)
+		self._skin = skin if skin is not None else Skin()
+
+	def is_momentary(self):
+		return self._is_momentary
+
+	def is_pressed(self):
+		return self._is_momentary and self._last_received_value > 0
+
+	def set_light(self, value):
+		if isinstance(value, int) and not isinstance(value, bool) and in_range(value, 0, 128):
+			self.send_value(value)
+		elif isinstance(value, bool):
+			self._set_skin_light('DefaultButton.On' if value else 'DefaultButton.Off')
+		else:
+			self._set_skin_light(value)
+
+	def _set_skin_light(self, value):
+		self._skin[value].draw(self)
+
+	def turn_on(self):
+		self.send_value(ON_VALUE)
+
+	def turn_off(self):
+		self.send_value(OFF_VALUE)
+
+	def reset(self):
+		self.send_value(0)
+
+	def send_value(self, value, **k):
+		if value is ON_VALUE:
+			self._do_send_on_value()
+		elif value is OFF_VALUE:
+			self._do_send_off_value()
+		else:
+			InputControlElement.send_value(self, value, **k)
+
+	def _do_send_on_value(self):
+		InputControlElement.send_value(self, 127)
+
+	def _do_send_off_value(self):
+		InputControlElement.send_value(self, 0)
@@ -0,0 +1,57 @@
+class ButtonMatrixElement(object):
+
+	def __init__(self, rows=(), *a, **k):
+		self.name = ''
+		self._buttons = []
+		self._value_listeners = []
+		for row in rows:
+			self.add_row(row)
+
+	def add_row(self, buttons):
+		y = len(self._buttons)
+		self._buttons.append(list(buttons))
+		for x, button in enumerate(buttons):
+			button.add_value_listener(self._make_forwarder(button, x, y))
+
+	def _make_forwarder(self, button, x, y):
+		return lambda value: self._button_value(value, x, y, button)
+
+	def _button_value(self, value, x, y, button):
+		for callback in list(self._value_listeners):
+			callback(value, x, y, button.is_momentary())
+
+	def width(self):
+		return len(self._buttons[0]) if self._buttons else 0
+
+	def height(self):
+		return len(self._buttons)
+
+	def get_button(self, column, row):
+		return self._buttons[row][column]
+
+	def iterbuttons(self):
+		for y, row in enumerate(self._buttons):
+			for x, button in enumerate(row):
+				yield button, (x, y)
+
+	def __iter__(self):
+		for row in self._buttons:
+			for button in row:
+				yield button
+
+	def add_value_listener(self, callback, identify_sender=False):
+		assert callback not in self._value_listeners
+		self._value_listeners.append(callback)
+
+	def remove_value_listener(self, callback):
+		self._value_listeners.remove(callback)
+
+	def value_has_listener(self, callback):
+		return callback in self._value_listeners
+
+	def send_value(self, column, row, value, force=False):
+		self._buttons[row][column].send_value(value, force=force)
+
+	def reset(self):
+		for button in self:
+			button.reset()
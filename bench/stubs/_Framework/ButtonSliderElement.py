@@ -0,0 +1,70 @@
+class ButtonSliderElement(object):
+	""" A row of buttons acting as one slider for a parameter. """
+
+	def __init__(self, buttons, *a, **k):
+		self.name = ''
+		self._buttons = buttons
+		self._parameter_to_map_to = None
+		self._last_sent_value = -1
+		self._value_listeners = []
+		for button in self._buttons:
+			button.add_value_listener(self._button_value, identify_sender=True)
+
+	def disconnect(self):
+		self.release_parameter()
+		for button in self._buttons:
+			button.remove_value_listener(self._button_value)
+		self._buttons = None
+
+	def message_map_mode(self):
+		return 0
+
+	def connect_to(self, parameter):
+		if parameter != self._parameter_to_map_to:
+			self.release_parameter()
+			self._parameter_to_map_to = parameter
+			if parameter is not None:
+				parameter.add_value_listener(self._on_parameter_changed)
+				self._on_parameter_changed()
+
+	def release_parameter(self):
+		if self._parameter_to_map_to is not None:
+			self._parameter_to_map_to.remove_value_listener(self._on_parameter_changed)
+		self._parameter_to_map_to = None
+
+	def mapped_parameter(self):
+		return self._parameter_to_map_to
+
+	def add_value_listener(self, callback, identify_sender=False):
+		self._value_listeners.append(callback)
+
+	def remove_value_listener(self, callback):
+		self._value_listeners.remove(callback)
+
+	def value_has_listener(self, callback):
+		return callback in self._value_listeners
+
+	def notify_value(self, value):
+		for callback in list(self._value_listeners):
+			callback(value)
+
+	def send_value(self, value):
+		index_to_light = value * len(self._buttons) // 128
+		for index, button in enumerate(self._buttons):
+			if index <= index_to_light:
+				button.turn_on()
+			else:
+				button.turn_off()
+		self._last_sent_value = value
+
+	def reset(self):
+		for button in self._buttons:
+			button.reset()
+
+	def _button_value(self, value, sender):
+		pass
+
+	def _on_parameter_changed(self):
+		param = self._parameter_to_map_to
+		param_range = param.max - param.min
+		self.send_value(int(127 * (param.value - param.min) / param_range) if param_range else 0)
@@ -0,0 +1,28 @@
+CONTROLLER_ID_KEY = 'controller_id'
+PORTS_KEY = 'ports'
+TYPE_KEY = 'surface_type'
+VENDORID = 'vendor_id'
+PRODUCTIDS = 'product_ids'
+MODEL_NAMES = 'model_names'
+DIRECTIONKEY = 'direction'
+PORTNAMEKEY = 'name'
+MACNAMEKEY = 'mac_name'
+PROPSKEY = 'props'
+HIDDEN = 'hidden'
+SYNC = 'sync'
+SCRIPT = 'script'
+NOTES_CC = 'notes_cc'
+REMOTE = 'remote'
+PLAIN_OLD_MIDI = 'plain_old_midi'
+
+
+def controller_id(vendor_id, product_ids, model_name):
+	return {VENDORID: vendor_id, PRODUCTIDS: product_ids, MODEL_NAMES: model_name}
+
+
+def inport(name='', props=()):
+	return {DIRECTIONKEY: 'in', PORTNAMEKEY: name, PROPSKEY: props}
+
+
+def outport(name='', props=()):
+	return {DIRECTIONKEY: 'out', PORTNAMEKEY: name, PROPSKEY: props}
@@ -0,0 +1,133 @@
+from .ControlSurfaceComponent import ControlSurfaceComponent
+
+
+class ChannelStripComponent(ControlSurfaceComponent):
+	""" Mute/solo/arm feedback and parameter mapping for a single track. """
+
+	def __init__(self, *a, **k):
+		ControlSurfaceComponent.__init__(self, *a, **k)
+		self._track = None
+		self._mute_button = None
+		self._solo_button = None
+		self._arm_button = None
+		self._select_button = None
+		self._volume_control = None
+		self._pan_control = None
+		self._send_controls = None
+		self._invert_mute_feedback = False
+
+	def disconnect(self):
+		self.set_track(None)
+		for name in ('mute', 'solo', 'arm'):
+			self._set_button(name, None)
+		ControlSurfaceComponent.disconnect(self)
+
+	def _track_listeners(self):
+		return (('mute', self._on_mute_changed), ('solo', self._on_solo_changed), ('arm', self._on_arm_changed))
+
+	def set_track(self, track):
+		if self._track is not None:
+			for event, callback in self._track_listeners():
+				if getattr(self._track, '%s_has_listener' % event)(callback):
+					getattr(self._track, 'remove_%s_listener' % event)(callback)
+		self._track = track
+		if self._track is not None:
+			for event, callback in self._track_listeners():
+				getattr(self._track, 'add_%s_listener' % event)(callback)
+		self.update()
+
+	def _set_button(self, name, button):
+		attr = '_%s_button' % name
+		callback = getattr(self, '_%s_value' % name)
+		old = getattr(self, attr)
+		if old is not None:
+			old.remove_value_listener(callback)
+		setattr(self, attr, button)
+		if button is not None:
+			button.add_value_listener(callback)
+		self.update()
+
+	def set_mute_button(self, button):
+		self._set_button('mute', button)
+
+	def set_solo_button(self, button):
+		self._set_button('solo', button)
+
+	def set_arm_button(self, button):
+		self._set_button('arm', button)
+
+	def set_volume_control(self, control):
+		if control is not self._volume_control:
+			if self._volume_control is not None:
+				self._volume_control.release_parameter()
+			self._volume_control = control
+			self.update()
+
+	def set_pan_control(self, control):
+		if control is not self._pan_control:
+			if self._pan_control is not None:
+				self._pan_control.release_parameter()
+			self._pan_control = control
+			self.update()
+
+	def set_send_controls(self, controls):
+		self._send_controls = controls
+		self.update()
+
+	def update(self):
+		if self._allow_updates:
+			if self.is_enabled() and self._track is not None:
+				mixer = self._track.mixer_device
+				if self._volume_control is not None:
+					self._volume_control.connect_to(mixer.volume)
+				if self._pan_control is not None:
+					self._pan_control.connect_to(mixer.panning)
+				if self._send_controls is not None:
+					for control, send in zip(self._send_controls, mixer.sends):
+						if control is not None:
+							control.connect_to(send)
+			else:
+				for control in (self._volume_control, self._pan_control):
+					if control is not None:
+						control.release_parameter()
+				for control in self._send_controls or ():
+					if control is not None:
+						control.release_parameter()
+			self._on_mute_changed()
+			self._on_solo_changed()
+			self._on_arm_changed()
+		else:
+			self._update_requests += 1
+
+	def _mute_value(self, value):
+		if self.is_enabled() and self._track is not None and value:
+			self._track.mute = not self._track.mute
+
+	def _solo_value(self, value):
+		if self.is_enabled() and self._track is not None and value:
+			self._track.solo = not self._track.solo
+
+	def _arm_value(self, value):
+		if self.is_enabled() and self._track is not None and self._track.can_be_armed and value:
+			self._track.arm = not self._track.arm
+
+	def _on_mute_changed(self):
+		if self.is_enabled() and self._mute_button is not None:
+			if self._track is not None and self._track.mute == self._invert_mute_feedback:
+				self._mute_button.turn_on()
+			else:
+				self._mute_button.turn_off()
+
+	def _on_solo_changed(self):
+		if self.is_enabled() and self._solo_button is not None:
+			if self._track is not None and self._track.solo:
+				self._solo_button.turn_on()
+			else:
+				self._solo_button.turn_off()
+
+	def _on_arm_changed(self):
+		if self.is_enabled() and self._arm_button is not None:
+			if self._track is not None and self._track.can_be_armed and self._track.arm:
+				self._arm_button.turn_on()
+			else:
+				self._arm_button.turn_off()
@@ -0,0 +1,120 @@
+from .ControlSurfaceComponent import ControlSurfaceComponent
+from .SubjectSlot import subject_slot
+from .Util import in_range
+
+
+class ClipSlotComponent(ControlSurfaceComponent):
+	""" Launch button feedback for one clip slot. """
+
+	def __init__(self, *a, **k):
+		ControlSurfaceComponent.__init__(self, *a, **k)
+		self._clip_slot = None
+		self._triggered_to_play_value = 126
+		self._triggered_to_record_value = 121
+		self._started_value = 127
+		self._recording_value = 120
+		self._stopped_value = 0
+		self._record_button_value = None
+		self._clip_palette = {}
+		self._clip_rgb_table = None
+		self._has_fired_slot = False
+
+	def disconnect(self):
+		self.set_clip_slot(None)
+		self._launch_button_value.subject = None
+		ControlSurfaceComponent.disconnect(self)
+
+	def set_clip_slot(self, clip_slot):
+		if clip_slot is not self._clip_slot:
+			for subject, event in self._observed():
+				if getattr(subject, '%s_has_listener' % event)(self.update):
+					getattr(subject, 'remove_%s_listener' % event)(self.update)
+			self._clip_slot = clip_slot
+			for subject, event in self._observed():
+				getattr(subject, 'add_%s_listener' % event)(self.update)
+		self.update()
+
+	def _observed(self):
+		slot = self._clip_slot
+		if slot is None:
+			return []
+		observed = [(slot, 'has_clip'), (slot, 'playing_status'), (slot, 'is_triggered')]
+		if slot.clip is not None:
+			observed += [(slot.clip, 'playing_status'), (slot.clip, 'color')]
+		return observed
+
+	def set_launch_button(self, button):
+		self._launch_button_value.subject = button
+		self.update()
+
+	def set_triggered_to_play_value(self, value):
+		self._triggered_to_play_value = value
+
+	def set_triggered_to_record_value(self, value):
+		self._triggered_to_record_value = value
+
+	def set_started_value(self, value):
+		self._started_value = value
+
+	def set_recording_value(self, value):
+		self._recording_value = value
+
+	def set_stopped_value(self, value):
+		self._stopped_value = value
+
+	def set_record_button_value(self, value):
+		self._record_button_value = value
+
+	def set_clip_palette(self, palette):
+		self._clip_palette = palette
+
+	def set_clip_rgb_table(self, rgb_table):
+		self._clip_rgb_table = rgb_table
+
+	def has_clip(self):
+		return self._clip_slot is not None and self._clip_slot.has_clip
+
+	def _track_is_armed(self, track):
+		return track is not None and track.can_be_armed and (track.arm or track.implicit_arm)
+
+	def _color_value(self, color):
+		if color in self._clip_palette:
+			return self._clip_palette[color]
+		if self._clip_rgb_table:
+			return min(self._clip_rgb_table, key=lambda entry: abs(entry[1] - color))[0]
+		return None
+
+	def update(self):
+		self._has_fired_slot = False
+		button = self._launch_button_value.subject
+		if self._allow_updates:
+			if self.is_enabled() and button is not None:
+				value = self._feedback_value()
+				if value in (None, -1):
+					button.turn_off()
+				elif in_range(value, 0, 128):
+					button.send_value(value)
+				else:
+					button.set_light(value)
+		else:
+			self._update_requests += 1
+
+	def _feedback_value(self):
+		if self._clip_slot is None:
+			return None
+		track = self._clip_slot.canonical_parent
+		slot_or_clip = self._clip_slot.clip if self.has_clip() else self._clip_slot
+		if slot_or_clip.is_triggered:
+			return self._triggered_to_record_value if slot_or_clip.will_record_on_start else self._triggered_to_play_value
+		if slot_or_clip.is_playing:
+			return self._recording_value if slot_or_clip.is_recording else self._started_value
+		if self.has_clip():
+			return self._stopped_value
+		if self._track_is_armed(track) and self._clip_slot.has_stop_button and self._record_button_value is not None:
+			return self._record_button_value
+		return None
+
+	@subject_slot('value')
+	def _launch_button_value(self, value):
+		if self.is_enabled() and self._clip_slot is not None and value:
+			self._clip_slot.fire()
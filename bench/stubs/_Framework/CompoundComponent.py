@@ -0,0 +1,31 @@
+from .ControlSurfaceComponent import ControlSurfaceComponent
+
+
+class CompoundComponent(ControlSurfaceComponent):
+
+	def __init__(self, *a, **k):
+		ControlSurfaceComponent.__init__(self, *a, **k)
+		self._sub_components = []
+
+	def register_components(self, *components):
+		for component in components:
+			self.register_component(component)
+
+	def register_component(self, component):
+		assert component not in self._sub_components
+		self._sub_components.append(component)
+		component._parent_component = self
+		component._set_enabled_recursive(self.is_enabled())
+		return component
+
+	def _on_is_enabled_changed(self):
+		for component in self._sub_components:
+			component._set_enabled_recursive(self.is_enabled())
+
+	def disconnect(self):
+		for component in self._sub_components:
+			component.disconnect()
+		ControlSurfaceComponent.disconnect(self)
+
+	def update(self):
+		pass
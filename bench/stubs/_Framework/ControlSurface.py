@@ -0,0 +1,179 @@
+from contextlib import contextmanager
+
+import Live
+
+
+class ControlSurface(object):
+	""" Owns controls and components, routes MIDI to the c_instance and
+	dispatches song/view notifications to every registered component. """
+
+	_guarded_surfaces = []
+
+	@staticmethod
+	def current_surface():
+		surfaces = ControlSurface._guarded_surfaces
+		return surfaces[-1] if surfaces else None
+
+	@staticmethod
+	def current_application():
+		return Live.Application.get_application()
+
+	@staticmethod
+	def current_song():
+		return Live.Application.get_application().get_document()
+
+	def __init__(self, c_instance, *a, **k):
+		self._c_instance = c_instance
+		self.controls = []
+		self.components = []
+		self._scheduled_messages = []
+		self._tick = 0
+		self._enabled = True
+		self._highlighting_session_component = None
+		self._device_component = None
+		self._controlled_track = None
+		self._feedback_channels = []
+		song = self.song()
+		if song is not None:
+			song.view.add_selected_track_listener(self._on_selected_track_changed)
+			song.view.add_selected_scene_listener(self._on_selected_scene_changed)
+			song.add_tracks_listener(self._on_track_list_changed)
+			song.add_scenes_listener(self._on_scene_list_changed)
+
+	@contextmanager
+	def component_guard(self):
+		ControlSurface._guarded_surfaces.append(self)
+		try:
+			yield
+		finally:
+			ControlSurface._guarded_surfaces.pop()
+
+	def song(self):
+		return ControlSurface.current_song()
+
+	def application(self):
+		return ControlSurface.current_application()
+
+	def instance_identifier(self):
+		return id(self)
+
+	def _register_control(self, control):
+		self.controls.append(control)
+
+	def _register_component(self, component):
+		self.components.append(component)
+
+	def _on_selected_track_changed(self):
+		for component in list(self.components):
+			component.on_selected_track_changed()
+
+	def _on_selected_scene_changed(self):
+		for component in list(self.components):
+			component.on_selected_scene_changed()
+
+	def _on_track_list_changed(self):
+		for component in list(self.components):
+			component.on_track_list_changed()
+
+	def _on_scene_list_changed(self):
+		for component in list(self.components):
+			component.on_scene_list_changed()
+
+	def set_enabled(self, enable):
+		self._enabled = bool(enable)
+		with self.component_guard():
+			for component in self.components:
+				if component._parent_component is None:
+					component._set_enabled_recursive(self._enabled)
+
+	def disconnect(self):
+		song = self.song()
+		if song is not None:
+			song.view.remove_selected_track_listener(self._on_selected_track_changed)
+			song.view.remove_selected_scene_listener(self._on_selected_scene_changed)
+			song.remove_tracks_listener(self._on_track_list_changed)
+			song.remove_scenes_listener(self._on_scene_list_changed)
+		for component in self.components:
+			component.disconnect()
+		for control in self.controls:
+			control.disconnect()
+		self.components = []
+		self.controls = []
+		self._scheduled_messages = []
+
+	def refresh_state(self):
+		pass
+
+	def update_display(self):
+		""" Called by Live roughly every 100ms; runs due scheduled messages. """
+		self._tick += 1
+		due = [m for m in self._scheduled_messages if m[0] <= self._tick]
+		self._scheduled_messages = [m for m in self._scheduled_messages if m[0] > self._tick]
+		with self.component_guard():
+			for _, callback, parameter in due:
+				if parameter is None:
+					callback()
+				else:
+					callback(parameter)
+			for component in self.components:
+				component._tasks.update(0.1)
+
+	def schedule_message(self, delay_in_ticks, callback, parameter=None):
+		assert delay_in_ticks >= 0
+		self._scheduled_messages.append((self._tick + delay_in_ticks, callback, parameter))
+
+	def build_midi_map(self, midi_map_handle):
+		pass
+
+	def request_rebuild_midi_map(self):
+		self._c_instance.request_rebuild_midi_map()
+
+	def handle_sysex(self, midi_bytes):
+		pass
+
+	def receive_midi(self, midi_bytes):
+		pass
+
+	def _send_midi(self, midi_event_bytes, optimized=True):
+		self._c_instance.send_midi(midi_event_bytes)
+		return True
+
+	def _translate_message(self, type, from_identifier, from_channel, to_identifier, to_channel):
+		pass
+
+	def show_message(self, message):
+		self._c_instance.show_message(message)
+
+	def log_message(self, *message):
+		self._c_instance.log_message(' '.join(map(str, message)))
+
+	def set_highlighting_session_component(self, session_component):
+		self._highlighting_session_component = session_component
+
+	def _set_session_highlight(self, track_offset, scene_offset, width, height, include_return_tracks):
+		self._c_instance.set_session_highlight(track_offset, scene_offset, width, height, include_return_tracks)
+
+	def set_device_component(self, device_component):
+		self._device_component = device_component
+
+	def set_feedback_channels(self, channels):
+		self._feedback_channels = list(channels)
+		self._c_instance.set_feedback_channels(channels)
+
+	def set_controlled_track(self, track):
+		self._controlled_track = track
+
+	def release_controlled_track(self):
+		self._controlled_track = None
+
+	def suggest_input_port(self):
+		return ''
+
+	def suggest_output_port(self):
+		return ''
+
+	def can_lock_to_devices(self):
+		return False
+
+	def connect_script_instances(self, instanciated_scripts):
+		pass
@@ -0,0 +1,84 @@
+from .Task import TaskGroup
+
+
+class ControlSurfaceComponent(object):
+	""" Base for all components. Enable state is the conjunction of the
+	component's own flag and its parent's; on_enabled_changed (which updates
+	by default) fires whenever the effective state flips. """
+
+	def __init__(self, name='', is_enabled=True, is_root=False, *a, **k):
+		from .ControlSurface import ControlSurface
+		self.name = name
+		self._explicit_is_enabled = is_enabled
+		self._recursive_is_enabled = True
+		self._is_enabled = is_enabled
+		self._is_root = is_root
+		self._allow_updates = True
+		self._update_requests = 0
+		self._parent_component = None
+		self._tasks = TaskGroup()
+		self._tasks.parent_task = self._tasks
+		self._surface = ControlSurface.current_surface()
+		if self._surface is not None:
+			self._surface._register_component(self)
+
+	def disconnect(self):
+		self._tasks.clear()
+
+	def song(self):
+		from .ControlSurface import ControlSurface
+		return ControlSurface.current_song()
+
+	def application(self):
+		from .ControlSurface import ControlSurface
+		return ControlSurface.current_application()
+
+	def is_enabled(self):
+		return self._is_enabled
+
+	def set_enabled(self, enable):
+		self._explicit_is_enabled = bool(enable)
+		self._update_is_enabled()
+
+	def _set_enabled_recursive(self, enable):
+		self._recursive_is_enabled = bool(enable)
+		self._update_is_enabled()
+
+	def _update_is_enabled(self):
+		is_enabled = self._recursive_is_enabled and self._explicit_is_enabled
+		if is_enabled != self._is_enabled:
+			self._is_enabled = is_enabled
+			self._on_is_enabled_changed()
+			self.on_enabled_changed()
+
+	def _on_is_enabled_changed(self):
+		pass
+
+	def on_enabled_changed(self):
+		self.update()
+
+	def set_allow_update(self, allow_updates):
+		allow = bool(allow_updates)
+		if self._allow_updates != allow:
+			self._allow_updates = allow
+			if self._allow_updates and self._update_requests > 0:
+				self._update_requests = 0
+				self.update()
+
+	def update(self):
+		pass
+
+	def on_track_list_changed(self):
+		pass
+
+	def on_scene_list_changed(self):
+		pass
+
+	def on_selected_track_changed(self):
+		pass
+
+	def on_selected_scene_changed(self):
+		pass
+
+	def control_notifications_enabled(self):
+		return self.is_enabled()
@@ -0,0 +1,90 @@
+from .ControlSurfaceComponent import ControlSurfaceComponent
+
+BANK_SIZE = 8
+
+
+class DeviceComponent(ControlSurfaceComponent):
+	""" Maps banks of eight device parameters onto parameter controls. """
+
+	def __init__(self, *a, **k):
+		ControlSurfaceComponent.__init__(self, *a, **k)
+		self._device = None
+		self._parameter_controls = None
+		self._bank_up_button = None
+		self._bank_down_button = None
+		self._on_off_button = None
+		self._lock_button = None
+		self._locked_to_device = False
+		self._bank_index = 0
+		self._bank_name = '<No Bank>'
+
+	def disconnect(self):
+		self._release_parameters()
+		self._device = None
+		ControlSurfaceComponent.disconnect(self)
+
+	def set_device(self, device):
+		if device != self._device:
+			self._device = device
+			self._bank_index = 0
+			self.update()
+
+	def set_parameter_controls(self, controls):
+		self._release_parameters()
+		self._parameter_controls = controls
+		self.update()
+
+	def set_bank_nav_buttons(self, down_button, up_button):
+		self._bank_down_button = down_button
+		self._bank_up_button = up_button
+
+	def set_on_off_button(self, button):
+		if self._on_off_button is not None:
+			self._on_off_button.remove_value_listener(self._on_off_value)
+		self._on_off_button = button
+		if self._on_off_button is not None:
+			self._on_off_button.add_value_listener(self._on_off_value)
+
+	def set_lock_button(self, button):
+		self._lock_button = button
+
+	def _number_of_parameter_banks(self):
+		if self._device is None:
+			return 0
+		return (len(self._device.parameters) - 1 + BANK_SIZE - 1) // BANK_SIZE
+
+	def _on_off_parameter(self):
+		if self._device is not None:
+			for parameter in self._device.parameters:
+				if parameter.name.startswith('Device On'):
+					return parameter
+		return None
+
+	def _on_off_value(self, value):
+		parameter = self._on_off_parameter()
+		if self.is_enabled() and parameter is not None and parameter.is_enabled and value:
+			parameter.value = float(int(parameter.value == 0.0))
+
+	def _device_parameters_to_map(self):
+		parameters = self._device.parameters[1:]
+		start = self._bank_index * BANK_SIZE
+		return parameters[start:start + BANK_SIZE]
+
+	def _release_parameters(self):
+		if self._parameter_controls is not None:
+			for control in self._parameter_controls:
+				if control is not None:
+					control.release_parameter()
+
+	def update(self):
+		if self._parameter_controls is None:
+			return
+		if self.is_enabled() and self._device is not None:
+			parameters = self._device_parameters_to_map()
+			for index, control in enumerate(self._parameter_controls):
+				if index < len(parameters):
+					control.connect_to(parameters[index])
+				else:
+					control.release_parameter()
+		else:
+			self._release_parameters()
@@ -0,0 +1,129 @@
+MIDI_NOTE_TYPE = 0
+MIDI_CC_TYPE = 1
+MIDI_PB_TYPE = 2
+MIDI_SYSEX_TYPE = 3
+MIDI_INVALID_TYPE = 4
+
+MIDI_NOTE_ON_STATUS = 144
+MIDI_NOTE_OFF_STATUS = 128
+MIDI_CC_STATUS = 176
+MIDI_PB_STATUS = 224
+
+_STATUS = {MIDI_NOTE_TYPE: MIDI_NOTE_ON_STATUS, MIDI_CC_TYPE: MIDI_CC_STATUS, MIDI_PB_TYPE: MIDI_PB_STATUS}
+
+
+class InputControlElement(object):
+	""" MIDI-backed control. Feedback goes through the owning surface's
+	_send_midi, on the control's original channel and identifier, and is
+	suppressed when the same (value, channel) was the last thing sent. """
+
+	def __init__(self, msg_type, channel, identifier, optimized_send_midi=True, *a, **k):
+		from .ControlSurface import ControlSurface
+		self.name = ''
+		self._msg_type = msg_type
+		self._msg_channel = channel
+		self._msg_identifier = identifier
+		self._original_channel = channel
+		self._original_identifier = identifier
+		self._optimized_send_midi = optimized_send_midi
+		self._last_sent_message = None
+		self._force_next_send = False
+		self._value_listeners = []
+		self._last_received_value = -1
+		self.suppress_script_forwarding = False
+		self._surface = ControlSurface.current_surface()
+		if self._surface is not None:
+			self._surface._register_control(self)
+
+	def message_type(self):
+		return self._msg_type
+
+	def message_channel(self):
+		return self._msg_channel
+
+	def message_identifier(self):
+		return self._msg_identifier
+
+	def original_channel(self):
+		return self._original_channel
+
+	def original_identifier(self):
+		return self._original_identifier
+
+	def set_channel(self, channel):
+		self._msg_channel = channel
+
+	def set_identifier(self, identifier):
+		self._msg_identifier = identifier
+
+	def use_default_message(self):
+		self._msg_channel = self._original_channel
+		self._msg_identifier = self._original_identifier
+
+	def add_value_listener(self, callback, identify_sender=False):
+		assert callback not in [l[0] for l in self._value_listeners]
+		self._value_listeners.append((callback, identify_sender))
+
+	def remove_value_listener(self, callback):
+		self._value_listeners = [l for l in self._value_listeners if l[0] != callback]
+
+	def value_has_listener(self, callback):
+		return callback in [l[0] for l in self._value_listeners]
+
+	def value_listener_count(self):
+		return len(self._value_listeners)
+
+	def receive_value(self, value):
+		""" Entry point for incoming MIDI (used by the harness to press pads). """
+		self._last_received_value = value
+		for callback, identify_sender in list(self._value_listeners):
+			if identify_sender:
+				callback(value, self)
+			else:
+				callback(value)
+
+	def clear_send_cache(self):
+		self._last_sent_message = None
+
+	def _status_byte(self, channel):
+		return _STATUS[self._msg_type] + channel
+
+	def send_midi(self, message):
+		if self._surface is None:
+			return False
+		return self._surface._send_midi(message, optimized=self._optimized_send_midi)
+
+	def send_value(self, value, force=False, channel=None):
+		value = int(value)
+		assert 0 <= value < 128
+		if force or self._force_next_send or (value, channel) != self._last_sent_message:
+			status = self._status_byte(self._original_channel if channel is None else channel)
+			if self.send_midi((status, self._original_identifier, value)):
+				self._last_sent_message = (value, channel)
+		self._force_next_send = False
+
+	def set_light(self, value):
+		if isinstance(value, int) and not isinstance(value, bool):
+			self.send_value(value)
+
+	def reset(self):
+		pass
+
+	def reset_state(self):
+		self.use_default_message()
+		self.suppress_script_forwarding = False
+
+	def install_connections(self, *a):
+		return False
+
+	def connect_to(self, parameter):
+		pass
+
+	def release_parameter(self):
+		pass
+
+	def mapped_parameter(self):
+		return None
+
+	def disconnect(self):
+		self._value_listeners = []
@@ -0,0 +1,60 @@
+from .CompoundComponent import CompoundComponent
+from .ChannelStripComponent import ChannelStripComponent
+
+
+class MixerComponent(CompoundComponent):
+	""" A bank of channel strips plus return, master and selected strips. """
+
+	def __init__(self, num_tracks, num_returns=0, *a, **k):
+		CompoundComponent.__init__(self, *a, **k)
+		self._track_offset = -1
+		self._channel_strips = [self.register_component(self._create_strip()) for _ in range(num_tracks)]
+		self._return_strips = [self.register_component(self._create_strip()) for _ in range(num_returns)]
+		self._master_strip = self.register_component(self._create_strip())
+		self._selected_strip = self.register_component(self._create_strip())
+		song = self.song()
+		if song is not None:
+			self._master_strip.set_track(song.master_track)
+			self._selected_strip.set_track(song.view.selected_track)
+		self.set_track_offset(0)
+
+	def _create_strip(self):
+		return ChannelStripComponent()
+
+	def channel_strip(self, index):
+		return self._channel_strips[index]
+
+	def return_strip(self, index):
+		return self._return_strips[index]
+
+	def master_strip(self):
+		return self._master_strip
+
+	def selected_strip(self):
+		return self._selected_strip
+
+	def tracks_to_use(self):
+		return self.song().visible_tracks
+
+	def set_track_offset(self, offset):
+		if offset != self._track_offset:
+			self._track_offset = offset
+			self._reassign_tracks()
+
+	def _reassign_tracks(self):
+		tracks = self.tracks_to_use()
+		for index, strip in enumerate(self._channel_strips):
+			track_index = self._track_offset + index
+			strip.set_track(tracks[track_index] if 0 <= track_index < len(tracks) else None)
+		returns = self.song().return_tracks
+		for index, strip in enumerate(self._return_strips):
+			strip.set_track(returns[index] if index < len(returns) else None)
+
+	def on_track_list_changed(self):
+		self._reassign_tracks()
+
+	def on_selected_track_changed(self):
+		self._selected_strip.set_track(self.song().view.selected_track)
+
+	def update(self):
+		pass
@@ -0,0 +1,74 @@
+from .ControlSurfaceComponent import ControlSurfaceComponent
+
+
+class ModeSelectorComponent(ControlSurfaceComponent):
+	""" Keeps a heap of pressed mode buttons; the topmost one is the mode. """
+
+	def __init__(self, *a, **k):
+		ControlSurfaceComponent.__init__(self, *a, **k)
+		self._modes_buttons = []
+		self._mode_toggle = None
+		self._mode_listeners = []
+		self._mode_index = -1
+		self._modes_heap = []
+
+	def disconnect(self):
+		self._clean_heap()
+		for button in self._modes_buttons:
+			button.remove_value_listener(self._mode_value)
+		self._modes_buttons = []
+		ControlSurfaceComponent.disconnect(self)
+
+	def number_of_modes(self):
+		raise NotImplementedError
+
+	def mode_index(self):
+		return self._mode_index
+
+	def set_mode_buttons(self, buttons):
+		for button in self._modes_buttons:
+			button.remove_value_listener(self._mode_value)
+		self._modes_buttons = []
+		if buttons is not None:
+			for button in buttons:
+				button.add_value_listener(self._mode_value, identify_sender=True)
+				self._modes_buttons.append(button)
+
+	def set_mode_toggle(self, button):
+		self._mode_toggle = button
+
+	def set_mode(self, mode):
+		self._clean_heap()
+		self._modes_heap = [(mode, None, None)]
+		if self._mode_index != mode:
+			self._update_mode()
+
+	def _clean_heap(self):
+		self._modes_heap = []
+
+	def _update_mode(self):
+		mode = self._modes_heap[-1][0] if self._modes_heap else 0
+		if self._mode_index != mode:
+			self._mode_index = mode
+			self.update()
+
+	def _mode_value(self, value, sender):
+		if sender in self._modes_buttons:
+			mode = list(self._modes_buttons).index(sender)
+			if value or not sender.is_momentary():
+				self._modes_heap = [e for e in self._modes_heap if e[1] is not sender]
+				self._modes_heap.append((mode, sender, None))
+				self._update_mode()
+			else:
+				self._modes_heap = [e for e in self._modes_heap if e[1] is not sender]
+				if not self._modes_heap:
+					self._modes_heap = [(mode, None, None)]
+
+	def add_mode_index_listener(self, listener):
+		self._mode_listeners.append(listener)
+
+	def remove_mode_index_listener(self, listener):
+		self._mode_listeners.remove(listener)
+
+	def mode_index_has_listener(self, listener):
+		return listener in self._mode_listeners
@@ -0,0 +1,56 @@
+from .CompoundComponent import CompoundComponent
+from .ClipSlotComponent import ClipSlotComponent
+from .SubjectSlot import subject_slot
+
+
+class SceneComponent(CompoundComponent):
+
+	clip_slot_component_type = ClipSlotComponent
+
+	def __init__(self, num_slots=0, tracks_to_use_callback=None, *a, **k):
+		CompoundComponent.__init__(self, *a, **k)
+		self._scene = None
+		self._tracks_to_use_callback = tracks_to_use_callback
+		self._clip_slots = []
+		self._scene_value = None
+		self._triggered_value = 'Session.SceneTriggered'
+		self._scene_value = 'Session.Scene'
+		self._no_scene_value = 'Session.NoScene'
+		for _ in range(num_slots):
+			self._clip_slots.append(self.register_component(self.clip_slot_component_type()))
+
+	def clip_slot(self, index):
+		return self._clip_slots[index]
+
+	def set_scene(self, scene):
+		self._scene = scene
+		self.update()
+
+	def set_track_offset(self, offset):
+		tracks = self._tracks_to_use_callback() if self._tracks_to_use_callback else []
+		scene_index = list(self.song().scenes).index(self._scene) if self._scene is not None else -1
+		for index, slot in enumerate(self._clip_slots):
+			track_index = offset + index
+			if self._scene is not None and track_index < len(tracks):
+				slot.set_clip_slot(tracks[track_index].clip_slots[scene_index])
+			else:
+				slot.set_clip_slot(None)
+
+	def set_launch_button(self, button):
+		self._launch_button_value.subject = button
+		self.update()
+
+	def update(self):
+		button = self._launch_button_value.subject
+		if self._allow_updates and self.is_enabled() and button is not None:
+			if self._scene is None:
+				button.set_light(self._no_scene_value)
+			elif self._scene.is_triggered:
+				button.set_light(self._triggered_value)
+			else:
+				button.set_light(self._scene_value)
+
+	@subject_slot('value')
+	def _launch_button_value(self, value):
+		if self.is_enabled() and self._scene is not None and value:
+			self._scene.fire()
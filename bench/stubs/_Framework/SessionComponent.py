@@ -0,0 +1,176 @@
+from .CompoundComponent import CompoundComponent
+from .SceneComponent import SceneComponent
+
+
+class SessionComponent(CompoundComponent):
+	""" Session box of clip slots with stop buttons and track/scene banking. """
+
+	_linked_session_instances = []
+	_minimal_track_offset = -1
+	_minimal_scene_offset = -1
+	_highlighting_callback = None
+	scene_component_type = SceneComponent
+
+	def __init__(self, num_tracks=0, num_scenes=0, auto_name=False, enable_skinning=False, *a, **k):
+		CompoundComponent.__init__(self, *a, **k)
+		self._num_tracks = num_tracks
+		self._num_scenes = num_scenes
+		self._track_offset = -1
+		self._scene_offset = -1
+		self._mixer = None
+		self._stop_track_clip_buttons = None
+		self._stop_all_button = None
+		self._stop_clip_value = 127
+		self._stop_clip_triggered_value = 127
+		self._track_banking_increment = 1
+		self._scenes = [self.register_component(self.scene_component_type(num_tracks, self.tracks_to_use)) for _ in range(num_scenes)]
+		self._selected_scene = self.register_component(self.scene_component_type(0, self.tracks_to_use))
+		if enable_skinning:
+			self._enable_skinning()
+		self.set_offsets(0, 0)
+
+	def _enable_skinning(self):
+		self.set_stop_clip_value('Session.StopClip')
+		self.set_stop_clip_triggered_value('Session.StopClipTriggered')
+		for scene in self._scenes:
+			for slot in scene._clip_slots:
+				slot.set_triggered_to_play_value('Session.ClipTriggeredPlay')
+				slot.set_triggered_to_record_value('Session.ClipTriggeredRecord')
+				slot.set_record_button_value('Session.RecordButton')
+				slot.set_started_value('Session.ClipStarted')
+				slot.set_recording_value('Session.ClipRecording')
+				slot.set_stopped_value('Session.ClipStopped')
+
+	def disconnect(self):
+		if self._is_linked():
+			self._unlink()
+		self.set_stop_track_clip_buttons(None)
+		CompoundComponent.disconnect(self)
+
+	def set_rgb_mode(self, color_palette, color_table, clip_slots_only=False):
+		for scene in self._scenes:
+			for slot in scene._clip_slots:
+				slot.set_clip_palette(color_palette)
+				slot.set_clip_rgb_table(color_table)
+
+	def scene(self, index):
+		return self._scenes[index]
+
+	def selected_scene(self):
+		return self._selected_scene
+
+	def width(self):
+		return self._num_tracks
+
+	def height(self):
+		return self._num_scenes
+
+	def track_offset(self):
+		return self._track_offset
+
+	def scene_offset(self):
+		return self._scene_offset
+
+	def tracks_to_use(self):
+		return self.song().visible_tracks
+
+	def set_mixer(self, mixer):
+		self._mixer = mixer
+		if self._mixer is not None:
+			self._mixer.set_track_offset(self.track_offset())
+
+	def set_offsets(self, track_offset, scene_offset):
+		track_changed = track_offset != self._track_offset
+		scene_changed = scene_offset != self._scene_offset
+		self._track_offset = track_offset
+		self._scene_offset = scene_offset
+		if track_changed:
+			self._reassign_tracks()
+		if scene_changed:
+			self._reassign_scenes()
+
+	def _reassign_scenes(self):
+		scenes = self.song().scenes
+		for index, scene in enumerate(self._scenes):
+			scene_index = self._scene_offset + index
+			scene.set_scene(scenes[scene_index] if scene_index < len(scenes) else None)
+			scene.set_track_offset(self._track_offset)
+
+	def _reassign_tracks(self):
+		for scene in self._scenes:
+			scene.set_track_offset(self._track_offset)
+		if self._mixer is not None:
+			self._mixer.set_track_offset(self._track_offset)
+		self._update_stop_track_clip_buttons()
+
+	def on_track_list_changed(self):
+		self._reassign_tracks()
+
+	def on_scene_list_changed(self):
+		self._reassign_scenes()
+
+	def set_stop_clip_value(self, value):
+		self._stop_clip_value = value
+
+	def set_stop_clip_triggered_value(self, value):
+		self._stop_clip_triggered_value = value
+
+	def set_stop_track_clip_buttons(self, buttons):
+		if self._stop_track_clip_buttons is not None:
+			for button in self._stop_track_clip_buttons:
+				button.remove_value_listener(self._stop_track_value)
+		self._stop_track_clip_buttons = buttons
+		if self._stop_track_clip_buttons is not None:
+			for button in self._stop_track_clip_buttons:
+				button.add_value_listener(self._stop_track_value, identify_sender=True)
+		self._update_stop_track_clip_buttons()
+
+	def set_stop_all_clips_button(self, button):
+		self._stop_all_button = button
+
+	def set_track_bank_buttons(self, right_button, left_button):
+		self._bank_right_button = right_button
+		self._bank_left_button = left_button
+
+	def set_scene_bank_buttons(self, down_button, up_button):
+		self._bank_down_button = down_button
+		self._bank_up_button = up_button
+
+	def set_track_banking_increment(self, increment):
+		self._track_banking_increment = increment
+
+	def _stop_track_value(self, value, sender):
+		if self.is_enabled() and value:
+			index = list(self._stop_track_clip_buttons).index(sender) + self._track_offset
+			tracks = self.tracks_to_use()
+			if index < len(tracks):
+				tracks[index].stop_all_clips()
+
+	def _update_stop_track_clip_buttons(self):
+		if self.is_enabled() and self._stop_track_clip_buttons is not None:
+			for index in range(len(self._stop_track_clip_buttons)):
+				self._update_stop_clips_led(index)
+
+	def _update_stop_clips_led(self, index):
+		button = self._stop_track_clip_buttons[index]
+		track_index = index + self._track_offset
+		tracks = self.tracks_to_use()
+		if track_index < len(tracks) and tracks[track_index].playing_slot_index >= 0:
+			button.send_value(self._stop_clip_value)
+		else:
+			button.turn_off()
+
+	def update(self):
+		if self._allow_updates:
+			self._update_stop_track_clip_buttons()
+		else:
+			self._update_requests += 1
+
+	def _is_linked(self):
+		return self in SessionComponent._linked_session_instances
+
+	def _link(self):
+		SessionComponent._linked_session_instances.append(self)
+
+	def _unlink(self):
+		SessionComponent._linked_session_instances.remove(self)
@@ -0,0 +1,44 @@
+from .CompoundComponent import CompoundComponent
+
+
+class DeprecatedSessionZoomingComponent(CompoundComponent):
+	""" Session overview; only the setters Launchpad95 calls are modelled. """
+
+	def __init__(self, session, enable_skinning=False, *a, **k):
+		CompoundComponent.__init__(self, *a, **k)
+		self._session = session
+		self._buttons = None
+		self._zoom_button = None
+		self._nav_buttons = None
+		self._scene_bank_buttons = None
+		self._empty_value = 0
+		self._stopped_value = 100
+		self._playing_value = 127
+		self._selected_value = 64
+
+	def set_button_matrix(self, buttons):
+		self._buttons = buttons
+
+	def set_zoom_button(self, button):
+		self._zoom_button = button
+
+	def set_nav_buttons(self, up, down, left, right):
+		self._nav_buttons = (up, down, left, right)
+
+	def set_scene_bank_buttons(self, buttons):
+		self._scene_bank_buttons = buttons
+
+	def set_empty_value(self, value):
+		self._empty_value = value
+
+	def set_stopped_value(self, value):
+		self._stopped_value = value
+
+	def set_playing_value(self, value):
+		self._playing_value = value
+
+	def set_selected_value(self, value):
+		self._selected_value = value
+
+	def update(self):
+		pass
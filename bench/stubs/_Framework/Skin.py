@@ -0,0 +1,32 @@
+class SkinColorMissingError(Exception):
+	pass
+
+
+class Skin(object):
+	""" Flattens nested colour classes into dotted names ("Note.Playing"). """
+
+	def __init__(self, colors=None):
+		self._colors = {}
+		if colors is not None:
+			self._fill_colors(colors)
+
+	def _fill_colors(self, colors, pathname=''):
+		for name, value in vars(colors).items():
+			if name.startswith('_'):
+				continue
+			if isinstance(value, type):
+				self._fill_colors(value, pathname + name + '.')
+			else:
+				self._colors[pathname + name] = value
+
+	def __getitem__(self, key):
+		try:
+			return self._colors[key]
+		except KeyError:
+			raise SkinColorMissingError('Skin color missing: %s' % str(key))
+
+	def __contains__(self, key):
+		return key in self._colors
+
+	def __iter__(self):
+		return iter(self._colors.items())
@@ -0,0 +1,41 @@
+class SubjectSlot(object):
+	""" Connects one listener to the ``<event>`` of whatever subject is set. """
+
+	def __init__(self, event, listener, extra_kws=None):
+		self._event = event
+		self._listener = listener
+		self._extra_kws = extra_kws or {}
+		self._subject = None
+
+	def _get_subject(self):
+		return self._subject
+
+	def _set_subject(self, subject):
+		if subject is not self._subject:
+			if self._subject is not None:
+				getattr(self._subject, 'remove_%s_listener' % self._event)(self._listener)
+			self._subject = subject
+			if subject is not None:
+				getattr(subject, 'add_%s_listener' % self._event)(self._listener, **self._extra_kws)
+
+	subject = property(_get_subject, _set_subject)
+
+	def disconnect(self):
+		self.subject = None
+
+
+def subject_slot(event, **extra_kws):
+
+	def decorator(func):
+		name = '__subject_slot_' + func.__name__
+
+		def getter(obj):
+			slot = obj.__dict__.get(name)
+			if slot is None:
+				slot = SubjectSlot(event, lambda *a, **k: func(obj, *a, **k), extra_kws)
+				obj.__dict__[name] = slot
+			return slot
+
+		return property(getter)
+
+	return decorator
@@ -0,0 +1,37 @@
+class Task(object):
+
+	def __init__(self, func=None):
+		self._func = func
+		self.killed = False
+
+	def kill(self):
+		self.killed = True
+
+	def update(self, delta):
+		if not self.killed and self._func is not None:
+			self._func(delta)
+
+
+class TaskGroup(Task):
+
+	def __init__(self):
+		Task.__init__(self)
+		self._tasks = []
+
+	def add(self, task):
+		if not isinstance(task, Task):
+			task = Task(task)
+		self._tasks.append(task)
+		return task
+
+	def clear(self):
+		self._tasks = []
+
+	def update(self, delta):
+		self._tasks = [t for t in self._tasks if not t.killed]
+		for task in list(self._tasks):
+			task.update(delta)
+
+
+def run(func, *a, **k):
+	return Task(lambda delta: func(*a, **k))
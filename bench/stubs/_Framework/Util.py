@@ -0,0 +1,19 @@
+def find_if(predicate, seq):
+	for x in seq:
+		if predicate(x):
+			return x
+	return None
+
+
+def clamp(value, minv, maxv):
+	return max(minv, min(value, maxv))
+
+
+def in_range(value, lower_bound, upper_open_bound):
+	if not isinstance(value, int) or isinstance(value, bool):
+		return False
+	return lower_bound <= value < upper_open_bound
+
+
+def nop(*a, **k):
+	pass
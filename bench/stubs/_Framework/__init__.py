@@ -0,0 +1,4 @@
+# Headless stand-in for the parts of Ableton's _Framework that Launchpad95
+# builds on. Behaviour follows the Live 9/10 framework closely enough for the
+# script's own code paths (LED feedback, listeners, enable state) to run
+# unmodified; everything else is a no-op.